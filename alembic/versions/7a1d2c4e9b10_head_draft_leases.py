@@ -0,0 +1,43 @@
+# TRANS-HUB 草稿租约（draft lease）
+"""
+为 th_trans_head 增加租约列，支持多 Worker 并发领取草稿而不重复翻译：
+- lease_owner：持有租约的 Worker 标识（hostname:pid:随机后缀）；
+- lease_expires_at：租约到期时间，过期后可被其他 Worker 重新领取；
+- ix_head_lease_expires：仅覆盖持有租约的行（部分索引），供回收器扫描过期租约。
+
+PostgreSQL 下对分区父表执行 ADD COLUMN / CREATE INDEX 会自动下沉到全部子分区。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# --- Alembic 元数据 ---
+revision = "7a1d2c4e9b10"
+down_revision = "3f8b9e6a0c2c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("th_trans_head", sa.Column("lease_owner", sa.String(), nullable=True))
+    op.add_column(
+        "th_trans_head",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_head_lease_expires",
+        "th_trans_head",
+        ["lease_expires_at"],
+        unique=False,
+        postgresql_where=sa.text("lease_owner IS NOT NULL"),
+        sqlite_where=sa.text("lease_owner IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_head_lease_expires", table_name="th_trans_head")
+    op.drop_column("th_trans_head", "lease_expires_at")
+    op.drop_column("th_trans_head", "lease_owner")
@@ -0,0 +1,81 @@
+# TRANS-HUB 草稿重试调度与死信队列
+"""
+为失败的草稿引入带退避的重试调度与死信队列（DLQ）：
+- th_trans_head.attempt_count：已失败的尝试次数，成功写回或重新提交后清零；
+- th_trans_head.next_attempt_at：最早可再次领取的时间（指数退避）；
+- th_trans_head.last_error：最近一次失败原因；
+- th_trans_head.dead_lettered_at：进入死信队列的时间，非空时草稿不再被领取；
+- th_dead_letters：死信记录，供 `trans-hub dlq show/replay/purge` 查看与处置。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# --- Alembic 元数据 ---
+revision = "b3e5f7a9c1d2"
+down_revision = "7a1d2c4e9b10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "th_trans_head",
+        sa.Column(
+            "attempt_count", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+    op.add_column(
+        "th_trans_head",
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column("th_trans_head", sa.Column("last_error", sa.Text(), nullable=True))
+    op.add_column(
+        "th_trans_head",
+        sa.Column("dead_lettered_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_table(
+        "th_dead_letters",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("project_id", sa.String(), nullable=False),
+        sa.Column("head_id", sa.String(), nullable=False),
+        sa.Column("content_id", sa.String(), nullable=False),
+        sa.Column("target_lang", sa.String(), nullable=False),
+        sa.Column(
+            "variant_key", sa.String(), nullable=False, server_default=sa.text("'-'")
+        ),
+        sa.Column("translation_rev_id", sa.String(), nullable=False),
+        sa.Column("attempt_count", sa.Integer(), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=False),
+        sa.Column("is_retryable", sa.Boolean(), nullable=False),
+        sa.Column("engine_name", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_index(
+        "ix_dead_letters_project_time",
+        "th_dead_letters",
+        ["project_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dead_letters_head", "th_dead_letters", ["project_id", "head_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dead_letters_head", table_name="th_dead_letters")
+    op.drop_index("ix_dead_letters_project_time", table_name="th_dead_letters")
+    op.drop_table("th_dead_letters")
+    op.drop_column("th_trans_head", "dead_lettered_at")
+    op.drop_column("th_trans_head", "last_error")
+    op.drop_column("th_trans_head", "next_attempt_at")
+    op.drop_column("th_trans_head", "attempt_count")
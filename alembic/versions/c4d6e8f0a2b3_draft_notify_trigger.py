@@ -0,0 +1,101 @@
+# TRANS-HUB 新草稿通知触发器
+"""
+在 th_trans_head 上为“进入待翻译状态”的行发送 NOTIFY new_translation_draft，
+使基于 LISTEN/NOTIFY 的 Worker 无需等待轮询即可被唤醒。
+
+- 语句级触发器 + 转换表（transition tables）：无论一条语句写入多少行，只发送一条通知，
+  批量导入不会淹没通知通道；
+- 负载为紧凑 JSON：{"project_ids": [...], "target_langs": [...], "count": n}，
+  超出 NOTIFY 负载上限时仅保留 count（监听方视为可能涉及任意语言）；
+- UPDATE 仅在行真正变为可领取时通知：状态变为 draft、指向新的草稿修订，或从死信中恢复。
+  租约续约、失败重试等仍为 draft 的更新不会发送通知，避免 Worker 自我唤醒；
+- PostgreSQL 不允许带转换表的触发器同时响应多个事件，因此 INSERT / UPDATE 各建一个。
+
+仅作用于 PostgreSQL；SQLite 不支持 LISTEN/NOTIFY，Worker 仍以轮询方式运行。
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# --- Alembic 元数据 ---
+revision = "c4d6e8f0a2b3"
+down_revision = "b3e5f7a9c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION th.notify_new_drafts()
+        RETURNS trigger AS $$
+        DECLARE n BIGINT; payload TEXT;
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            SELECT count(*),
+                   json_build_object(
+                     'project_ids', json_agg(DISTINCT d.project_id),
+                     'target_langs', json_agg(DISTINCT d.target_lang),
+                     'count', count(*))::text
+              INTO n, payload
+              FROM new_rows d
+             WHERE d.current_status = 'draft';
+          ELSE
+            SELECT count(*),
+                   json_build_object(
+                     'project_ids', json_agg(DISTINCT d.project_id),
+                     'target_langs', json_agg(DISTINCT d.target_lang),
+                     'count', count(*))::text
+              INTO n, payload
+              FROM new_rows d
+              JOIN old_rows o ON o.project_id = d.project_id AND o.id = d.id
+             WHERE d.current_status = 'draft'
+               AND d.dead_lettered_at IS NULL
+               AND (o.current_status IS DISTINCT FROM d.current_status
+                    OR o.current_rev_id IS DISTINCT FROM d.current_rev_id
+                    OR o.dead_lettered_at IS NOT NULL);
+          END IF;
+
+          IF n = 0 THEN
+            RETURN NULL;
+          END IF;
+          -- NOTIFY 负载上限为 8000 字节
+          IF octet_length(payload) > 7900 THEN
+            payload := json_build_object('count', n)::text;
+          END IF;
+          PERFORM pg_notify('new_translation_draft', payload);
+          RETURN NULL;
+        END; $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_head_notify_drafts_ins ON th_trans_head;")
+    op.execute(
+        """
+        CREATE TRIGGER trg_head_notify_drafts_ins
+        AFTER INSERT ON th_trans_head
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION th.notify_new_drafts();
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_head_notify_drafts_upd ON th_trans_head;")
+    op.execute(
+        """
+        CREATE TRIGGER trg_head_notify_drafts_upd
+        AFTER UPDATE ON th_trans_head
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION th.notify_new_drafts();
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS trg_head_notify_drafts_upd ON th_trans_head;")
+    op.execute("DROP TRIGGER IF EXISTS trg_head_notify_drafts_ins ON th_trans_head;")
+    op.execute("DROP FUNCTION IF EXISTS th.notify_new_drafts();")
@@ -0,0 +1,36 @@
+# TRANS-HUB 草稿队列部分索引
+"""
+为草稿领取的键集分页增加部分索引：
+- ix_head_draft_queue：(updated_at, id) WHERE current_status = 'draft'，
+  与 stream_draft_translations 的 ORDER BY updated_at, id 及游标条件一致；
+  仅覆盖草稿行，大部分译文发布后索引依然很小。
+
+PostgreSQL 下对分区父表执行 CREATE INDEX 会自动下沉到全部子分区。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# --- Alembic 元数据 ---
+revision = "d5e7f9a1b3c4"
+down_revision = "c4d6e8f0a2b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_head_draft_queue",
+        "th_trans_head",
+        ["updated_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("current_status = 'draft'"),
+        sqlite_where=sa.text("current_status = 'draft'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_head_draft_queue", table_name="th_trans_head")
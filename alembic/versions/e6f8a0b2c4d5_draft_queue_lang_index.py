@@ -0,0 +1,38 @@
+# TRANS-HUB 按语言的草稿队列部分索引
+"""
+为只处理部分语言的 Worker（`worker start --lang`）增加按语言的草稿队列索引：
+- ix_head_draft_queue_lang：(target_lang, updated_at, id) WHERE current_status = 'draft'。
+  单语言 Worker 以 target_lang 等值条件定位后按 (updated_at, id) 顺序读取，
+  不必在 ix_head_draft_queue 上逐行跳过其他语言的草稿。
+
+现有的 ix_head_proj_lang_status_id 以 project_id 开头且覆盖全部状态，
+无法用于跨项目、按更新时间排序的队列查询。
+PostgreSQL 下对分区父表执行 CREATE INDEX 会自动下沉到全部子分区。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# --- Alembic 元数据 ---
+revision = "e6f8a0b2c4d5"
+down_revision = "d5e7f9a1b3c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_head_draft_queue_lang",
+        "th_trans_head",
+        ["target_lang", "updated_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("current_status = 'draft'"),
+        sqlite_where=sa.text("current_status = 'draft'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_head_draft_queue_lang", table_name="th_trans_head")
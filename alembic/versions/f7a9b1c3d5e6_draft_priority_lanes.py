@@ -0,0 +1,43 @@
+# TRANS-HUB 草稿优先级通道与按项目的公平调度
+"""
+为草稿队列的多租户公平调度增加支撑：
+- th_trans_head.priority：优先级通道，数值越大越先被领取（默认 0，交互式请求使用正值）；
+- ix_head_draft_queue_project：(project_id, priority, updated_at, id) WHERE current_status = 'draft'，
+  调度器按 (项目, 通道) 逐个领取草稿，并为每个项目探测其最高的非空通道。
+
+PostgreSQL 下 project_id 为分区键，按项目的查询只会落到单个分区。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# --- Alembic 元数据 ---
+revision = "f7a9b1c3d5e6"
+down_revision = "e6f8a0b2c4d5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "th_trans_head",
+        sa.Column(
+            "priority", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+    op.create_index(
+        "ix_head_draft_queue_project",
+        "th_trans_head",
+        ["project_id", "priority", "updated_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("current_status = 'draft'"),
+        sqlite_where=sa.text("current_status = 'draft'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_head_draft_queue_project", table_name="th_trans_head")
+    op.drop_column("th_trans_head", "priority")
@@ -88,7 +88,10 @@ class AppLifecycleManager:
                 stmt = (
                     select(func.count())
                     .select_from(ThTransHead)
-                    .where(ThTransHead.current_status == TranslationStatus.DRAFT.value)
+                    .where(
+                        ThTransHead.current_status == TranslationStatus.DRAFT.value,
+                        ThTransHead.dead_lettered_at.is_(None),
+                    )
                 )
                 result = await session.execute(stmt)
                 return result.scalar_one() or 0
@@ -5,8 +5,15 @@
 使用 AppLifecycleManager 模拟完整的业务流程。
 """
 
+import asyncio
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
 from tests.helpers.factories import (
     TEST_NAMESPACE,
@@ -14,9 +21,33 @@ from tests.helpers.factories import (
     create_uida_request_data,
 )
 from tests.helpers.lifecycle import AppLifecycleManager
+from trans_hub._tm.normalizers import normalize_plain_text_for_reuse
+from trans_hub._uida.encoder import generate_uid_components
+from trans_hub._uida.reuse_key import build_reuse_sha256
+from trans_hub.cache import ResolveCache
+from trans_hub.config import (
+    BatchingConfig,
+    CacheConfig,
+    EngineCacheConfig,
+    EngineName,
+    RetryPolicyConfig,
+    TransHubConfig,
+)
 from trans_hub.coordinator import Coordinator
-from trans_hub.core import TranslationStatus
-from trans_hub.db.schema import ThLocalesFallbacks, ThTmLinks, ThTransRev
+from trans_hub.core import DatabaseError, TranslationStatus
+from trans_hub.core.types import FailedAttempt
+from trans_hub.db.schema import (
+    ThLocalesFallbacks,
+    ThResolveCache,
+    ThTm,
+    ThTmLinks,
+    ThTransHead,
+    ThTransRev,
+)
+from trans_hub.engine_cache import EngineResponseCache
+from trans_hub.persistence.postgres import PostgresPersistenceHandler
+from trans_hub.policies.batching import AdaptiveBatchSizer
+from trans_hub.policies.processing import DefaultProcessingPolicy
 
 # This module-level marker is removed in favor of explicit function decorators.
 # pytestmark = pytest.mark.asyncio
@@ -152,3 +183,783 @@ async def test_get_translation_with_fallback(
     )
     assert result is not None
     assert result["text"] == f"Translated({req_de['source_payload']['text']}) to de"
+
+
+@pytest.mark.asyncio
+async def test_request_many_reports_per_item_outcomes(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试 request_many：批量写入、TM 命中与单条目错误隔离。"""
+    shared_payload = {"text": "Bulk Login"}
+    # 预置 "Bulk Login" (en -> de) 的 TM 条目
+    source_fields = {"text": normalize_plain_text_for_reuse(shared_payload["text"])}
+    await lifecycle.handler.upsert_tm_entry(
+        project_id=TEST_PROJECT_ID,
+        namespace=TEST_NAMESPACE,
+        reuse_sha256_bytes=build_reuse_sha256(
+            namespace=TEST_NAMESPACE, reduced_keys={}, source_fields=source_fields
+        ),
+        source_lang="en",
+        target_lang="de",
+        variant_key="-",
+        policy_version=1,
+        hash_algo_version=1,
+        source_text_json=source_fields,
+        translated_json={"text": "Massen-Anmeldung"},
+        quality_score=0.9,
+    )
+
+    items = [
+        create_uida_request_data(target_langs=["de", "fr"]),
+        create_uida_request_data(keys={"bad": 1.5}),  # float 不满足 I-JSON
+        create_uida_request_data(source_payload=shared_payload, target_langs=["de"]),
+        # 无效的 priority 只使本条目失败，数字字符串被规范为整数
+        {**create_uida_request_data(keys={"id": "bad_prio"}), "priority": "high"},
+        {**create_uida_request_data(keys={"id": "str_prio"}), "priority": "5"},
+        # target_langs 缺失、语言代码无效或类型错误时同样只使本条目失败
+        {
+            k: v
+            for k, v in create_uida_request_data(keys={"id": "no_langs"}).items()
+            if k != "target_langs"
+        },
+        create_uida_request_data(keys={"id": "bad_lang"}, target_langs=["??"]),
+        {**create_uida_request_data(keys={"id": "str_langs"}), "target_langs": "de"},
+    ]
+    results = await coordinator.request_many(items, chunk_size=2)
+
+    assert [r.index for r in results] == [0, 1, 2, 3, 4, 5, 6, 7]
+    for invalid in results[5:]:
+        assert not invalid.ok and invalid.error_message
+        assert invalid.content_id is None
+    assert not results[3].ok and "priority" in (results[3].error_message or "")
+    assert results[4].ok
+    assert results[0].ok
+    assert results[0].statuses == {
+        "de": TranslationStatus.DRAFT,
+        "fr": TranslationStatus.DRAFT,
+    }
+    assert not results[1].ok and results[1].content_id is None
+    assert results[2].statuses == {"de": TranslationStatus.REVIEWED}
+
+    await lifecycle.run_worker_until_idle()
+    heads = await lifecycle.request_and_process(items[0])
+    assert {h.current_status for h in heads.values()} == {
+        TranslationStatus.REVIEWED.value
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("priority", [2**40, True, "high"])
+async def test_request_rejects_invalid_priority_before_writing(
+    coordinator: Coordinator, priority: object
+) -> None:
+    """测试 request：无效的 priority 在写入任何内容之前即被拒绝。"""
+    request_data = create_uida_request_data(target_langs=["de"])
+    with pytest.raises((TypeError, ValueError), match="priority"):
+        await coordinator.request(**request_data, priority=priority)
+
+    _, _, keys_sha = generate_uid_components(request_data["keys"])
+    assert (
+        await coordinator.handler.get_content_id_by_uida(
+            request_data["project_id"], request_data["namespace"], keys_sha
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_request_many_sends_one_draft_notification_per_chunk(
+    coordinator: Coordinator,
+) -> None:
+    """测试 request_many：每个块的头记录更新是一条语句，只触发一次新草稿通知。"""
+    import asyncpg
+
+    handler = coordinator.handler
+    assert isinstance(handler, PostgresPersistenceHandler)
+    items = [
+        create_uida_request_data(keys={"id": f"notify{i}"}, target_langs=["de", "fr"])
+        for i in range(6)
+    ]
+    # 首次请求创建译文头；其通知在开始监听前发送，不计入
+    assert all(r.ok for r in await coordinator.request_many(items, chunk_size=3))
+
+    received: list[dict] = []
+    conn = await asyncpg.connect(
+        handler.dsn.replace("postgresql+asyncpg", "postgresql")
+    )
+    await conn.add_listener(
+        "new_translation_draft",
+        lambda c, p, ch, payload: received.append(json.loads(payload)),
+    )
+    try:
+        # 再次请求把已有头记录指向新的草稿修订：逐行 UPDATE 会按语言各发一条通知
+        results = await coordinator.request_many(items, chunk_size=3)
+        assert all(r.ok for r in results)
+        await asyncio.sleep(0.3)
+    finally:
+        await conn.close()
+
+    chunk_wakeup = {
+        "project_ids": [TEST_PROJECT_ID],
+        "target_langs": ["de", "fr"],
+        "count": 6,
+    }
+    assert received == [chunk_wakeup, chunk_wakeup]
+
+
+@pytest.mark.asyncio
+async def test_failed_drafts_back_off_then_dead_letter(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试失败草稿的退避重试、重试耗尽后进入死信队列，以及重放。"""
+    coordinator.config.retry_policy = RetryPolicyConfig(
+        max_attempts=2, initial_backoff=3600, max_backoff=3600
+    )
+    engine = coordinator._get_or_create_engine_instance("debug")
+    engine.config.fail_on_text = "poison"
+    request_data = create_uida_request_data(source_payload={"text": "poison"})
+    await coordinator.request(**request_data)
+
+    assert await lifecycle.run_worker_once() == 1
+    async with lifecycle.handler._sessionmaker() as session:
+        head = (await session.execute(select(ThTransHead))).scalar_one()
+    assert head.current_status == TranslationStatus.DRAFT.value
+    assert head.attempt_count == 1
+    assert head.next_attempt_at is not None and head.lease_owner is None
+    # 退避期内不会被再次领取
+    assert await lifecycle.run_worker_once() == 0
+
+    async with lifecycle.handler._sessionmaker.begin() as session:
+        await session.execute(update(ThTransHead).values(next_attempt_at=None))
+    assert await lifecycle.run_worker_once() == 1
+    assert await lifecycle.run_worker_once() == 0
+
+    dead = await coordinator.list_dead_letters()
+    assert len(dead) == 1
+    assert dead[0].attempt_count == 2 and dead[0].head_id == head.id
+
+    engine.config.fail_on_text = None
+    assert await coordinator.replay_dead_letters(ids=[dead[0].id]) == 1
+    assert await coordinator.list_dead_letters() == []
+    assert await lifecycle.run_worker_once() == 1
+    async with lifecycle.handler._sessionmaker() as session:
+        head = (await session.execute(select(ThTransHead))).scalar_one()
+    assert head.current_status == TranslationStatus.REVIEWED.value
+    assert head.attempt_count == 0 and head.dead_lettered_at is None
+
+
+@pytest.mark.asyncio
+async def test_replaying_a_stale_dead_letter_leaves_a_leased_draft_alone(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试重放：头记录被重新请求并被 Worker 领取后，旧死信的重放不会清除其租约与重试计数。"""
+    request_data = create_uida_request_data()
+    await coordinator.request(**request_data)
+    async with lifecycle.handler._sessionmaker() as session:
+        head = (await session.execute(select(ThTransHead))).scalar_one()
+    assert (
+        await lifecycle.handler.record_failed_attempts(
+            [
+                FailedAttempt(
+                    head_id=head.id,
+                    project_id=head.project_id,
+                    content_id=head.content_id,
+                    target_lang=head.target_lang,
+                    variant_key=head.variant_key,
+                    translation_rev_id=head.current_rev_id,
+                    attempt_count=3,
+                    error_message="boom",
+                    is_retryable=False,
+                    next_attempt_at=None,
+                )
+            ]
+        )
+        == 1
+    )
+    (dead,) = await coordinator.list_dead_letters()
+
+    # 重新请求清除了头记录的死信状态，但死信记录仍在；随后草稿被领取
+    await coordinator.request(**request_data)
+    claimed = [
+        b async for b in lifecycle.handler.stream_draft_translations(batch_size=10)
+    ]
+    assert [item.head_id for batch in claimed for item in batch] == [head.id]
+    async with lifecycle.handler._sessionmaker.begin() as session:
+        await session.execute(update(ThTransHead).values(attempt_count=1))
+
+    assert await coordinator.replay_dead_letters(ids=[dead.id]) == 0
+    assert await coordinator.list_dead_letters() == []
+    async with lifecycle.handler._sessionmaker() as session:
+        head = (await session.execute(select(ThTransHead))).scalar_one()
+    assert head.lease_owner is not None and head.lease_expires_at is not None
+    assert head.attempt_count == 1
+
+
+@pytest.mark.asyncio
+async def test_dead_letters_follow_the_guarded_head_update(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试死信只为实际进入死信状态的头记录写入，清除死信会将草稿置为已拒绝。"""
+    await coordinator.request(**create_uida_request_data())
+    async with lifecycle.handler._sessionmaker() as session:
+        head = (await session.execute(select(ThTransHead))).scalar_one()
+
+    def failure(rev_id: str) -> FailedAttempt:
+        return FailedAttempt(
+            head_id=head.id,
+            project_id=head.project_id,
+            content_id=head.content_id,
+            target_lang=head.target_lang,
+            variant_key=head.variant_key,
+            translation_rev_id=rev_id,
+            attempt_count=3,
+            error_message="boom",
+            is_retryable=False,
+            next_attempt_at=None,
+        )
+
+    # 头记录已转到新修订：守卫条件不匹配，不写入死信
+    assert await lifecycle.handler.record_failed_attempts([failure("stale")]) == 0
+    assert await coordinator.list_dead_letters() == []
+
+    assert (
+        await lifecycle.handler.record_failed_attempts([failure(head.current_rev_id)])
+        == 1
+    )
+    async with lifecycle.handler._sessionmaker() as session:
+        dead_head = (await session.execute(select(ThTransHead))).scalar_one()
+    assert dead_head.dead_lettered_at is not None
+    assert (dead_head.attempt_count, dead_head.last_error) == (3, "boom")
+    assert dead_head.next_attempt_at is None and dead_head.lease_owner is None
+    assert await coordinator.purge_dead_letters() == 1
+
+    async with lifecycle.handler._sessionmaker() as session:
+        head = (await session.execute(select(ThTransHead))).scalar_one()
+        rev = (
+            await session.execute(
+                select(ThTransRev).where(ThTransRev.id == head.current_rev_id)
+            )
+        ).scalar_one()
+    assert head.current_status == TranslationStatus.REJECTED.value
+    assert head.dead_lettered_at is None
+    assert rev.status == TranslationStatus.REJECTED.value
+    assert await lifecycle.run_worker_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_notification_loop_picks_up_due_retries_without_notification(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试事件驱动 Worker：退避到期的草稿不产生通知，也会被定期检查领取。"""
+    from trans_hub.cli.worker import notification_loop
+
+    coordinator.config.retry_policy = RetryPolicyConfig(
+        initial_backoff=3600, max_backoff=3600
+    )
+    coordinator.config.worker_poll_interval = 1
+    engine = coordinator._get_or_create_engine_instance("debug")
+    engine.config.fail_on_text = "flaky"
+    await coordinator.request(
+        **create_uida_request_data(source_payload={"text": "flaky"})
+    )
+    assert await lifecycle.run_worker_once() == 1
+    engine.config.fail_on_text = None
+
+    shutdown = asyncio.Event()
+    loop_task = asyncio.create_task(notification_loop(coordinator, shutdown))
+    try:
+        # 只修改 next_attempt_at，触发器不会发送通知
+        async with lifecycle.handler._sessionmaker.begin() as session:
+            await session.execute(update(ThTransHead).values(next_attempt_at=None))
+
+        async def head_status() -> str:
+            async with lifecycle.handler._sessionmaker() as session:
+                head = (await session.execute(select(ThTransHead))).scalar_one()
+            return head.current_status
+
+        for _ in range(50):
+            if await head_status() == TranslationStatus.REVIEWED.value:
+                break
+            await asyncio.sleep(0.1)
+        assert await head_status() == TranslationStatus.REVIEWED.value
+    finally:
+        shutdown.set()
+        await asyncio.wait_for(loop_task, timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_mixed_language_batch_is_translated_per_language(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试混合语言的批次会按语言分组翻译，且可按目标语言过滤领取。"""
+    request_data = create_uida_request_data(target_langs=["de", "fr", "ja"])
+    await coordinator.request(**request_data)
+
+    only_fr = [
+        item
+        async for batch in lifecycle.handler.stream_draft_translations(
+            batch_size=10, target_langs=["fr"]
+        )
+        for item in batch
+    ]
+    assert [item.target_lang for item in only_fr] == ["fr"]
+    await lifecycle.handler.release_leases(
+        [(item.project_id, item.head_id) for item in only_fr]
+    )
+
+    heads = await lifecycle.request_and_process(request_data)
+    source_text = request_data["source_payload"]["text"]
+    async with lifecycle.handler._sessionmaker() as session:
+        for lang, head in heads.items():
+            rev = (
+                await session.execute(
+                    select(ThTransRev).where(ThTransRev.id == head.current_rev_id)
+                )
+            ).scalar_one()
+            assert rev.translated_payload_json == {
+                "text": f"Translated({source_text}) to {lang}"
+            }
+
+
+@pytest.mark.asyncio
+async def test_batch_write_back_shares_tm_entry_for_duplicate_sources(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试批量写回：同批次中相同源文本只 upsert 一条 TM，并各自建立追溯链接。"""
+    shared_payload = {"text": "Shared Save"}
+    for _ in range(2):
+        await coordinator.request(
+            **create_uida_request_data(source_payload=shared_payload)
+        )
+
+    assert await lifecycle.run_worker_once() == 2
+
+    async with lifecycle.handler._sessionmaker() as session:
+        tm_ids = (await session.execute(select(ThTm.id))).scalars().all()
+        links = (await session.execute(select(ThTmLinks))).scalars().all()
+        heads = (await session.execute(select(ThTransHead))).scalars().all()
+    assert len(tm_ids) == 1
+    assert sorted(link.tm_id for link in links) == [tm_ids[0], tm_ids[0]]
+    assert {h.current_status for h in heads} == {TranslationStatus.REVIEWED.value}
+
+
+@pytest.mark.asyncio
+async def test_resolve_cache_is_invalidated_by_publish_from_another_process(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager, db_engine: AsyncEngine
+) -> None:
+    """测试解析缓存：重复读取命中缓存，另一进程发布后经 NOTIFY 失效。"""
+    reader_handler = PostgresPersistenceHandler(
+        async_sessionmaker(db_engine, expire_on_commit=False), dsn=str(db_engine.url)
+    )
+    reader = Coordinator(
+        TransHubConfig(
+            database_url=str(db_engine.url),
+            active_engine=EngineName.DEBUG,
+            source_lang="en",
+            cache_config=CacheConfig(enabled=True),
+        ),
+        reader_handler,
+    )
+    await reader.initialize()
+    try:
+        request_data = create_uida_request_data(target_langs=["de"])
+        heads = await lifecycle.request_and_process(request_data)
+        get_params = {
+            "project_id": TEST_PROJECT_ID,
+            "namespace": TEST_NAMESPACE,
+            "keys": request_data["keys"],
+            "target_lang": "de",
+        }
+
+        assert await reader.get_translation(**get_params) is None
+        assert await reader.get_translation(**get_params) is None
+        stats = reader.resolve_cache_stats()
+        assert stats is not None
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+        # 发布方未启用缓存，失效完全依赖跨进程通知
+        assert coordinator.resolve_cache is None
+        assert await coordinator.publish_translation(heads["de"].current_rev_id)
+        for _ in range(50):
+            if reader.resolve_cache_stats()["invalidations"]:
+                break
+            await asyncio.sleep(0.05)
+
+        result = await reader.get_translation(**get_params)
+        assert result is not None
+        assert result["text"] == (
+            f"Translated({request_data['source_payload']['text']}) to de"
+        )
+    finally:
+        await reader.close()
+
+
+@pytest.mark.asyncio
+async def test_resolve_cache_recovers_from_a_dropped_invalidation_listener(
+    coordinator: Coordinator,
+    lifecycle: AppLifecycleManager,
+    db_engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """测试解析缓存：失效监听连接断开时清空缓存，重连后继续接收其他进程的失效通知。"""
+    from trans_hub.persistence import postgres
+
+    monkeypatch.setattr(postgres, "_LISTENER_RECONNECT_INITIAL", 0.05)
+    reader_handler = PostgresPersistenceHandler(
+        async_sessionmaker(db_engine, expire_on_commit=False), dsn=str(db_engine.url)
+    )
+    reader = Coordinator(
+        TransHubConfig(
+            database_url=str(db_engine.url),
+            active_engine=EngineName.DEBUG,
+            source_lang="en",
+            cache_config=CacheConfig(enabled=True, cache_type="lru"),
+        ),
+        reader_handler,
+    )
+    await reader.initialize()
+
+    async def wait_for(condition: Callable[[], bool]) -> None:
+        for _ in range(100):
+            if condition():
+                return
+            await asyncio.sleep(0.05)
+        raise AssertionError("等待条件超时")
+
+    try:
+        request_data = create_uida_request_data(target_langs=["de"])
+        heads = await lifecycle.request_and_process(request_data)
+        get_params = {
+            "project_id": TEST_PROJECT_ID,
+            "namespace": TEST_NAMESPACE,
+            "keys": request_data["keys"],
+            "target_lang": "de",
+        }
+        assert await reader.get_translation(**get_params) is None
+        assert reader.resolve_cache_stats()["size"] == 1
+
+        listener = reader_handler._invalidation_listener_conn
+        assert listener is not None
+        async with lifecycle.handler._sessionmaker() as session:
+            await session.execute(
+                select(func.pg_terminate_backend(listener.get_server_pid()))
+            )
+        await wait_for(lambda: reader.resolve_cache_stats()["size"] == 0)
+        await wait_for(
+            lambda: reader_handler._invalidation_listener_conn not in (None, listener)
+        )
+
+        # 重连后的监听仍能让本进程的缓存随其他进程的发布失效
+        assert await reader.get_translation(**get_params) is None
+        assert await coordinator.publish_translation(heads["de"].current_rev_id)
+        await wait_for(lambda: reader.resolve_cache_stats()["invalidations"] > 0)
+        assert await reader.get_translation(**get_params) is not None
+    finally:
+        await reader.close()
+
+
+@pytest.mark.asyncio
+async def test_resolve_cache_skips_fill_invalidated_during_the_read(
+    coordinator: Coordinator,
+    lifecycle: AppLifecycleManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """测试解析缓存：读取期间到达的失效通知使该次回填作废，LRU 中不会残留旧结果。"""
+    coordinator.resolve_cache = ResolveCache(
+        CacheConfig(enabled=True, cache_type="lru")
+    )
+    request_data = create_uida_request_data(target_langs=["de"])
+    heads = await lifecycle.request_and_process(request_data)
+    await coordinator.publish_translation(heads["de"].current_rev_id)
+    get_params = {
+        "project_id": TEST_PROJECT_ID,
+        "namespace": TEST_NAMESPACE,
+        "keys": request_data["keys"],
+        "target_lang": "de",
+    }
+
+    resolve = coordinator.handler.resolve_published_translation
+
+    async def resolve_then_invalidate(*args: object) -> object:
+        resolution = await resolve(*args)  # type: ignore[arg-type]
+        # 模拟另一进程在本次读取完成前发布并发出失效通知
+        coordinator._on_resolve_invalidated(heads["de"].content_id)
+        return resolution
+
+    monkeypatch.setattr(
+        coordinator.handler, "resolve_published_translation", resolve_then_invalidate
+    )
+    assert await coordinator.get_translation(**get_params) is not None
+    assert coordinator.resolve_cache.stats()["size"] == 0
+
+    monkeypatch.setattr(coordinator.handler, "resolve_published_translation", resolve)
+    assert await coordinator.get_translation(**get_params) is not None
+    assert coordinator.resolve_cache.stats()["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_cache_table_records_fallback_and_is_invalidated(
+    coordinator: Coordinator,
+    lifecycle: AppLifecycleManager,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """测试 th_resolve_cache：回填来源语言、发布时按内容失效、过期清理。"""
+    # 持久化解析缓存默认关闭，需显式开启
+    assert coordinator.config.resolve_cache_ttl == 0
+    coordinator.config.resolve_cache_ttl = 60
+    shared_keys = {"id": "resolve_cache_test"}
+    req_de = create_uida_request_data(keys=shared_keys, target_langs=["de"])
+    heads_de = await lifecycle.request_and_process(req_de)
+    await coordinator.publish_translation(heads_de["de"].current_rev_id)
+
+    async with lifecycle.handler._sessionmaker.begin() as session:
+        session.add(
+            ThLocalesFallbacks(
+                project_id=TEST_PROJECT_ID, locale="fr", fallback_order=["de"]
+            )
+        )
+    req_fr = create_uida_request_data(keys=shared_keys, target_langs=["fr"])
+    heads_fr = await lifecycle.request_and_process(req_fr)
+
+    get_params = {
+        "project_id": TEST_PROJECT_ID,
+        "namespace": TEST_NAMESPACE,
+        "keys": shared_keys,
+        "target_lang": "fr",
+    }
+
+    async def cache_rows() -> list[ThResolveCache]:
+        async with lifecycle.handler._sessionmaker() as session:
+            return list((await session.execute(select(ThResolveCache))).scalars())
+
+    result = await coordinator.get_translation(**get_params)
+    assert result is not None and result["text"].endswith("to de")
+    (row,) = await cache_rows()
+    assert (row.target_lang, row.origin_lang) == ("fr", "de")
+    assert row.resolved_rev == heads_de["de"].current_rev_id
+
+    # 缓存命中时直接返回缓存指向的修订
+    assert await coordinator.get_translation(**get_params) == result
+
+    # 发布 fr 会清除该内容的全部缓存（包括回退到 de 的条目）
+    assert await coordinator.publish_translation(heads_fr["fr"].current_rev_id)
+    assert await cache_rows() == []
+    result = await coordinator.get_translation(**get_params)
+    assert result is not None and result["text"].endswith("to fr")
+    (row,) = await cache_rows()
+    assert row.origin_lang == "fr"
+
+    async with lifecycle.handler._sessionmaker.begin() as session:
+        await session.execute(
+            update(ThResolveCache).values(
+                expires_at=datetime.now(timezone.utc) - timedelta(hours=1)
+            )
+        )
+    assert await coordinator.handler.purge_expired_resolve_cache() == 1
+    assert await cache_rows() == []
+
+    # 缓存读取失败时退回直接解析，不影响读取结果
+    async def broken_lookup(*args: object) -> None:
+        raise DatabaseError("cache unavailable")
+
+    monkeypatch.setattr(coordinator.handler, "get_cached_resolution", broken_lookup)
+    result = await coordinator.get_translation(**get_params)
+    assert result is not None and result["text"].endswith("to fr")
+
+
+@pytest.mark.asyncio
+async def test_get_translations_resolves_page_in_constant_queries(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager, db_engine: AsyncEngine
+) -> None:
+    """测试批量读取：多键 × 多语言，含回退与未知键，且查询次数与键数量无关。"""
+    keys_list = [{"id": f"page_key_{i}"} for i in range(3)]
+    for keys in keys_list[:2]:
+        heads = await lifecycle.request_and_process(
+            create_uida_request_data(keys=keys, target_langs=["de"])
+        )
+        await coordinator.publish_translation(heads["de"].current_rev_id)
+    async with lifecycle.handler._sessionmaker.begin() as session:
+        session.add(
+            ThLocalesFallbacks(
+                project_id=TEST_PROJECT_ID, locale="fr", fallback_order=["de"]
+            )
+        )
+    unknown = {"id": "never_requested"}
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        results = await coordinator.get_translations(
+            project_id=TEST_PROJECT_ID,
+            namespace=TEST_NAMESPACE,
+            keys_list=[*keys_list, unknown],
+            target_langs=["de", "fr"],
+        )
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 2
+    assert set(results) == {(i, lang) for i in range(4) for lang in ("de", "fr")}
+    for i in range(2):
+        de = results[(i, "de")]
+        assert de is not None and de["text"].endswith("to de")
+        assert results[(i, "fr")] == de
+    assert results[(2, "de")] is None
+    assert results[(3, "fr")] is None
+
+    single = await coordinator.get_translation(
+        project_id=TEST_PROJECT_ID,
+        namespace=TEST_NAMESPACE,
+        keys=keys_list[0],
+        target_lang="fr",
+    )
+    assert single == results[(0, "fr")]
+
+
+@pytest.mark.asyncio
+async def test_engine_response_cache_is_shared_across_projects(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager, tmp_path: Path
+) -> None:
+    """测试引擎响应缓存：相同请求跨项目复用译文，修订上记录提示词与参数哈希。"""
+    cache = EngineResponseCache(EngineCacheConfig(path=str(tmp_path / "engine.db")))
+    engine = coordinator._get_or_create_engine_instance("debug")
+    engine.response_cache = cache
+    try:
+        for project_id in ("cache-a", "cache-b"):
+            await coordinator.request(
+                **create_uida_request_data(
+                    project_id=project_id,
+                    source_payload={"text": "Save"},
+                    target_langs=["de"],
+                )
+            )
+            assert await lifecycle.run_worker_once() == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+    finally:
+        engine.response_cache = None
+        await cache.close()
+
+    async with lifecycle.handler._sessionmaker() as session:
+        revs = (
+            (
+                await session.execute(
+                    select(ThTransRev).where(
+                        ThTransRev.status == TranslationStatus.REVIEWED.value
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+    assert {r.project_id for r in revs} == {"cache-a", "cache-b"}
+    assert all(r.params_hash and r.params_hash == revs[0].params_hash for r in revs)
+    assert revs[0].translated_payload_json == revs[1].translated_payload_json
+
+
+@pytest.mark.asyncio
+async def test_pipelined_worker_drains_claimed_batches_on_shutdown(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试流水线 Worker：停机信号后只完成已领取的批次，未领取的草稿不持有租约。"""
+    from trans_hub.cli.worker import consume_and_process
+
+    # 固定批次大小，使“已领取的批次”可预期
+    coordinator.batch_sizer = AdaptiveBatchSizer(
+        BatchingConfig(adaptive=False, min_size=1), initial_size=2, engine="debug"
+    )
+    coordinator.config.worker_translate_concurrency = 2
+    items = [
+        create_uida_request_data(keys={"id": f"pipeline_{i}"}, target_langs=["de"])
+        for i in range(6)
+    ]
+    assert all(r.ok for r in await coordinator.request_many(items))
+
+    shutdown = asyncio.Event()
+    shutdown.set()
+    assert await consume_and_process(coordinator, "test", shutdown_event=shutdown) == 2
+
+    async with lifecycle.handler._sessionmaker() as session:
+        drafts = (
+            (
+                await session.execute(
+                    select(ThTransHead).where(
+                        ThTransHead.current_status == TranslationStatus.DRAFT.value
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+    assert len(drafts) == 4
+    assert all(h.lease_owner is None for h in drafts)
+
+    assert await consume_and_process(coordinator, "test") == 4
+    assert await lifecycle.run_worker_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_policies_that_only_implement_process_batch(
+    coordinator: Coordinator, lifecycle: AppLifecycleManager
+) -> None:
+    """测试只实现 process_batch 的自定义策略仍能被流水线 Worker 使用。"""
+    from trans_hub.cli.worker import consume_and_process
+
+    class _LegacyPolicy:
+        def __init__(self) -> None:
+            self.batches = 0
+            self._inner = DefaultProcessingPolicy()
+
+        async def process_batch(self, batch, p_context, active_engine):  # type: ignore[no-untyped-def]
+            self.batches += 1
+            return await self._inner.process_batch(batch, p_context, active_engine)
+
+    policy = _LegacyPolicy()
+    coordinator.processing_policy = policy
+    await coordinator.request(**create_uida_request_data(target_langs=["de", "fr"]))
+
+    assert await consume_and_process(coordinator, "test") == 2
+    assert policy.batches >= 1
+    assert await lifecycle.run_worker_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduler_serves_small_tenants_and_priority_lanes_first(
+    coordinator: Coordinator,
+) -> None:
+    """测试公平调度：大项目积压时小租户与高优先级草稿不必排在其后。"""
+    await coordinator.request_many(
+        create_uida_request_data(project_id="bulk-tenant", target_langs=["de"])
+        for _ in range(60)
+    )
+    await coordinator.request_many(
+        create_uida_request_data(project_id="small-tenant", target_langs=["de"])
+        for _ in range(3)
+    )
+    urgent = create_uida_request_data(project_id="bulk-tenant", target_langs=["fr"])
+    await coordinator.request_many([{**urgent, "priority": 10}])
+
+    depths = await coordinator.draft_queue_depths()
+    assert {(d.project_id, d.priority): (d.pending, d.leased) for d in depths} == {
+        ("bulk-tenant", 0): (60, 0),
+        ("bulk-tenant", 10): (1, 0),
+        ("small-tenant", 0): (3, 0),
+    }
+
+    batches = [
+        batch async for batch in coordinator.draft_scheduler.stream(batch_size=10)
+    ]
+    first = batches[0]
+    assert first[0].target_lang == "fr"
+    assert {item.project_id for item in first[1:]} == {"small-tenant"}
+    assert len(first) == 4
+    assert [len(b) for b in batches[1:]] == [10] * 6
+    claimed = [item.head_id for b in batches for item in b]
+    assert len(claimed) == len(set(claimed)) == 64
+
+    depths = await coordinator.draft_queue_depths()
+    assert sum(d.pending for d in depths) == 0
+    assert sum(d.leased for d in depths) == 64
@@ -7,13 +7,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta, timezone
+
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select, text, update
 
 from tests.helpers.factories import TEST_NAMESPACE, TEST_PROJECT_ID
 from trans_hub.core.interfaces import PersistenceHandler
 from trans_hub.core.types import TranslationStatus
-from trans_hub.db.schema import ThTransHead, ThTransRev
+from trans_hub.db.schema import ThLocalesFallbacks, ThTransHead, ThTransRev
 
 # This module-level marker is removed in favor of explicit function decorators.
 # pytestmark = pytest.mark.asyncio
@@ -77,3 +82,270 @@ async def test_rev_head_creation_and_update(handler: PersistenceHandler):
         ).scalar_one()
         assert head.published_rev_id == rev_id_1
         assert rev.status == TranslationStatus.PUBLISHED.value
+
+
+@pytest.mark.asyncio
+async def test_draft_leases_prevent_double_claim(handler: PersistenceHandler):
+    """测试草稿租约：已领取的草稿不会被其他 Worker 再次领取，过期后可被回收。"""
+    from trans_hub.persistence.postgres import PostgresPersistenceHandler
+
+    content_id = await handler.upsert_content(
+        TEST_PROJECT_ID, TEST_NAMESPACE, {"id": "lease-test"}, {"text": "Lease"}, 1
+    )
+    for lang in ("de", "fr"):
+        await handler.get_or_create_translation_head(
+            TEST_PROJECT_ID, content_id, lang, "-"
+        )
+
+    # 第二个 Worker 共享同一连接池，但拥有独立的租约持有者标识
+    other = PostgresPersistenceHandler(handler._sessionmaker, dsn=handler.dsn)
+    assert other.lease_owner != handler.lease_owner
+
+    claimed = [b async for b in handler.stream_draft_translations(batch_size=10)]
+    assert sum(len(b) for b in claimed) == 2
+    assert [b async for b in other.stream_draft_translations(batch_size=10)] == []
+
+    heads = [(item.project_id, item.head_id) for item in claimed[0]]
+    assert await other.renew_leases(heads) == 0
+    assert await handler.renew_leases(heads) == 2
+
+    # 模拟原 Worker 崩溃：租约过期后被回收，可由其他 Worker 领取
+    async with handler._sessionmaker.begin() as session:
+        await session.execute(
+            update(ThTransHead)
+            .where(ThTransHead.id.in_([head_id for _, head_id in heads]))
+            .values(lease_expires_at=func.now() - text("interval '1 second'"))
+        )
+    assert await other.release_expired_leases() == 2
+    reclaimed = [b async for b in other.stream_draft_translations(batch_size=10)]
+    assert sum(len(b) for b in reclaimed) == 2
+
+    # 写回修订后租约被清除
+    item = reclaimed[0][0]
+    await other.create_new_translation_revision(
+        head_id=item.head_id,
+        project_id=item.project_id,
+        content_id=item.content_id,
+        target_lang=item.target_lang,
+        variant_key=item.variant_key,
+        status=TranslationStatus.REVIEWED,
+        revision_no=item.revision_no + 1,
+        translated_payload={"text": "Pacht"},
+    )
+    async with handler._sessionmaker() as session:
+        head = (
+            await session.execute(
+                select(ThTransHead).where(ThTransHead.id == item.head_id)
+            )
+        ).scalar_one()
+        assert head.lease_owner is None
+        assert head.lease_expires_at is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_published_translation_follows_priority(
+    handler: PersistenceHandler,
+):
+    """测试单查询回退解析：精确变体 > 默认变体 > fallback_order 中靠前的语言。"""
+    content_id = await handler.upsert_content(
+        TEST_PROJECT_ID, TEST_NAMESPACE, {"id": "resolve-test"}, {"text": "Hi"}, 1
+    )
+
+    async def publish(lang: str, variant: str) -> str:
+        head_id, rev_no = await handler.get_or_create_translation_head(
+            TEST_PROJECT_ID, content_id, lang, variant
+        )
+        rev_id = await handler.create_new_translation_revision(
+            head_id=head_id,
+            project_id=TEST_PROJECT_ID,
+            content_id=content_id,
+            target_lang=lang,
+            variant_key=variant,
+            status=TranslationStatus.REVIEWED,
+            revision_no=rev_no + 1,
+            translated_payload={"text": f"{lang}/{variant}"},
+        )
+        assert await handler.publish_revision(rev_id)
+        return rev_id
+
+    async with handler._sessionmaker.begin() as session:
+        session.add(
+            ThLocalesFallbacks(
+                project_id=TEST_PROJECT_ID,
+                locale="fr",
+                fallback_order=["it", "de", "es"],
+            )
+        )
+
+    async def resolve(lang: str, variant: str = "-"):
+        return await handler.resolve_published_translation(
+            TEST_PROJECT_ID, content_id, lang, variant
+        )
+
+    assert await resolve("fr") is None
+
+    await publish("es", "-")
+    de_rev = await publish("de", "-")
+    assert await resolve("fr", "tone=formal") == (de_rev, {"text": "de/-"}, "de")
+
+    fr_rev = await publish("fr", "-")
+    assert await resolve("fr", "tone=formal") == (fr_rev, {"text": "fr/-"}, "fr")
+
+    formal_rev = await publish("fr", "tone=formal")
+    assert await resolve("fr", "tone=formal") == (
+        formal_rev,
+        {"text": "fr/tone=formal"},
+        "fr",
+    )
+    # 回退语言只按默认变体匹配
+    assert await resolve("it", "tone=formal") is None
+
+
+@pytest.mark.asyncio
+async def test_draft_notifications_are_coalesced_into_one_wakeup(
+    handler: PersistenceHandler,
+):
+    """测试合并窗口内的新草稿通知只产生一次唤醒，并汇总项目与语言。"""
+    wakeups = handler.listen_for_notifications(coalesce_window=0.3)
+    first = asyncio.create_task(wakeups.__anext__())
+    try:
+        # 等待监听连接就绪
+        for _ in range(50):
+            if getattr(handler, "_notification_listener_conn", None) is not None:
+                break
+            await asyncio.sleep(0.05)
+
+        async with handler._sessionmaker() as session:
+            for lang in ["de", "fr", "de"] * 10:
+                payload = (
+                    f'{{"project_id": "{TEST_PROJECT_ID}", "target_langs": ["{lang}"]}}'
+                )
+                await session.execute(
+                    text("SELECT pg_notify('new_translation_draft', :payload)"),
+                    {"payload": payload},
+                )
+                await session.commit()
+
+        wakeup = await asyncio.wait_for(first, timeout=5)
+        assert wakeup.notifications == 30
+        assert wakeup.project_ids == {TEST_PROJECT_ID}
+        assert wakeup.target_langs == {"de", "fr"}
+        assert wakeup.concerns(["fr", "ja"])
+        assert wakeup.concerns(None)
+        assert not wakeup.concerns(["ja"])
+    finally:
+        await wakeups.aclose()
+
+
+@pytest.mark.asyncio
+async def test_draft_notify_trigger_sends_one_notification_per_statement(
+    handler: PersistenceHandler,
+):
+    """测试新草稿触发器：批量插入只发送一条汇总通知，租约续约等更新不发送通知。"""
+    import asyncpg
+
+    received: list[dict] = []
+    conn = await asyncpg.connect(
+        handler.dsn.replace("postgresql+asyncpg", "postgresql")
+    )
+    await conn.add_listener(
+        "new_translation_draft",
+        lambda c, p, ch, payload: received.append(json.loads(payload)),
+    )
+
+    async def _drain() -> list[dict]:
+        # 通知在事务提交后异步送达
+        await asyncio.sleep(0.3)
+        batch = list(received)
+        received.clear()
+        return batch
+
+    try:
+        content_ids = [
+            await handler.upsert_content(
+                TEST_PROJECT_ID, TEST_NAMESPACE, {"id": f"n{i}"}, {"text": "Hi"}, 1
+            )
+            for i in range(20)
+        ]
+        await handler.get_or_create_translation_heads_bulk(
+            [
+                (TEST_PROJECT_ID, cid, lang, "-")
+                for cid in content_ids
+                for lang in ("de", "fr")
+            ]
+        )
+        assert await _drain() == [
+            {
+                "project_ids": [TEST_PROJECT_ID],
+                "target_langs": ["de", "fr"],
+                "count": 40,
+            }
+        ]
+
+        claimed = [b async for b in handler.stream_draft_translations(batch_size=50)]
+        heads = [(item.project_id, item.head_id) for batch in claimed for item in batch]
+        assert await handler.renew_leases(heads) == 40
+        assert await handler.release_leases(heads) == 40
+        assert await _drain() == []
+    finally:
+        await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_draft_translations_pages_with_keyset_cursor(
+    handler: PersistenceHandler,
+):
+    """测试草稿流式领取：按 (updated_at, id) 游标逐页推进，同一时间戳的草稿不丢不重。"""
+    content_ids = [
+        await handler.upsert_content(
+            TEST_PROJECT_ID, TEST_NAMESPACE, {"id": f"page{i}"}, {"text": "Hi"}, 1
+        )
+        for i in range(7)
+    ]
+    await handler.get_or_create_translation_heads_bulk(
+        [(TEST_PROJECT_ID, cid, "de", "-") for cid in content_ids]
+    )
+    # 全部草稿共享同一 updated_at，游标只能依靠 id 分量推进
+    async with handler._sessionmaker.begin() as session:
+        await session.execute(
+            update(ThTransHead).values(updated_at=text("'2024-01-01T00:00:00Z'"))
+        )
+
+    batches = [b async for b in handler.stream_draft_translations(batch_size=3)]
+    assert [len(b) for b in batches] == [3, 3, 1]
+    claimed = [item.content_id for b in batches for item in b]
+    assert sorted(claimed) == sorted(content_ids)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "target_langs, with_cursor, expected_index",
+    [
+        (None, False, "updated_at_id_idx"),
+        (None, True, "updated_at_id_idx"),
+        (["de"], False, "target_lang_updated_at_id_idx"),
+        (["de"], True, "target_lang_updated_at_id_idx"),
+        (["de", "fr"], True, "updated_at_id_idx"),
+    ],
+)
+async def test_draft_queue_query_uses_partial_indexes(
+    handler: PersistenceHandler, target_langs, with_cursor, expected_index
+):
+    """测试草稿队列查询的执行计划：走草稿部分索引，不退化为顺序扫描。"""
+    now = datetime.now(timezone.utc)
+    after = (now - timedelta(days=1), "0") if with_cursor else None
+    stmt = handler._draft_candidates(now, 50, target_langs, after)
+    async with handler._sessionmaker() as session:
+        sql = stmt.compile(
+            dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        # 空表上顺序扫描总是最便宜的；禁用后仍出现 Seq Scan 说明没有可用的索引
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(
+            (await session.execute(text(f"EXPLAIN {sql}"))).scalars().all()
+        )
+
+    assert "Seq Scan" not in plan, plan
+    assert "Sort  " not in plan, plan
+    # 分区父表上的部分索引在各分区上自动命名为 th_trans_head_p{i}_<列>_idx
+    assert len(re.findall(rf"th_trans_head_p\d_{expected_index}", plan)) == 8, plan
@@ -7,7 +7,9 @@ from __future__ import annotations
 import base64
 
 import pytest
+import rfc8785
 
+from trans_hub._uida import encoder
 from trans_hub._uida.encoder import (
     CanonicalizationError,
     generate_uid_components,
@@ -87,3 +89,57 @@ def test_i_json_guard_rejects_invalid_types():
     for keys in invalid_key_sets:
         with pytest.raises(CanonicalizationError):
             generate_uid_components(keys)
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        {"view": "main_page", "id": "submit_button", "version": 1},
+        {"页面": "首页", "键": "欢迎语", "版本": -3},
+        {"\U0001f600": 1, "\ufb01": 2, "z": 3},  # UTF-16 码元序与码点序不同
+        {"ctl": "".join(chr(i) for i in range(0x20)) + "\x7f\u2028"},
+        {"q": 'a"b\\c', "t": True, "f": False, "n": None},
+        {"max": 2**53 - 1, "min": -(2**53 - 1)},
+        {},
+    ],
+)
+def test_fast_path_matches_rfc8785(keys):
+    """快速路径必须与 rfc8785 逐字节一致。"""
+    assert encoder._fast_canonical_bytes(keys) == rfc8785.dumps(keys)
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        {"nested": {"a": 1}},
+        {"list": [1, 2]},
+        {"big": 2**53},
+        {"lone": "\ud800"},
+        {"value": 1.5},
+    ],
+)
+def test_fast_path_defers_to_generic_implementation(keys):
+    """非扁平或存在边界值时快速路径让位于通用实现。"""
+    assert encoder._fast_canonical_bytes(keys) is None
+
+
+def test_memo_distinguishes_bool_from_int():
+    """备忘录键需区分 True 与 1（二者相等且哈希相同）。"""
+    _, as_bool, _ = generate_uid_components({"flag": True})
+    _, as_int, _ = generate_uid_components({"flag": 1})
+    assert as_bool == b'{"flag":true}'
+    assert as_int == b'{"flag":1}'
+
+
+def test_memo_can_be_disabled(keys_a):
+    """禁用备忘录后结果不变，且超范围整数仍会报错。"""
+    expected = generate_uid_components(keys_a)
+    try:
+        encoder.configure_uid_memo(0)
+        assert generate_uid_components(keys_a) == expected
+        with pytest.raises(CanonicalizationError):
+            generate_uid_components({"big": 2**60})
+    finally:
+        encoder.configure_uid_memo(encoder.DEFAULT_UID_MEMO_SIZE)
+    with pytest.raises(CanonicalizationError):
+        generate_uid_components({"big": 2**60})
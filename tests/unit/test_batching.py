@@ -0,0 +1,58 @@
+# tests/unit/test_batching.py
+"""测试 Worker 自适应批次大小策略。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from trans_hub.config import BatchingConfig
+from trans_hub.policies.batching import AdaptiveBatchSizer
+
+
+def _sizer(initial_size: int = 50, **kwargs: Any) -> AdaptiveBatchSizer:
+    return AdaptiveBatchSizer(
+        BatchingConfig(**kwargs), initial_size=initial_size, engine="debug"
+    )
+
+
+def test_grows_while_batches_are_full_and_fast() -> None:
+    sizer = _sizer(max_size=80)
+    sizes = [sizer.observe(sizer.size, elapsed=0.5) for _ in range(10)]
+    assert sizes == sorted(sizes)
+    assert sizes[-1] == 80
+
+
+def test_halves_on_rate_limiting_and_respects_min_size() -> None:
+    sizer = _sizer(min_size=10)
+    assert sizer.observe(50, elapsed=1.0, failures=5, rate_limited=5) == 25
+    assert sizer.observe(25, elapsed=1.0, failures=5, rate_limited=5) == 12
+    assert sizer.observe(12, elapsed=1.0, failures=5, rate_limited=5) == 10
+
+
+def test_shrinks_when_error_rate_exceeds_threshold() -> None:
+    assert _sizer(error_rate_threshold=0.2).observe(50, 1.0, failures=10) > 50
+    assert _sizer(error_rate_threshold=0.2).observe(50, 1.0, failures=11) == 37
+
+
+def test_shrinks_to_fit_target_latency() -> None:
+    """按条目均摊耗时估算整批耗时，超出目标延迟时缩小到恰好满足目标。"""
+    sizer = _sizer(target_latency=10.0)
+    assert sizer.observe(50, elapsed=25.0) == 20
+
+
+def test_holds_when_backlog_is_short_or_writer_is_behind() -> None:
+    sizer = _sizer()
+    assert sizer.observe(12, elapsed=0.1) == 50
+    assert sizer.observe(50, elapsed=0.1, backpressured=True) == 50
+
+
+def test_fixed_size_when_adaptive_is_disabled() -> None:
+    sizer = _sizer(adaptive=False)
+    assert sizer.observe(50, elapsed=0.1) == 50
+    assert sizer.observe(50, elapsed=1.0, failures=50, rate_limited=50) == 50
+
+
+def test_fixed_size_ignores_adaptive_bounds() -> None:
+    assert _sizer(initial_size=500, adaptive=False).size == 500
+    assert _sizer(initial_size=2, adaptive=False).size == 2
+    assert _sizer(initial_size=500).size == 200
@@ -0,0 +1,63 @@
+# tests/unit/test_cache.py
+"""测试进程内解析缓存的命中统计与按内容失效。"""
+
+from __future__ import annotations
+
+from trans_hub.cache import ResolveCache
+from trans_hub.config import CacheConfig
+
+
+def _key(lang: str, variant: str = "-") -> tuple[str, str, bytes, str, str]:
+    return ("proj", "ns", b"\x00" * 32, lang, variant)
+
+
+def test_get_put_counts_hits_and_misses() -> None:
+    """缓存的 None（无已发布译文）同样算作命中。"""
+    cache = ResolveCache(CacheConfig(enabled=True))
+    assert cache.get(_key("de")) == (False, None)
+
+    cache.put(_key("de"), "c1", {"text": "Hallo"})
+    cache.put(_key("fr"), "c1", None)
+    assert cache.get(_key("de")) == (True, {"text": "Hallo"})
+    assert cache.get(_key("fr")) == (True, None)
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["size"] == 2
+
+
+def test_invalidate_content_drops_all_langs_of_that_content_only() -> None:
+    """失效按 content_id 进行，覆盖该内容的全部语言与变体。"""
+    cache = ResolveCache(CacheConfig(enabled=True, cache_type="lru", maxsize=10))
+    cache.put(_key("de"), "c1", {"text": "Hallo"})
+    cache.put(_key("de", "formal"), "c1", {"text": "Guten Tag"})
+    other = ("proj", "ns", b"\x01" * 32, "de", "-")
+    cache.put(other, "c2", {"text": "Welt"})
+
+    assert cache.invalidate_content("c1") == 2
+    assert cache.get(_key("de")) == (False, None)
+    assert cache.get(other) == (True, {"text": "Welt"})
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_lru_respects_maxsize() -> None:
+    cache = ResolveCache(CacheConfig(enabled=True, cache_type="lru", maxsize=2))
+    for lang in ("de", "fr", "es"):
+        cache.put(_key(lang), "c1", None)
+    assert cache.stats()["size"] == 2
+    assert cache.get(_key("de"))[0] is False
+
+
+def test_put_is_skipped_after_an_invalidation_during_the_read() -> None:
+    """读取开始后发生的失效会使该次回填作废，旧结果不会在通知之后写回。"""
+    cache = ResolveCache(CacheConfig(enabled=True, cache_type="lru", maxsize=10))
+    generation = cache.generation
+
+    # 失效通知先于回填到达：此时缓存中尚无该内容的条目
+    assert cache.invalidate_content("c1") == 0
+    assert cache.put(_key("de"), "c1", {"text": "veraltet"}, generation) is False
+    assert cache.get(_key("de")) == (False, None)
+
+    assert cache.put(_key("de"), "c1", {"text": "Hallo"}, cache.generation) is True
+    assert cache.get(_key("de")) == (True, {"text": "Hallo"})
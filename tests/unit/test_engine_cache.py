@@ -0,0 +1,94 @@
+# tests/unit/test_engine_cache.py
+"""测试引擎响应缓存的命中、过期与容量淘汰。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from trans_hub.config import EngineCacheConfig
+from trans_hub.core.types import EngineBatchItemResult, EngineSuccess
+from trans_hub.engine_cache import EngineResponseCache
+from trans_hub.engines.debug import DebugEngine, DebugEngineConfig
+
+
+class _CountingEngine(DebugEngine):
+    def __init__(self, config: DebugEngineConfig):
+        super().__init__(config)
+        self.calls = 0
+
+    async def _execute_single_translation(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> EngineBatchItemResult:
+        self.calls += 1
+        return await super()._execute_single_translation(
+            text, target_lang, source_lang, context_config
+        )
+
+
+@pytest.fixture
+async def cache(tmp_path: Path) -> Any:
+    cache = EngineResponseCache(EngineCacheConfig(path=str(tmp_path / "cache.db")))
+    yield cache
+    await cache.close()
+
+
+async def test_repeated_requests_are_served_from_cache(
+    cache: EngineResponseCache,
+) -> None:
+    engine = _CountingEngine(DebugEngineConfig())
+    engine.response_cache = cache
+
+    first = await engine.atranslate_batch(["a", "b"], "de")
+    second = await engine.atranslate_batch(["b", "c", "a"], "de")
+    other_lang = await engine.atranslate_batch(["a"], "fr")
+
+    assert engine.calls == 2 + 1 + 1
+    assert all(isinstance(r, EngineSuccess) and not r.from_cache for r in first)
+    assert [r.from_cache for r in second if isinstance(r, EngineSuccess)] == [
+        True,
+        False,
+        True,
+    ]
+    assert isinstance(other_lang[0], EngineSuccess) and not other_lang[0].from_cache
+    assert second[2] == first[0].model_copy(update={"from_cache": True})
+    assert all(
+        isinstance(r, EngineSuccess) and r.params_hash for r in [*first, *second]
+    )
+
+
+async def test_failures_are_not_cached(cache: EngineResponseCache) -> None:
+    engine = _CountingEngine(DebugEngineConfig(fail_on_text="bad"))
+    engine.response_cache = cache
+
+    await engine.atranslate_batch(["bad"], "de")
+    await engine.atranslate_batch(["bad"], "de")
+
+    assert engine.calls == 2
+
+
+async def test_expired_and_overflowing_entries_are_evicted(tmp_path: Path) -> None:
+    cache = EngineResponseCache(
+        EngineCacheConfig(path=str(tmp_path / "cache.db"), max_entries=2)
+    )
+    try:
+        for i in (1, 2, 3):
+            await cache.put_many({f"k{i}": f"v{i}"})
+        await cache.get_many(["k1"])  # k1 最近被访问，应保留
+
+        assert await cache.evict() == 1
+        assert await cache.get_many(["k1", "k2", "k3"]) == {"k1": "v1", "k3": "v3"}
+
+        cache.config = EngineCacheConfig(path=cache.config.path, ttl=1)
+        conn = await cache._connection()
+        await conn.execute("UPDATE engine_cache SET created_at = created_at - 10")
+        assert await cache.get_many(["k1"]) == {}
+        assert await cache.evict() == 2
+    finally:
+        await cache.close()
@@ -0,0 +1,74 @@
+# tests/unit/test_engine_chunking.py
+"""测试引擎基类按条目数与 token 预算拆分批次。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from trans_hub.core.types import EngineBatchItemResult, EngineSuccess
+from trans_hub.engines.debug import DebugEngine, DebugEngineConfig
+
+
+class _RecordingEngine(DebugEngine):
+    """记录每个分块大小的 Debug 引擎。"""
+
+    def __init__(self, config: DebugEngineConfig):
+        super().__init__(config)
+        self.chunks: list[list[str]] = []
+
+    async def _atranslate_chunk(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> list[EngineBatchItemResult | BaseException]:
+        self.chunks.append(texts)
+        return await super()._atranslate_chunk(
+            texts, target_lang, source_lang, context_config
+        )
+
+
+async def test_batches_are_split_by_item_count_and_reassembled_in_order() -> None:
+    engine = _RecordingEngine(DebugEngineConfig(max_batch_size=4))
+    texts = [f"t{i}" for i in range(10)]
+
+    results = await engine.atranslate_batch(texts, target_lang="de")
+
+    assert [len(c) for c in engine.chunks] == [4, 4, 2]
+    assert [r.translated_text for r in results if isinstance(r, EngineSuccess)] == [
+        f"Translated({t}) to de" for t in texts
+    ]
+
+
+async def test_batches_are_split_by_token_budget() -> None:
+    engine = _RecordingEngine(
+        DebugEngineConfig(max_batch_size=100, max_batch_tokens=50)
+    )
+    # 每条约 26 个估算 token：两条即超出预算；超长文本独占一个分块
+    texts = ["a" * 100, "b" * 100, "c" * 1000, "d"]
+
+    results = await engine.atranslate_batch(texts, target_lang="de")
+
+    assert engine.chunks == [["a" * 100], ["b" * 100], ["c" * 1000], ["d"]]
+    assert len(results) == len(texts)
+
+
+async def test_mismatched_chunk_results_fail_the_whole_chunk() -> None:
+    class _BrokenEngine(DebugEngine):
+        async def _atranslate_chunk(
+            self,
+            texts: list[str],
+            target_lang: str,
+            source_lang: str | None,
+            context_config: dict[str, Any],
+        ) -> list[EngineBatchItemResult | BaseException]:
+            return [EngineSuccess(translated_text="only one")]
+
+    engine = _BrokenEngine(DebugEngineConfig())
+    results = await engine.atranslate_batch(["x", "y"], target_lang="de")
+
+    assert [r.is_retryable for r in results if not isinstance(r, EngineSuccess)] == [
+        True,
+        True,
+    ]
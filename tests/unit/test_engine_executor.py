@@ -0,0 +1,80 @@
+# tests/unit/test_engine_executor.py
+"""测试阻塞型引擎的专属线程池与线程会话。"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from trans_hub.core.types import EngineBatchItemResult, EngineSuccess
+from trans_hub.engines.base import BaseEngineConfig, BaseTranslationEngine
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.thread = threading.current_thread().name
+        self.closed = False
+
+
+class _BlockingEngine(BaseTranslationEngine[BaseEngineConfig]):
+    CONFIG_MODEL = BaseEngineConfig
+    BLOCKING_IO = True
+
+    def __init__(self, config: BaseEngineConfig):
+        super().__init__(config)
+        self.sessions: list[_Session] = []
+
+    def _create_thread_session(self) -> Any:
+        session = _Session()
+        self.sessions.append(session)
+        return session
+
+    def _close_thread_session(self, session: Any) -> None:
+        session.closed = True
+
+    def _translate(self, text: str) -> str:
+        session = self._thread_session()
+        assert session.thread == threading.current_thread().name
+        return f"{session.thread}:{text}"
+
+    async def _execute_single_translation(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> EngineBatchItemResult:
+        return EngineSuccess(
+            translated_text=await self.run_blocking(self._translate, text)
+        )
+
+
+async def test_initialize_warms_one_session_per_executor_thread() -> None:
+    engine = _BlockingEngine(BaseEngineConfig(max_concurrency=3))
+    await engine.initialize()
+
+    assert len(engine.sessions) == 3
+    assert len({s.thread for s in engine.sessions}) == 3
+    assert all(s.thread.startswith("trans-hub-_blocking") for s in engine.sessions)
+
+    results = await engine.atranslate_batch([f"t{i}" for i in range(20)], "de")
+
+    # 所有调用都在预热好的线程中执行，复用其会话，不会新建会话
+    assert len(engine.sessions) == 3
+    used = {
+        r.translated_text.split(":")[0] for r in results if isinstance(r, EngineSuccess)
+    }
+    assert used <= {s.thread for s in engine.sessions}
+
+    await engine.close()
+    assert all(s.closed for s in engine.sessions)
+    assert engine._executor is None
+
+
+async def test_executor_is_created_lazily_without_initialize() -> None:
+    engine = _BlockingEngine(BaseEngineConfig())
+    results = await engine.atranslate_batch(["a"], "de")
+
+    assert isinstance(results[0], EngineSuccess)
+    assert results[0].translated_text.startswith("trans-hub-_blocking")
+    await engine.close()
@@ -0,0 +1,202 @@
+# tests/unit/test_openai_packed.py
+"""使用本地 OpenAI 兼容桩测试 OpenAIEngine 的打包翻译模式。"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+pytest.importorskip("openai")
+
+import httpx  # noqa: E402
+from openai import AsyncOpenAI  # noqa: E402
+from pydantic import SecretStr  # noqa: E402
+
+from trans_hub.core.types import EngineError, EngineSuccess  # noqa: E402
+from trans_hub.engines.openai import OpenAIEngine, OpenAIEngineConfig  # noqa: E402
+
+Reply = Callable[[list[dict[str, Any]]], str]
+
+
+def _completion(content: str, finish_reason: str = "stop") -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+    }
+
+
+def _packed_reply(segments: list[dict[str, Any]]) -> str:
+    translations = [{"id": s["id"], "text": f"[de] {s['text']}"} for s in segments]
+    return json.dumps({"translations": translations})
+
+
+class _Stub:
+    """记录请求数量的 chat completions 桩：打包请求交给 reply，单条请求直接回显。"""
+
+    def __init__(
+        self,
+        reply: Reply = _packed_reply,
+        status: int = 200,
+        packed_finish_reason: str = "stop",
+    ):
+        self.reply = reply
+        self.status = status
+        self.packed_finish_reason = packed_finish_reason
+        self.packed_requests = 0
+        self.single_requests = 0
+        self.failed_requests = 0
+        self.packed_max_tokens: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.status != 200:
+            self.failed_requests += 1
+            return httpx.Response(self.status, json={"error": {"message": "stub"}})
+        body = json.loads(request.content)
+        user_content = body["messages"][-1]["content"]
+        try:
+            segments = json.loads(user_content)["segments"]
+        except (json.JSONDecodeError, TypeError, KeyError):
+            self.single_requests += 1
+            return httpx.Response(200, json=_completion("[de] single"))
+        self.packed_requests += 1
+        self.packed_max_tokens.append(body["max_tokens"])
+        return httpx.Response(
+            200, json=_completion(self.reply(segments), self.packed_finish_reason)
+        )
+
+
+def _engine(stub: _Stub, **config: Any) -> OpenAIEngine:
+    engine = OpenAIEngine(
+        OpenAIEngineConfig(api_key=SecretStr("stub-key"), max_retries=0, **config)
+    )
+    engine.client = AsyncOpenAI(
+        api_key="stub-key",
+        base_url="http://stub/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(stub)),
+    )
+    return engine
+
+
+async def test_packed_mode_translates_a_batch_with_one_request_per_chunk() -> None:
+    stub = _Stub()
+    engine = _engine(stub, max_batch_size=25)
+    texts = [f"string {i}" for i in range(50)]
+
+    results = await engine.atranslate_batch(texts, "de", source_lang="en")
+
+    assert stub.packed_requests == 2
+    assert stub.single_requests == 0
+    assert [r.translated_text for r in results if isinstance(r, EngineSuccess)] == [
+        f"[de] {t}" for t in texts
+    ]
+
+
+async def test_only_invalid_segments_fall_back_to_single_requests() -> None:
+    def drop_and_reorder(segments: list[dict[str, Any]]) -> str:
+        # 丢失第 2 条、打乱顺序并给第 4 条空译文
+        kept = [s for s in reversed(segments) if s["id"] != 2]
+        translations = [
+            {"id": s["id"], "text": "" if s["id"] == 4 else f"[de] {s['text']}"}
+            for s in kept
+        ]
+        return "```json\n" + json.dumps({"translations": translations}) + "\n```"
+
+    stub = _Stub(drop_and_reorder)
+    engine = _engine(stub)
+    texts = ["a", "b", "c", "d", "e"]
+
+    results = await engine.atranslate_batch(texts, "de", source_lang="en")
+
+    assert stub.packed_requests == 1
+    assert stub.single_requests == 2
+    assert [r.translated_text for r in results if isinstance(r, EngineSuccess)] == [
+        "[de] a",
+        "[de] single",
+        "[de] c",
+        "[de] single",
+        "[de] e",
+    ]
+
+
+async def test_unparseable_response_falls_back_for_the_whole_chunk() -> None:
+    stub = _Stub(lambda segments: "Sure! Here are your translations.")
+    engine = _engine(stub)
+
+    results = await engine.atranslate_batch(["a", "b", "c"], "de", source_lang="en")
+
+    assert (stub.packed_requests, stub.single_requests) == (1, 3)
+    assert all(isinstance(r, EngineSuccess) for r in results)
+
+
+async def test_rate_limited_chunk_is_not_amplified_into_single_requests() -> None:
+    stub = _Stub(status=429)
+    engine = _engine(stub)
+
+    results = await engine.atranslate_batch(["a", "b", "c"], "de", source_lang="en")
+
+    assert stub.single_requests == 0
+    assert all(isinstance(r, EngineError) and r.is_rate_limited for r in results)
+
+
+@pytest.mark.parametrize("status", [500, 503])
+async def test_failing_endpoint_is_not_amplified_into_single_requests(
+    status: int,
+) -> None:
+    stub = _Stub(status=status)
+    engine = _engine(stub)
+
+    results = await engine.atranslate_batch(["a", "b", "c"], "de", source_lang="en")
+
+    assert stub.failed_requests == 1
+    assert all(isinstance(r, EngineError) and r.is_retryable for r in results)
+
+
+async def test_truncated_packed_response_falls_back_to_single_requests() -> None:
+    stub = _Stub(packed_finish_reason="length")
+    engine = _engine(stub)
+
+    results = await engine.atranslate_batch(["a", "b", "c"], "de", source_lang="en")
+
+    assert (stub.packed_requests, stub.single_requests) == (1, 3)
+    assert all(isinstance(r, EngineSuccess) for r in results)
+
+
+async def test_prompt_hash_is_per_config_across_packed_and_single_chunks() -> None:
+    stub = _Stub()
+    engine = _engine(stub, max_batch_size=2)
+
+    # 第二个分块只有一条，以逐条模板发送
+    results = await engine.atranslate_batch(["a", "b", "c"], "de", source_lang="en")
+
+    assert (stub.packed_requests, stub.single_requests) == (1, 1)
+    prompt_hash, _ = engine.request_hashes({})
+    assert prompt_hash is not None
+    assert {r.prompt_hash for r in results if isinstance(r, EngineSuccess)} == {
+        prompt_hash
+    }
+
+
+async def test_packed_chunks_are_split_to_fit_the_output_token_limit() -> None:
+    stub = _Stub()
+    engine = _engine(stub, max_output_tokens=200)
+    # 每条约 13 个 token：译文预估 2 倍 + 编号开销为 38，扣除余量后每个打包请求最多 4 条
+    texts = [f"segment number {i} " + "word " * 6 for i in range(40)]
+
+    results = await engine.atranslate_batch(texts, "de", source_lang="en")
+
+    assert stub.packed_requests == 10 and stub.single_requests == 0
+    assert max(stub.packed_max_tokens) <= 200
+    assert all(isinstance(r, EngineSuccess) for r in results)
@@ -0,0 +1,216 @@
+# tests/unit/test_openai_tokens.py
+"""测试 OpenAIEngine 的 token 估算、按 token 限流（TPM）的预留/对账与自适应限流反馈。"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+import pytest
+
+pytest.importorskip("openai")
+
+import httpx  # noqa: E402
+from openai import AsyncOpenAI  # noqa: E402
+from pydantic import SecretStr  # noqa: E402
+
+from trans_hub.core.types import EngineError, EngineSuccess  # noqa: E402
+from trans_hub.engines.base import estimate_tokens  # noqa: E402
+from trans_hub.engines.openai import (  # noqa: E402
+    OpenAIEngine,
+    OpenAIEngineConfig,
+    _parse_duration,
+)
+from trans_hub.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+
+
+class _Stub:
+    """返回固定 usage 的 chat completions 桩，记录每次请求的 max_tokens。"""
+
+    def __init__(
+        self,
+        total_tokens: int = 50,
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+    ):
+        self.total_tokens = total_tokens
+        self.status = status
+        self.headers = headers or {}
+        self.max_tokens: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.status != 200:
+            return httpx.Response(
+                self.status, headers=self.headers, json={"error": {"message": "stub"}}
+            )
+        self.max_tokens.append(json.loads(request.content)["max_tokens"])
+        return httpx.Response(
+            200,
+            headers=self.headers,
+            json={
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stub",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "Hallo Welt"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": self.total_tokens - 5,
+                    "completion_tokens": 5,
+                    "total_tokens": self.total_tokens,
+                },
+            },
+        )
+
+
+def _engine(stub: _Stub, **config: Any) -> OpenAIEngine:
+    engine = OpenAIEngine(
+        OpenAIEngineConfig(api_key=SecretStr("stub-key"), max_retries=0, **config)
+    )
+    engine.client = AsyncOpenAI(
+        api_key="stub-key",
+        base_url="http://stub/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(stub)),
+    )
+    return engine
+
+
+def test_estimate_tokens_by_script() -> None:
+    assert estimate_tokens("Hello world!") == 3 + 1
+    assert estimate_tokens("你好世界") == 4 + 1
+    assert estimate_tokens("Привет") == 3 + 1
+
+
+async def test_max_tokens_follows_the_completion_estimate() -> None:
+    stub = _Stub()
+    engine = _engine(stub, packed_batch=False)
+
+    await engine.atranslate_batch(["Hello world!"], "de", source_lang="en")
+
+    # 原文约 4 个 token：2 倍预留 + 固定余量，而非按字节数的 3 倍
+    assert stub.max_tokens == [4 * 2 + 32]
+
+
+async def test_max_tokens_is_capped_by_the_output_token_limit() -> None:
+    stub = _Stub()
+    engine = _engine(stub, packed_batch=False, max_output_tokens=256)
+
+    await engine.atranslate_batch(["word " * 500], "de", source_lang="en")
+
+    assert stub.max_tokens == [256]
+
+
+async def test_reserved_tokens_are_reconciled_with_reported_usage() -> None:
+    stub = _Stub(total_tokens=50)
+    engine = _engine(stub, tpm=6000, packed_batch=False)
+    assert engine._token_limiter is not None
+
+    results = await engine.atranslate_batch(["Hello world!"], "de", source_lang="en")
+
+    assert isinstance(results[0], EngineSuccess)
+    # 预留量在收到响应后按实际用量（50）对账，余额只扣除实际消耗
+    assert 5950 <= engine._token_limiter.tokens <= 6000
+
+
+async def test_packed_reservations_stay_within_the_output_token_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _engine(_Stub(), tpm=90000, max_output_tokens=300)
+    limiter = engine._token_limiter
+    assert limiter is not None
+    reserved: list[float] = []
+    original_acquire = limiter.acquire
+
+    async def recording_acquire(amount: float) -> None:
+        reserved.append(amount)
+        await original_acquire(amount)
+
+    monkeypatch.setattr(limiter, "acquire", recording_acquire)
+    texts = [f"segment {i} " + "word " * 20 for i in range(100)]
+
+    await engine.atranslate_batch(texts, "de", source_lang="en")
+
+    # 不封顶时 100 条会打包为一次请求，预留约 8000 token；
+    # 封顶后每次预留 = 小分块的提示词估算 + 不超过 300 的 max_tokens
+    assert len(reserved) > 1
+    assert max(reserved) < 1000
+
+
+async def test_rate_limit_drains_the_token_budget() -> None:
+    engine = _engine(_Stub(status=429), tpm=6000, packed_batch=False)
+    assert engine._token_limiter is not None
+
+    results = await engine.atranslate_batch(["Hello"], "de", source_lang="en")
+
+    assert isinstance(results[0], EngineError) and results[0].is_rate_limited
+    assert engine._token_limiter.tokens < 1
+
+
+async def test_failed_requests_refund_the_reserved_tokens() -> None:
+    engine = _engine(_Stub(status=400), tpm=6000, packed_batch=False)
+    assert engine._token_limiter is not None
+
+    results = await engine.atranslate_batch(["Hello"], "de", source_lang="en")
+
+    assert isinstance(results[0], EngineError) and not results[0].is_retryable
+    assert engine._token_limiter.tokens > 6000 - 1
+
+
+def test_sdk_retries_are_disabled_under_token_or_adaptive_limiting() -> None:
+    def client_retries(**config: Any) -> int:
+        engine = OpenAIEngine(
+            OpenAIEngineConfig(api_key=SecretStr("stub-key"), max_retries=2, **config)
+        )
+        return engine.client.max_retries
+
+    assert client_retries() == 2
+    assert client_retries(tpm=6000) == 0
+    assert client_retries(adaptive_rate=True) == 0
+
+
+async def test_rate_limit_feedback_slows_the_adaptive_limiter() -> None:
+    engine = _engine(
+        _Stub(status=429, headers={"retry-after-ms": "1500"}),
+        adaptive_rate=True,
+        rps=8,
+        packed_batch=False,
+    )
+    limiter = engine._rate_limiter
+    assert isinstance(limiter, AdaptiveRateLimiter)
+
+    results = await engine.atranslate_batch(["Hello"], "de", source_lang="en")
+
+    assert isinstance(results[0], EngineError) and results[0].retry_after == 1.5
+    assert limiter.rate == 4.0
+    assert limiter._paused_until > time.monotonic() + 1
+
+
+async def test_quota_headers_cap_the_adaptive_limiter() -> None:
+    stub = _Stub(
+        headers={
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "59",
+            "x-ratelimit-reset-requests": "1s",
+        }
+    )
+    engine = _engine(stub, adaptive_rate=True, rps=8, packed_batch=False)
+    limiter = engine._rate_limiter
+    assert isinstance(limiter, AdaptiveRateLimiter)
+
+    await engine.atranslate_batch(["Hello"], "de", source_lang="en")
+
+    assert limiter.max_rate == limiter.rate == 1.0
+
+
+def test_parse_reset_durations() -> None:
+    assert _parse_duration("6m0s") == 360.0
+    assert _parse_duration("250ms") == 0.25
+    assert _parse_duration("1.5s") == 1.5
+    assert _parse_duration(None) is None
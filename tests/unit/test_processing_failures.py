@@ -0,0 +1,75 @@
+# tests/unit/test_processing_failures.py
+"""测试处理策略对失败条目的重试计数、退避与死信判定。"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from trans_hub.config import RetryPolicyConfig
+from trans_hub.core.types import ContentItem, EngineError, FailedAttempt
+from trans_hub.engines.debug import DebugEngine, DebugEngineConfig
+from trans_hub.policies.processing import DefaultProcessingPolicy, TranslatedBatch
+
+
+class _RecordingHandler:
+    def __init__(self) -> None:
+        self.failures: list[FailedAttempt] = []
+
+    async def record_failed_attempts(self, failures: list[FailedAttempt]) -> int:
+        self.failures.extend(failures)
+        return sum(1 for f in failures if f.next_attempt_at is None)
+
+
+def _item(i: int, attempt_count: int) -> ContentItem:
+    return ContentItem(
+        translation_id=f"rev-{i}",
+        head_id=f"head-{i}",
+        revision_no=1,
+        content_id=f"content-{i}",
+        project_id="proj",
+        namespace="ns",
+        source_payload={"text": f"text {i}"},
+        source_lang="en",
+        target_lang="de",
+        variant_key="-",
+        attempt_count=attempt_count,
+    )
+
+
+async def _persist_failures(
+    failures: list[tuple[ContentItem, EngineError]],
+) -> list[FailedAttempt]:
+    handler = _RecordingHandler()
+    p_context: Any = SimpleNamespace(
+        config=SimpleNamespace(retry_policy=RetryPolicyConfig(max_attempts=2)),
+        handler=handler,
+    )
+    await DefaultProcessingPolicy().persist_batch(
+        TranslatedBatch(failures=failures),
+        p_context,
+        DebugEngine(DebugEngineConfig()),
+    )
+    return handler.failures
+
+
+async def test_rate_limited_chunk_is_not_counted_toward_max_attempts() -> None:
+    """打包请求被限流时整块条目同时失败：只退避重试，不计次数、不进入死信。"""
+    throttled = EngineError(
+        error_message="429", is_retryable=True, is_rate_limited=True, retry_after=30
+    )
+    failures = await _persist_failures([(_item(i, 1), throttled) for i in range(50)])
+
+    assert len(failures) == 50
+    assert all(f.attempt_count == 1 for f in failures)
+    assert all(f.next_attempt_at is not None for f in failures)
+
+
+async def test_other_retryable_failures_exhaust_max_attempts() -> None:
+    error = EngineError(error_message="boom", is_retryable=True)
+    (first, last) = await _persist_failures(
+        [(_item(0, 0), error), (_item(1, 1), error)]
+    )
+
+    assert (first.attempt_count, first.next_attempt_at is not None) == (1, True)
+    assert (last.attempt_count, last.next_attempt_at) == (2, None)
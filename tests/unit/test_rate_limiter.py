@@ -0,0 +1,54 @@
+# tests/unit/test_rate_limiter.py
+"""测试自适应限流器的乘性减速、Retry-After 暂停、加性探测与配额上限。"""
+
+from __future__ import annotations
+
+import time
+
+from trans_hub.rate_limiter import AdaptiveRateLimiter
+
+
+def test_concurrent_rate_limits_halve_the_rate_once() -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=10.0)
+
+    # 同一次拥塞中并发返回的多个 429 只减速一次
+    for _ in range(5):
+        limiter.on_rate_limited()
+
+    assert limiter.rate == 5.0
+    assert limiter.tokens <= 0
+
+
+async def test_retry_after_pauses_all_callers() -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=100.0)
+    started = time.monotonic()
+    limiter.on_rate_limited(retry_after=0.1)
+
+    await limiter.acquire()
+
+    assert time.monotonic() - started >= 0.1
+
+
+async def test_rate_is_probed_upward_only_while_it_is_the_bottleneck() -> None:
+    limiter = AdaptiveRateLimiter(
+        initial_rate=2.0, increase_step=1.0, probe_interval=0.0
+    )
+
+    # 令牌充足，速率并非瓶颈：不加速
+    await limiter.acquire()
+    limiter.on_success()
+    assert limiter.rate == 2.0
+
+    await limiter.acquire()
+    await limiter.acquire()  # 令牌耗尽，需等待补充
+    limiter.on_success()
+    assert limiter.rate == 3.0
+
+
+def test_reported_quota_caps_the_rate() -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=10.0)
+
+    limiter.observe_quota(limit_per_minute=120, remaining=50, reset_after=0.5)
+
+    assert limiter.max_rate == 2.0
+    assert limiter.rate == 2.0
@@ -0,0 +1,83 @@
+# tests/unit/test_scheduling.py
+"""测试草稿调度器的加权赤字轮转分配与键集游标。"""
+
+from __future__ import annotations
+
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any
+
+from trans_hub.policies.scheduling import FairDraftScheduler
+
+
+def _scheduler(**kwargs: Any) -> FairDraftScheduler:
+    return FairDraftScheduler(handler=None, **kwargs)  # type: ignore[arg-type]
+
+
+def test_allocate_fills_exactly_the_requested_slots() -> None:
+    scheduler = _scheduler()
+    for slots in (1, 7, 50):
+        shares = scheduler.allocate(["a", "b", "c"], slots)
+        assert sum(shares.values()) == slots
+
+
+def test_allocate_is_fair_across_batches_when_slots_do_not_divide() -> None:
+    """名额不能整除时，取整余下的名额随赤字结转轮流分给各项目。"""
+    scheduler = _scheduler()
+    totals: Counter[str] = Counter()
+    for _ in range(30):
+        totals.update(scheduler.allocate(["a", "b", "c"], 10))
+    assert totals == {"a": 100, "b": 100, "c": 100}
+
+
+def test_allocate_follows_weights() -> None:
+    scheduler = _scheduler(weights={"vip": 3.0})
+    totals: Counter[str] = Counter()
+    for _ in range(10):
+        totals.update(scheduler.allocate(["vip", "bulk"], 8))
+    assert totals == {"vip": 60, "bulk": 20}
+
+
+def test_allocate_gives_every_tenant_a_turn_when_tenants_exceed_slots() -> None:
+    """活跃项目多于每批名额时，所有项目在若干批内都能轮到。"""
+    scheduler = _scheduler()
+    tenants = [f"t{i}" for i in range(25)]
+    served: set[str] = set()
+    for _ in range(5):
+        served.update(scheduler.allocate(tenants, 5))
+    assert served == set(tenants)
+
+
+def test_forget_resets_carried_deficit() -> None:
+    scheduler = _scheduler()
+    scheduler.allocate(["a", "b"], 1)
+    scheduler._forget("a", 0)
+    scheduler._forget("b", 0)
+    assert scheduler._deficits == {}
+    assert scheduler._ring == []
+
+
+class _OneLaneHandler:
+    """只有一个项目、一个通道的草稿源，记录每次领取使用的游标。"""
+
+    def __init__(self) -> None:
+        self.afters: list[Any] = []
+
+    async def get_draft_lanes(self, target_langs: list[str] | None) -> dict[str, int]:
+        return {"p": 0}
+
+    async def claim_drafts(self, n: int, **kwargs: Any) -> tuple[list[Any], Any]:
+        self.afters.append(kwargs["after"])
+        return [SimpleNamespace(project_id="p")] * n, ("cursor", len(self.afters))
+
+
+async def test_cursors_restart_on_each_stream() -> None:
+    """新一轮领取从通道开头扫描，退避到期的旧草稿不必等整个通道耗尽。"""
+    handler = _OneLaneHandler()
+    scheduler = FairDraftScheduler(handler)  # type: ignore[arg-type]
+
+    for _ in range(2):
+        assert [len(b) async for b in scheduler.stream(batch_size=2, limit=4)] == [2, 2]
+
+    # 同一轮内沿用游标；每轮开始时清空
+    assert handler.afters == [None, ("cursor", 1), None, ("cursor", 3)]
@@ -0,0 +1,122 @@
+# tests/unit/test_sqlite_bulk.py
+"""测试 SQLite 下 request_many 的批量写入路径（ON CONFLICT 方言、修订号递增与 TM 命中）。"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from trans_hub._tm.normalizers import normalize_plain_text_for_reuse
+from trans_hub._uida.reuse_key import build_reuse_sha256
+from trans_hub.config import EngineName, TransHubConfig
+from trans_hub.coordinator import Coordinator
+from trans_hub.core import TranslationStatus
+from trans_hub.db.schema import Base, ThContent, ThTransHead, ThTransRev
+from trans_hub.persistence.sqlite import SQLitePersistenceHandler
+
+_PROJECT = "proj"
+_NAMESPACE = "ui.bulk"
+
+
+@pytest_asyncio.fixture
+async def coordinator(tmp_path: Path) -> AsyncGenerator[Coordinator, None]:
+    db_path = tmp_path / "bulk.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    handler = SQLitePersistenceHandler(
+        async_sessionmaker(engine, expire_on_commit=False), db_path=str(db_path)
+    )
+    coord = Coordinator(
+        TransHubConfig(
+            database_url=f"sqlite+aiosqlite:///{db_path}",
+            active_engine=EngineName.DEBUG,
+            source_lang="en",
+        ),
+        handler,
+    )
+    await coord.initialize()
+    yield coord
+    await coord.close()
+    await engine.dispose()
+
+
+def _item(key: str, text: str, target_langs: list[str]) -> dict[str, object]:
+    return {
+        "project_id": _PROJECT,
+        "namespace": _NAMESPACE,
+        "keys": {"id": key},
+        "source_payload": {"text": text},
+        "target_langs": target_langs,
+    }
+
+
+async def test_request_many_bulk_paths_on_sqlite(coordinator: Coordinator) -> None:
+    source_fields = {"text": normalize_plain_text_for_reuse("Save")}
+    await coordinator.handler.upsert_tm_entry(
+        project_id=_PROJECT,
+        namespace=_NAMESPACE,
+        reuse_sha256_bytes=build_reuse_sha256(
+            namespace=_NAMESPACE, reduced_keys={}, source_fields=source_fields
+        ),
+        source_lang="en",
+        target_lang="de",
+        variant_key="-",
+        policy_version=1,
+        hash_algo_version=1,
+        source_text_json=source_fields,
+        translated_json={"text": "Speichern"},
+        quality_score=0.9,
+    )
+
+    first = await coordinator.request_many(
+        [
+            _item("a", "Open", ["de", "fr"]),
+            _item("save", "Save", ["de"]),
+            # 同一块内重复的 UIDA：内容后者覆盖前者，修订号依次递增
+            _item("a", "Open file", ["de"]),
+            _item("bad", "Oops", ["??"]),
+        ]
+    )
+
+    assert [r.ok for r in first] == [True, True, True, False]
+    assert first[0].content_id == first[2].content_id
+    assert first[1].statuses == {"de": TranslationStatus.REVIEWED}
+    assert first[3].content_id is None and first[3].error_message
+
+    # 再次请求命中已存在的内容与译文头，不重复建行
+    second = await coordinator.request_many([_item("a", "Open folder", ["de"])])
+    assert second[0].content_id == first[0].content_id
+
+    async with coordinator.handler._sessionmaker() as session:  # type: ignore[attr-defined]
+        contents = (await session.execute(select(ThContent))).scalars().all()
+        revisions = (
+            await session.execute(
+                select(ThTransRev.target_lang, ThTransRev.revision_no).where(
+                    ThTransRev.content_id == first[0].content_id
+                )
+            )
+        ).all()
+        heads = (
+            await session.execute(
+                select(
+                    ThTransHead.target_lang,
+                    ThTransHead.current_no,
+                    ThTransHead.current_status,
+                ).where(ThTransHead.content_id == first[0].content_id)
+            )
+        ).all()
+
+    assert {c.keys_json["id"]: c.source_payload_json["text"] for c in contents} == {
+        "a": "Open folder",
+        "save": "Save",
+    }
+    # 译文头初建时的占位修订号为 0，此后各次请求依次为 1、2、3
+    assert sorted(no for lang, no in revisions if lang == "de") == [0, 1, 2, 3]
+    assert sorted(no for lang, no in revisions if lang == "fr") == [0, 1]
+    # 块内重复的头记录以最后一条修订为准
+    assert sorted(heads) == [("de", 3, "draft"), ("fr", 1, "draft")]
@@ -0,0 +1,132 @@
+# tests/unit/test_supervisor.py
+"""测试多进程 Worker 监管器：退避重启、吞吐汇总、统一停机与 CLI 入口。"""
+
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+import time
+from multiprocessing.queues import Queue as MPQueue
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from trans_hub.cli import supervisor
+from trans_hub.cli.state import State
+from trans_hub.cli.worker import worker_app
+from trans_hub.config import TransHubConfig
+
+_MARKER_DIR_ENV = "TH_TEST_SUPERVISOR_DIR"
+
+
+def _stub_worker(
+    config: TransHubConfig,
+    target_langs: list[str] | None,
+    slot_index: int,
+    reports: MPQueue[tuple[int, int]],
+) -> None:
+    """
+    替代真实 Worker 的子进程入口：首次启动上报 1 条后异常退出；
+    重启后上报 2 条并持续运行，收到 SIGTERM 时留下停机标记后退出。
+    """
+    marker_dir = Path(os.environ[_MARKER_DIR_ENV])
+    first_run = marker_dir / f"crashed-{slot_index}"
+    if not first_run.exists():
+        first_run.touch()
+        reports.put((slot_index, 1))
+        sys.exit(1)
+
+    def _on_sigterm(signum: int, frame: Any) -> None:
+        (marker_dir / f"stopped-{slot_index}").touch()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    reports.put((slot_index, 2))
+    (marker_dir / f"running-{slot_index}").touch()
+    while True:
+        time.sleep(0.1)
+
+
+def _config() -> TransHubConfig:
+    return TransHubConfig(database_url="sqlite+aiosqlite:///:memory:")
+
+
+def test_supervisor_restarts_crashed_workers_and_stops_all_on_sigterm(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(_MARKER_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(supervisor, "_INITIAL_RESTART_BACKOFF", 0.1)
+    reports: list[tuple[str, list[tuple[int, int]]]] = []
+    monkeypatch.setattr(
+        supervisor,
+        "_print_report",
+        lambda slots, window, title: reports.append(
+            (title, [(s.processed, s.restarts) for s in slots])
+        ),
+    )
+    processes = 2
+
+    def _terminate_when_restarted() -> None:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if all((tmp_path / f"running-{i}").exists() for i in range(processes)):
+                break
+            time.sleep(0.1)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    killer = threading.Thread(target=_terminate_when_restarted, daemon=True)
+    killer.start()
+    supervisor.run_supervisor(
+        _config(), None, processes, report_interval=3600, entry=_stub_worker
+    )
+    killer.join()
+
+    # 每个槽位崩溃一次后被重启，收到 SIGTERM 后全部子进程都按信号退出
+    assert all((tmp_path / f"stopped-{i}").exists() for i in range(processes))
+    title, totals = reports[-1]
+    assert title == "Worker 运行汇总"
+    assert totals == [(1 + 2, 1)] * processes
+
+
+def test_worker_processes_expose_metrics_on_offset_ports(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[tuple[int | None, list[str] | None]] = []
+    monkeypatch.setattr(
+        "trans_hub.cli.worker.run_worker",
+        lambda config, target_langs, on_processed=None: calls.append(
+            (config.metrics_port, target_langs)
+        ),
+    )
+    monkeypatch.setattr(supervisor, "discover_engines", lambda: None)
+    monkeypatch.setattr(supervisor, "setup_logging", lambda **kwargs: None)
+    config = _config().model_copy(update={"metrics_port": 9100})
+
+    for slot_index in (0, 2):
+        supervisor._worker_process_entry(config, ["de"], slot_index, None)  # type: ignore[arg-type]
+
+    assert calls == [(9100, ["de"]), (9102, ["de"])]
+
+
+def test_worker_start_with_processes_runs_the_supervisor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[tuple[list[str] | None, int]] = []
+    monkeypatch.setattr(
+        supervisor,
+        "run_supervisor",
+        lambda config, target_langs, processes: calls.append((target_langs, processes)),
+    )
+
+    result = CliRunner().invoke(
+        worker_app,
+        ["start", "--processes", "3", "--lang", "de"],
+        obj=State(config=_config()),
+    )
+
+    assert result.exit_code == 0, result.output
+    assert calls == [(["de"], 3)]
@@ -0,0 +1,94 @@
+# tests/unit/test_translators_packed.py
+"""使用本地替身测试 TranslatorsEngine 的打包翻译模式。"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from typing import Any
+
+from trans_hub.core.types import EngineError, EngineSuccess
+from trans_hub.engines.translators_engine import (
+    TranslatorsEngine,
+    TranslatorsEngineConfig,
+)
+
+
+class _Provider:
+    """替代 translators 库的服务商替身：记录调用次数，逐行加前缀“翻译”。"""
+
+    def __init__(self, rewrite: Callable[[str], str] | None = None):
+        self.calls: list[str] = []
+        self.rewrite = rewrite
+
+    def translate_text(self, query_text: str, **kwargs: Any) -> str:
+        self.calls.append(query_text)
+        if self.rewrite is not None:
+            return self.rewrite(query_text)
+        if "[[" not in query_text:
+            return f"de:{query_text}"
+        return re.sub(r"(\]\] )", r"\1de:", query_text)
+
+
+def _engine(provider: _Provider, **config: Any) -> TranslatorsEngine:
+    engine = TranslatorsEngine(TranslatorsEngineConfig(**config))
+    engine.ts_module = provider
+    return engine
+
+
+async def test_packed_mode_joins_segments_into_one_provider_call() -> None:
+    provider = _Provider()
+    engine = _engine(provider)
+    texts = [f"label {i}" for i in range(40)]
+
+    results = await engine.atranslate_batch(texts, "de", source_lang="en")
+
+    assert len(provider.calls) == 1
+    assert [r.translated_text for r in results if isinstance(r, EngineSuccess)] == [
+        f"de:{t}" for t in texts
+    ]
+
+
+async def test_packs_respect_the_provider_character_limit() -> None:
+    provider = _Provider()
+    engine = _engine(provider, packed_max_chars=100)
+    texts = ["x" * 40] * 6
+
+    results = await engine.atranslate_batch(texts, "de")
+
+    assert all(len(call) <= 100 for call in provider.calls)
+    assert len(provider.calls) == 3
+    assert all(isinstance(r, EngineSuccess) for r in results)
+
+
+async def test_misaligned_segments_fall_back_to_single_calls() -> None:
+    def lose_marker_two(query: str) -> str:
+        if "[[" not in query:
+            return f"single:{query}"
+        return query.replace("[[2]] ", "")
+
+    provider = _Provider(lose_marker_two)
+    engine = _engine(provider)
+
+    results = await engine.atranslate_batch(["a", "b", "c"], "de")
+
+    # 第 2 条的标记丢失后其译文并入第 1 条，两者都无法确认，均回退为逐条调用
+    assert len(provider.calls) == 1 + 2
+    assert [r.translated_text for r in results if isinstance(r, EngineSuccess)] == [
+        "single:a",
+        "single:b",
+        "c",
+    ]
+
+
+async def test_rate_limited_pack_is_not_retried_per_segment() -> None:
+    def too_many_requests(query: str) -> str:
+        raise RuntimeError("HTTP 429 Too Many Requests")
+
+    provider = _Provider(too_many_requests)
+    engine = _engine(provider)
+
+    results = await engine.atranslate_batch(["a", "b", "c"], "de")
+
+    assert len(provider.calls) == 1
+    assert all(isinstance(r, EngineError) and r.is_rate_limited for r in results)
@@ -0,0 +1,81 @@
+# tools/bench_uida_encoder.py
+"""
+UIDA 编码器微基准：验证快速规范化路径与 rfc8785 逐字节一致，并对比耗时。
+
+用法:
+    poetry run python tools/bench_uida_encoder.py [--number 20000]
+"""
+
+import argparse
+import base64
+import hashlib
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+try:
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    import rfc8785
+
+    from trans_hub._uida import encoder  # noqa: E402
+except (ImportError, IndexError):
+    print("错误: 无法将项目根目录添加到 sys.path。请确保此脚本位于 'tools' 目录下。")
+    sys.exit(1)
+
+# 来自真实业务的典型 keys 形态
+CORPUS: list[dict[str, Any]] = [
+    {"id": "submit_button"},
+    {"view": "main_page", "id": "submit_button", "version": 1},
+    {"mod_id": "testmod", "item": "sword", "version": "1.20.1"},
+    {"screen": "settings", "section": "audio", "key": "master_volume", "rev": 12},
+    {"file": "lang/en_us.json", "key": "item.minecraft.diamond_sword"},
+    {"页面": "首页", "键": "欢迎语", "版本": 3},
+    {"emoji": "👍", "\U0001f600": "smile", "ﬁ": "ligature"},
+    {"a": True, "b": None, "c": -42, "d": 'quote " and \\ backslash\n'},
+]
+
+
+def _baseline(keys: dict[str, Any]) -> tuple[str, bytes, bytes]:
+    """旧实现：I-JSON 守卫 + rfc8785 + base64 + SHA-256。"""
+    encoder._assert_i_json_compat(keys, "$.keys")
+    canonical = rfc8785.dumps(keys)
+    b64 = base64.urlsafe_b64encode(canonical).rstrip(b"=").decode("ascii")
+    return b64, canonical, hashlib.sha256(canonical).digest()
+
+
+def check_parity() -> None:
+    for keys in CORPUS:
+        expected = _baseline(keys)
+        assert encoder._fast_canonical_bytes(keys) == expected[1], keys
+        assert encoder._encode_components(keys) == expected, keys
+        assert encoder.generate_uid_components(keys) == expected, keys
+    print(f"✅ 一致性校验通过：{len(CORPUS)} 种 keys 形态与 rfc8785 逐字节一致。")
+
+
+def run(number: int) -> None:
+    def bench(label: str, fn: Any) -> float:
+        elapsed = timeit.timeit(lambda: [fn(k) for k in CORPUS], number=number)
+        per_call_us = elapsed / (number * len(CORPUS)) * 1e6
+        print(f"{label:<28} {per_call_us:8.2f} µs/次")
+        return per_call_us
+
+    base = bench("rfc8785 (旧实现)", _baseline)
+    fast = bench("快速路径 (无备忘录)", encoder._encode_components)
+    encoder.configure_uid_memo(encoder.DEFAULT_UID_MEMO_SIZE)
+    memo = bench("快速路径 + 备忘录", encoder.generate_uid_components)
+    print(f"加速比：快速路径 {base / fast:.1f}x，含备忘录 {base / memo:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="每种形态的重复次数")
+    args = parser.parse_args()
+    check_parity()
+    run(args.number)
+
+
+if __name__ == "__main__":
+    main()
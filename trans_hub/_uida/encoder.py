@@ -3,8 +3,15 @@ from __future__ import annotations
 
 import base64
 import hashlib
+from collections.abc import Callable
+from functools import lru_cache
+from json.encoder import encode_basestring
 from typing import Any
 
+# RFC 8785 将数字视为 IEEE-754 双精度，超出安全整数范围的 int 交由通用实现报错
+_MAX_SAFE_INT = 2**53 - 1
+DEFAULT_UID_MEMO_SIZE = 4096
+
 
 class CanonicalizationError(RuntimeError):
     """当输入不满足 I-JSON 或找不到 RFC8785 实现时抛出。"""
@@ -47,16 +54,103 @@ def _canonical_bytes(payload: Any) -> bytes:
         raise CanonicalizationError(f"JCS canonicalization failed: {e}") from e
 
 
-def generate_uid_components(keys: dict[str, Any]) -> tuple[str, bytes, bytes]:
-    """规范化入口（唯一真理源）。"""
-    _assert_i_json_compat(keys, "$.keys")
-    canonical_bytes = _canonical_bytes(keys)
+def _utf16_sort_key(key: str) -> bytes:
+    return key.encode("utf-16-be", "surrogatepass")
+
+
+def _fast_canonical_bytes(keys: dict[str, Any]) -> bytes | None:
+    """
+    扁平 {str: str | int | bool | None} 的 JCS 快速路径，输出与 rfc8785 逐字节一致。
+    - 成员按 UTF-16 码元排序（全 ASCII 时等价于普通字符串排序）；
+    - 字符串转义规则与 json 的 encode_basestring 相同（仅转义双引号、反斜杠与控制字符）。
+    遇到嵌套、浮点、超范围整数、孤立代理项等情况返回 None，交由通用实现处理（含报错）。
+    """
+    names = list(keys)
+    for name in names:
+        if type(name) is not str:
+            return None
+    if all(name.isascii() for name in names):
+        names.sort()
+    else:
+        names.sort(key=_utf16_sort_key)
+
+    parts: list[str] = []
+    for name in names:
+        value = keys[name]
+        kind = type(value)
+        if kind is str:
+            encoded = encode_basestring(value)
+        elif kind is int:
+            if not -_MAX_SAFE_INT <= value <= _MAX_SAFE_INT:
+                return None
+            encoded = str(value)
+        elif kind is bool:
+            encoded = "true" if value else "false"
+        elif value is None:
+            encoded = "null"
+        else:
+            return None
+        parts.append(f"{encode_basestring(name)}:{encoded}")
+    try:
+        return ("{" + ",".join(parts) + "}").encode("utf-8")
+    except UnicodeEncodeError:
+        return None
+
+
+def _encode_components(keys: dict[str, Any]) -> tuple[str, bytes, bytes]:
+    canonical_bytes = _fast_canonical_bytes(keys)
+    if canonical_bytes is None:
+        _assert_i_json_compat(keys, "$.keys")
+        canonical_bytes = _canonical_bytes(keys)
     b64 = base64.urlsafe_b64encode(canonical_bytes).rstrip(b"=").decode("ascii")
     sha = hashlib.sha256(canonical_bytes).digest()
     return b64, canonical_bytes, sha
 
 
+_SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _fingerprint(keys: dict[str, Any]) -> tuple[Any, ...] | None:
+    """
+    备忘录键：扁平标量字典返回与顺序无关的 (键, 类型, 值) 元组，否则返回 None。
+    带上类型是为了区分 True 与 1 这类相等但规范化结果不同的值。
+    """
+    items = []
+    for k, v in keys.items():
+        if type(k) is not str or type(v) not in _SCALAR_TYPES:
+            return None
+        items.append((k, type(v), v))
+    items.sort()
+    return tuple(items)
+
+
+@lru_cache(maxsize=DEFAULT_UID_MEMO_SIZE)
+def _memo_lookup(fingerprint: tuple[Any, ...]) -> tuple[str, bytes, bytes]:
+    return _encode_components({k: v for k, _, v in fingerprint})
+
+
+_memo: Callable[[tuple[Any, ...]], tuple[str, bytes, bytes]] | None = _memo_lookup
+
+
+def configure_uid_memo(maxsize: int) -> None:
+    """调整 `generate_uid_components` 备忘录的容量，0 表示禁用。"""
+    global _memo
+    _memo = lru_cache(maxsize=maxsize)(_memo_lookup.__wrapped__) if maxsize else None
+
+
+def generate_uid_components(keys: dict[str, Any]) -> tuple[str, bytes, bytes]:
+    """规范化入口（唯一真理源）。"""
+    if _memo is not None:
+        fingerprint = _fingerprint(keys)
+        if fingerprint is not None:
+            return _memo(fingerprint)
+    return _encode_components(keys)
+
+
 def get_canonical_json_for_debug(keys: dict[str, Any]) -> str:
     """返回 JCS 文本（用于日志与排错）。"""
-    _assert_i_json_compat(keys)
-    return _canonical_bytes(keys).decode("utf-8")
+    canonical_bytes = _fast_canonical_bytes(keys)
+    if canonical_bytes is None:
+        _assert_i_json_compat(keys)
+        canonical_bytes = _canonical_bytes(keys)
+    return canonical_bytes.decode("utf-8")
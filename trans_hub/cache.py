@@ -0,0 +1,81 @@
+# trans_hub/cache.py
+"""本模块提供 `Coordinator.get_translation` 使用的进程内解析缓存。"""
+
+from typing import Any
+
+from cachetools import Cache, LRUCache, TTLCache
+
+from trans_hub.config import CacheConfig
+
+# (project_id, namespace, keys_sha256_bytes, target_lang, variant_key)
+ResolveCacheKey = tuple[str, str, bytes, str, str]
+
+
+class ResolveCache:
+    """
+    一个有界的 LRU/TTL 解析缓存。
+
+    值为 (content_id, 已解析的译文或 None)。未命中已发布译文的结果同样会被缓存，
+    因此失效只能按 content_id 进行：发布或拒绝某条内容的任意修订时，
+    该内容在所有语言/变体下的缓存条目都会被清除（回退结果可能来自其他语言）。
+
+    读取在查询数据库前记下 `generation`，回填时传回：期间发生过失效则放弃回填，
+    避免失效通知之前读到的旧结果在通知之后被写回缓存。
+    """
+
+    def __init__(self, config: CacheConfig):
+        self._cache: Cache[ResolveCacheKey, tuple[str, dict[str, Any] | None]]
+        if config.cache_type == "lru":
+            self._cache = LRUCache(maxsize=config.maxsize)
+        else:
+            self._cache = TTLCache(maxsize=config.maxsize, ttl=config.ttl)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    def get(self, key: ResolveCacheKey) -> tuple[bool, dict[str, Any] | None]:
+        """返回 (是否命中, 缓存的译文)。"""
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry[1]
+
+    def put(
+        self,
+        key: ResolveCacheKey,
+        content_id: str,
+        value: dict[str, Any] | None,
+        generation: int | None = None,
+    ) -> bool:
+        """写入缓存；generation 与当前值不一致（读取后发生过失效）时放弃写入并返回 False。"""
+        if generation is not None and generation != self.generation:
+            return False
+        self._cache[key] = (content_id, value)
+        return True
+
+    def invalidate_content(self, content_id: str) -> int:
+        """清除指定内容的全部缓存条目，返回清除的数量。发布频率远低于读取，线性扫描可接受。"""
+        # 即使没有条目被清除也要推进代数：正在进行的读取可能随后回填旧结果
+        self.generation += 1
+        stale = [k for k, (cid, _) in list(self._cache.items()) if cid == content_id]
+        for key in stale:
+            self._cache.pop(key, None)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """返回命中/未命中/失效计数及当前容量信息。"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._cache),
+            "maxsize": int(self._cache.maxsize),
+        }
@@ -0,0 +1,158 @@
+# trans_hub/cli/dlq.py
+"""查看与处置死信队列 (DLQ) 的 CLI 命令。"""
+
+import asyncio
+from typing import Annotated
+
+import questionary
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from trans_hub.cli.state import State
+from trans_hub.cli.utils import create_coordinator
+from trans_hub.coordinator import Coordinator
+
+console = Console()
+dlq_app = typer.Typer(help="查看、重放和清除死信队列中的失败草稿")
+
+
+def _resolve_targets(ids: list[str] | None, all_: bool) -> list[str] | None:
+    """校验目标选择：必须指定 ID 或显式使用 --all。返回 None 表示全部。"""
+    if ids and all_:
+        console.print("[bold red]❌ 不能同时指定死信 ID 与 --all。[/bold red]")
+        raise typer.Exit(code=1)
+    if not ids and not all_:
+        console.print("[bold red]❌ 请指定至少一个死信 ID，或使用 --all。[/bold red]")
+        raise typer.Exit(code=1)
+    return ids or None
+
+
+async def _async_dlq_show(
+    coordinator: Coordinator, project_id: str | None, limit: int
+) -> None:
+    try:
+        await coordinator.initialize()
+        entries = await coordinator.list_dead_letters(
+            project_id=project_id, limit=limit
+        )
+        if not entries:
+            console.print("[green]死信队列为空。[/green]")
+            return
+
+        table = Table(title="死信队列", show_header=True, header_style="bold cyan")
+        table.add_column("ID", style="dim", no_wrap=True)
+        table.add_column("项目")
+        table.add_column("语言")
+        table.add_column("尝试次数", justify="right")
+        table.add_column("可重试")
+        table.add_column("引擎")
+        table.add_column("错误", style="red")
+        table.add_column("时间", style="dim")
+        for e in entries:
+            table.add_row(
+                e.id,
+                e.project_id,
+                e.target_lang
+                if e.variant_key == "-"
+                else f"{e.target_lang}/{e.variant_key}",
+                str(e.attempt_count),
+                "是" if e.is_retryable else "否",
+                e.engine_name or "-",
+                e.error_message,
+                e.created_at.isoformat(timespec="seconds"),
+            )
+        console.print(table)
+    finally:
+        await coordinator.close()
+
+
+async def _async_dlq_replay(
+    coordinator: Coordinator, ids: list[str] | None, project_id: str | None
+) -> None:
+    try:
+        await coordinator.initialize()
+        count = await coordinator.replay_dead_letters(ids=ids, project_id=project_id)
+        console.print(f"[bold green]✅ 已将 {count} 个草稿重新放回队列。[/bold green]")
+    finally:
+        await coordinator.close()
+
+
+async def _async_dlq_purge(
+    coordinator: Coordinator, ids: list[str] | None, project_id: str | None, yes: bool
+) -> None:
+    try:
+        await coordinator.initialize()
+        if not yes:
+            proceed = await questionary.confirm(
+                "清除后这些草稿将被标记为已拒绝，不再重试。是否继续？", default=False
+            ).ask_async()
+            if not proceed:
+                console.print("[red]操作已取消。[/red]")
+                return
+        count = await coordinator.purge_dead_letters(ids=ids, project_id=project_id)
+        console.print(f"[bold green]✅ 已清除 {count} 条死信记录。[/bold green]")
+    finally:
+        await coordinator.close()
+
+
+@dlq_app.command("show")
+def dlq_show(
+    ctx: typer.Context,
+    project_id: Annotated[
+        str | None, typer.Option("--project-id", help="仅显示指定项目的死信。")
+    ] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="最多显示的条数。")] = 50,
+) -> None:
+    """列出死信队列中最近的记录。"""
+    state: State = ctx.obj
+    coordinator = create_coordinator(state.config)
+    asyncio.run(_async_dlq_show(coordinator, project_id, limit))
+
+
+@dlq_app.command("replay")
+def dlq_replay(
+    ctx: typer.Context,
+    ids: Annotated[
+        list[str] | None, typer.Argument(help="要重放的死信 ID（可多个）。")
+    ] = None,
+    all_: Annotated[bool, typer.Option("--all", help="重放全部死信。")] = False,
+    project_id: Annotated[
+        str | None, typer.Option("--project-id", help="仅作用于指定项目。")
+    ] = None,
+) -> None:
+    """将死信对应的草稿清零重试计数后重新放回翻译队列。"""
+    targets = _resolve_targets(ids, all_)
+    state: State = ctx.obj
+    coordinator = create_coordinator(state.config)
+    asyncio.run(_async_dlq_replay(coordinator, targets, project_id))
+
+
+@dlq_app.command("purge")
+def dlq_purge(
+    ctx: typer.Context,
+    ids: Annotated[
+        list[str] | None, typer.Argument(help="要清除的死信 ID（可多个）。")
+    ] = None,
+    all_: Annotated[bool, typer.Option("--all", help="清除全部死信。")] = False,
+    project_id: Annotated[
+        str | None, typer.Option("--project-id", help="仅作用于指定项目。")
+    ] = None,
+    yes: Annotated[
+        bool, typer.Option("--yes", "-y", help="跳过确认提示，直接执行删除。")
+    ] = False,
+) -> None:
+    """删除死信记录（对应草稿标记为已拒绝，不会再被 Worker 领取）。"""
+    targets = _resolve_targets(ids, all_)
+    state: State = ctx.obj
+    coordinator = create_coordinator(state.config)
+    try:
+        asyncio.run(_async_dlq_purge(coordinator, targets, project_id, yes))
+    except Exception as e:
+        if "Not a tty" in str(e):
+            console.print(
+                "[bold red]❌ 错误：此命令需要交互式终端。请使用 --yes 标志运行。[/bold red]"
+            )
+        else:
+            console.print(f"[bold red]❌ 执行失败: {e}[/bold red]")
+        raise typer.Exit(code=1) from e
@@ -9,6 +9,7 @@ from rich.console import Console
 
 import trans_hub
 from trans_hub.cli.db import db_app
+from trans_hub.cli.dlq import dlq_app
 from trans_hub.cli.gc import gc_app
 from trans_hub.cli.request import request_app
 from trans_hub.cli.state import State
@@ -35,6 +36,7 @@ app.add_typer(request_app, name="request")
 app.add_typer(status_app, name="status")
 app.add_typer(gc_app, name="gc")
 app.add_typer(worker_app, name="worker")
+app.add_typer(dlq_app, name="dlq")
 
 console = Console()
 
@@ -0,0 +1,233 @@
+# trans_hub/cli/supervisor.py
+"""
+多进程 Worker 监管器（`trans-hub worker start --processes N`）。
+
+每个子进程都是完整的 Worker：拥有独立的 Coordinator、事件循环与连接池，
+彼此之间通过数据库中的草稿租约协调，无需按项目或分区分片。
+监管进程负责异常退出后的退避重启、统一停机，并定期报告各进程的吞吐。
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue as MPQueue
+from typing import Any
+
+import structlog
+from rich.console import Console
+from rich.table import Table
+
+from trans_hub.config import TransHubConfig
+from trans_hub.engine_registry import discover_engines
+from trans_hub.logging_config import setup_logging
+
+logger = structlog.get_logger(__name__)
+console = Console()
+
+REPORT_INTERVAL_SECONDS = 30.0
+SHUTDOWN_GRACE_SECONDS = 30.0
+_INITIAL_RESTART_BACKOFF = 1.0
+_MAX_RESTART_BACKOFF = 60.0
+# 子进程稳定运行超过该时长后，重启退避重新从初始值计算
+_STABLE_UPTIME_SECONDS = 60.0
+
+
+@dataclass
+class _WorkerSlot:
+    """监管进程为每个 Worker 槽位维护的状态。"""
+
+    index: int
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    processed: int = 0
+    reported: int = 0
+    restarts: int = 0
+    backoff: float = _INITIAL_RESTART_BACKOFF
+    restart_at: float | None = None
+
+
+def _worker_process_entry(
+    config: TransHubConfig,
+    target_langs: list[str] | None,
+    slot_index: int,
+    reports: MPQueue[tuple[int, int]],
+) -> None:
+    """子进程入口：重新初始化日志与引擎注册表后运行一个常规 Worker。"""
+    from trans_hub.cli.worker import run_worker
+
+    setup_logging(log_level=config.logging.level, log_format=config.logging.format)
+    discover_engines()
+    if config.metrics_port:
+        # 各子进程各自暴露指标，端口依槽位顺延，避免相互冲突
+        config = config.model_copy(
+            update={"metrics_port": config.metrics_port + slot_index}
+        )
+    structlog.contextvars.bind_contextvars(worker_slot=slot_index, pid=os.getpid())
+
+    def _report(processed: int) -> None:
+        if processed:
+            reports.put((slot_index, processed))
+
+    run_worker(config, target_langs, on_processed=_report)
+
+
+# 子进程入口的签名：(配置, 目标语言, 槽位序号, 吞吐上报队列)
+WorkerEntry = Callable[
+    [TransHubConfig, list[str] | None, int, "MPQueue[tuple[int, int]]"], None
+]
+
+
+def _start(
+    ctx: Any,
+    slot: _WorkerSlot,
+    config: TransHubConfig,
+    target_langs: list[str] | None,
+    reports: MPQueue[tuple[int, int]],
+    entry: WorkerEntry = _worker_process_entry,
+) -> None:
+    process = ctx.Process(
+        target=entry,
+        args=(config, target_langs, slot.index, reports),
+        name=f"trans-hub-worker-{slot.index}",
+    )
+    process.start()
+    slot.process = process
+    slot.started_at = time.monotonic()
+    slot.restart_at = None
+    logger.info("Worker 子进程已启动", slot=slot.index, pid=process.pid)
+
+
+def _drain_reports(reports: MPQueue[tuple[int, int]], slots: list[_WorkerSlot]) -> None:
+    while True:
+        try:
+            slot_index, processed = reports.get_nowait()
+        except queue.Empty:
+            return
+        slots[slot_index].processed += processed
+
+
+def _print_report(slots: list[_WorkerSlot], window: float, title: str) -> None:
+    table = Table(title=title, show_header=True, header_style="bold cyan")
+    table.add_column("槽位", justify="right")
+    table.add_column("PID", justify="right")
+    table.add_column("状态")
+    table.add_column("累计处理", justify="right")
+    table.add_column("吞吐 (条/秒)", justify="right")
+    table.add_column("重启次数", justify="right")
+    total_rate = 0.0
+    for slot in slots:
+        alive = slot.process is not None and slot.process.is_alive()
+        rate = (slot.processed - slot.reported) / window if window > 0 else 0.0
+        total_rate += rate
+        slot.reported = slot.processed
+        table.add_row(
+            str(slot.index),
+            str(slot.process.pid if slot.process else "-"),
+            "[green]运行中[/green]" if alive else "[red]已退出[/red]",
+            str(slot.processed),
+            f"{rate:.2f}",
+            str(slot.restarts),
+        )
+    console.print(table)
+    console.print(f"   合计吞吐: [bold]{total_rate:.2f}[/bold] 条/秒")
+
+
+def _stop_all(slots: list[_WorkerSlot], grace: float) -> None:
+    """向全部子进程发送 SIGTERM，让其处理完在途批次；超时仍未退出的强制结束。"""
+    alive = [s.process for s in slots if s.process and s.process.is_alive()]
+    for process in alive:
+        process.terminate()
+    deadline = time.monotonic() + grace
+    for process in alive:
+        process.join(timeout=max(0.0, deadline - time.monotonic()))
+    for process in alive:
+        if process.is_alive():
+            logger.warning("Worker 子进程未能按时退出，强制结束", pid=process.pid)
+            process.kill()
+            process.join()
+
+
+def run_supervisor(
+    config: TransHubConfig,
+    target_langs: list[str] | None,
+    processes: int,
+    report_interval: float = REPORT_INTERVAL_SECONDS,
+    entry: WorkerEntry = _worker_process_entry,
+) -> None:
+    """
+    派生并监管 `processes` 个 Worker 子进程，直到收到 SIGINT/SIGTERM。
+    entry 为子进程入口，须为可被 spawn 子进程导入的模块级函数。
+    """
+    # spawn：子进程从干净的解释器启动，不继承父进程的事件循环与连接池
+    ctx = mp.get_context("spawn")
+    reports: MPQueue[tuple[int, int]] = ctx.Queue()
+    slots = [_WorkerSlot(index=i) for i in range(processes)]
+    stopping = False
+
+    def _on_signal(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        if not stopping:
+            logger.warning(
+                "监管进程收到停机信号，正在停止全部 Worker...",
+                signal=signal.strsignal(signum),
+            )
+        stopping = True
+
+    previous_handlers = {
+        sig: signal.signal(sig, _on_signal) for sig in (signal.SIGINT, signal.SIGTERM)
+    }
+    console.print(
+        f"▶️  [bold green]Worker 监管进程已启动[/bold green]，"
+        f"共 {processes} 个子进程。按 CTRL+C 停止。"
+    )
+
+    started = last_report = time.monotonic()
+    try:
+        for slot in slots:
+            _start(ctx, slot, config, target_langs, reports, entry)
+
+        while not stopping:
+            time.sleep(0.5)
+            now = time.monotonic()
+            _drain_reports(reports, slots)
+
+            for slot in slots:
+                if stopping or slot.process is None or slot.process.is_alive():
+                    continue
+                if slot.restart_at is None:
+                    uptime = now - slot.started_at
+                    if uptime >= _STABLE_UPTIME_SECONDS:
+                        slot.backoff = _INITIAL_RESTART_BACKOFF
+                    slot.restart_at = now + slot.backoff
+                    logger.error(
+                        "Worker 子进程意外退出，将退避重启",
+                        slot=slot.index,
+                        pid=slot.process.pid,
+                        exitcode=slot.process.exitcode,
+                        restart_in=slot.backoff,
+                    )
+                    slot.backoff = min(slot.backoff * 2, _MAX_RESTART_BACKOFF)
+                elif now >= slot.restart_at:
+                    slot.restarts += 1
+                    _start(ctx, slot, config, target_langs, reports, entry)
+
+            if now - last_report >= report_interval:
+                _print_report(slots, now - last_report, "Worker 吞吐")
+                last_report = now
+    finally:
+        _stop_all(slots, SHUTDOWN_GRACE_SECONDS)
+        _drain_reports(reports, slots)
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        # 停机汇总报告整个运行期间的平均吞吐
+        for slot in slots:
+            slot.reported = 0
+        _print_report(slots, time.monotonic() - started, "Worker 运行汇总")
+        console.print("[bold]✅ 全部 Worker 已安全关闭。[/bold]")
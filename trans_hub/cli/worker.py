@@ -2,63 +2,195 @@
 """处理后台 Worker 运行的 CLI 命令（白皮书 Final v1.2）。"""
 
 import asyncio
+import contextlib
 import signal
-from typing import Any
+import time
+from collections.abc import Callable
+from typing import Annotated, Any
 
 import structlog
 import typer
 from rich.console import Console
+from rich.table import Table
 
 from trans_hub.cli.state import State
 from trans_hub.cli.utils import create_coordinator
+from trans_hub.config import TransHubConfig
 from trans_hub.coordinator import Coordinator
+from trans_hub.core import ContentItem
+from trans_hub.core.exceptions import DatabaseError
+from trans_hub.core.interfaces import HeadKey
+from trans_hub.metrics import start_metrics_server
+from trans_hub.policies.processing import PipelinedProcessingPolicy, TranslatedBatch
 
 logger = structlog.get_logger(__name__)
 console = Console()
 worker_app = typer.Typer(help="启动后台翻译 Worker")
 
+# 每轮 consume_and_process 结束后以处理条数回调，供监管进程统计吞吐
+ProcessedCallback = Callable[[int], None]
 
-async def consume_and_process(coordinator: Coordinator, reason: str) -> int:
+
+async def _renew_leases_periodically(
+    coordinator: Coordinator, in_flight: set[HeadKey], interval: float
+) -> None:
+    """在长批次处理期间，定期为仍在处理中的草稿续约。"""
+    while True:
+        await asyncio.sleep(interval)
+        if not in_flight:
+            continue
+        try:
+            renewed = await coordinator.handler.renew_leases(list(in_flight))
+            logger.debug("已续期草稿租约", renewed=renewed, in_flight=len(in_flight))
+        except DatabaseError:
+            logger.warning("续期草稿租约失败，将在下个周期重试", exc_info=True)
+
+
+async def consume_and_process(
+    coordinator: Coordinator,
+    reason: str,
+    target_langs: list[str] | None = None,
+    shutdown_event: asyncio.Event | None = None,
+) -> int:
     """
     消费并处理所有 'draft' 状态的翻译任务。
-    这是一个完整的“拉取-处理”循环。
+    处理以 领取 → 翻译 → 写回 三段流水线进行，各阶段之间由有界队列连接，
+    使数据库写回与引擎调用相互重叠；写回落后时队列写满，自然反压领取阶段。
+    每批草稿在领取时写入租约，处理期间由后台任务续约，异常退出时主动释放，
+    保证多个 Worker 不会重复翻译。收到停机信号后不再领取新批次，
+    已领取的批次会处理完毕再返回。
+    指定 target_langs 时仅处理这些目标语言，使每次引擎调用尽可能满载同一语言。
+    每批的条数由自适应批次策略根据引擎实测的延迟、限流与失败率在线调整。
     """
     logger.info(f"开始处理翻译任务 ({reason})...")
 
+    config = coordinator.config
+    policy = coordinator.processing_policy
+    # 只实现 process_batch 的自定义策略在翻译阶段一次完成翻译与写回
+    pipeline = policy if isinstance(policy, PipelinedProcessingPolicy) else None
+    p_context = coordinator.processing_context
     active_engine = coordinator._get_or_create_engine_instance(
-        coordinator.config.active_engine.value
+        config.active_engine.value
     )
     if not active_engine.initialized:
         await active_engine.initialize()
 
+    reaped = await coordinator.handler.release_expired_leases()
+    if reaped:
+        logger.warning(f"已回收 {reaped} 个过期租约（可能来自已崩溃的 Worker）。")
+
+    n_translators = config.worker_translate_concurrency
+    fetch_queue: asyncio.Queue[list[ContentItem] | None] = asyncio.Queue(
+        maxsize=config.worker_queue_depth
+    )
+    write_queue: asyncio.Queue[tuple[list[ContentItem], TranslatedBatch] | None] = (
+        asyncio.Queue(maxsize=config.worker_queue_depth)
+    )
+    sizer = coordinator.batch_sizer
+    in_flight: set[HeadKey] = set()
     total_processed = 0
-    async for batch in coordinator.handler.stream_draft_translations(
-        batch_size=coordinator.config.batch_size
-    ):
-        if not batch:
-            continue
 
-        batch_size = len(batch)
-        total_processed += batch_size
-        logger.info(
-            f"获取到 {batch_size} 个草稿任务进行处理...",
-            first_id=batch[0].translation_id,
-        )
+    # 队列中的 None 表示上游阶段已结束
+    async def fetcher() -> None:
+        nonlocal total_processed
+        # 按优先级通道与项目权重公平领取，避免单个大项目的积压阻塞其他租户
+        async for batch in coordinator.draft_scheduler.stream(
+            batch_size=lambda: sizer.size, target_langs=target_langs
+        ):
+            if not batch:
+                continue
+            in_flight.update((item.project_id, item.head_id) for item in batch)
+            total_processed += len(batch)
+            logger.info(
+                f"获取到 {len(batch)} 个草稿任务进行处理...",
+                first_id=batch[0].translation_id,
+            )
+            await fetch_queue.put(batch)
+            if shutdown_event is not None and shutdown_event.is_set():
+                logger.info("收到停机信号，停止领取新批次，等待在途批次完成。")
+                break
+        for _ in range(n_translators):
+            await fetch_queue.put(None)
 
-        await coordinator.processing_policy.process_batch(
-            batch, coordinator.processing_context, active_engine
-        )
+    async def translator() -> None:
+        while (batch := await fetch_queue.get()) is not None:
+            started = time.monotonic()
+            if pipeline is not None:
+                translated = await pipeline.translate_batch(
+                    batch, p_context, active_engine
+                )
+            else:
+                await policy.process_batch(batch, p_context, active_engine)
+                translated = TranslatedBatch()
+            sizer.observe(
+                len(batch),
+                time.monotonic() - started,
+                failures=len(translated.failures),
+                rate_limited=sum(e.is_rate_limited for _, e in translated.failures),
+                backpressured=write_queue.full(),
+            )
+            await write_queue.put((batch, translated))
+        await write_queue.put(None)
+
+    async def writer() -> None:
+        finished = 0
+        while finished < n_translators:
+            entry = await write_queue.get()
+            if entry is None:
+                finished += 1
+                continue
+            batch, translated = entry
+            try:
+                if pipeline is not None:
+                    await pipeline.persist_batch(translated, p_context, active_engine)
+            finally:
+                # 成功写回或记录失败时均已清除租约；写回异常的草稿保留租约至到期，
+                # 避免在同一轮内被立即重新领取
+                in_flight.difference_update(
+                    (item.project_id, item.head_id) for item in batch
+                )
+
+    renewer = asyncio.create_task(
+        _renew_leases_periodically(coordinator, in_flight, config.worker_lease_ttl / 3)
+    )
+    stages = [
+        asyncio.create_task(fetcher()),
+        *(asyncio.create_task(translator()) for _ in range(n_translators)),
+        asyncio.create_task(writer()),
+    ]
+    try:
+        await asyncio.gather(*stages)
+    except BaseException:
+        for task in stages:
+            task.cancel()
+        await asyncio.gather(*stages, return_exceptions=True)
+        with contextlib.suppress(Exception):
+            await coordinator.handler.release_leases(list(in_flight))
+        raise
+    finally:
+        renewer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await renewer
 
     if total_processed > 0:
         logger.info(f"本轮处理完成，共处理 {total_processed} 个任务。")
     return total_processed
 
 
-async def polling_loop(coordinator: Coordinator, shutdown_event: asyncio.Event) -> None:
+async def polling_loop(
+    coordinator: Coordinator,
+    shutdown_event: asyncio.Event,
+    target_langs: list[str] | None = None,
+    on_processed: ProcessedCallback | None = None,
+) -> None:
     """传统的基于 sleep 的轮询循环。"""
     while not shutdown_event.is_set():
         try:
-            await consume_and_process(coordinator, "轮询检查")
+            processed = await consume_and_process(
+                coordinator, "轮询检查", target_langs, shutdown_event
+            )
+            if on_processed:
+                on_processed(processed)
             await asyncio.wait_for(
                 shutdown_event.wait(), timeout=coordinator.config.worker_poll_interval
             )
@@ -72,37 +204,75 @@ async def polling_loop(coordinator: Coordinator, shutdown_event: asyncio.Event)
 
 
 async def notification_loop(
-    coordinator: Coordinator, shutdown_event: asyncio.Event
+    coordinator: Coordinator,
+    shutdown_event: asyncio.Event,
+    target_langs: list[str] | None = None,
+    on_processed: ProcessedCallback | None = None,
 ) -> None:
-    """基于 LISTEN/NOTIFY 的事件驱动循环。"""
-    notification_generator = coordinator.handler.listen_for_notifications()
+    """
+    基于 LISTEN/NOTIFY 的事件驱动循环。
+    合并窗口内的通知只触发一次处理；与本 Worker 语言分片无关的通知被直接忽略。
+    退避到期的重试与过期租约不会产生通知，因此每隔 worker_poll_interval
+    未收到通知时也会检查一次。
+    """
+    notification_generator = coordinator.handler.listen_for_notifications(
+        coordinator.config.worker_notify_coalesce_window
+    )
     logger.info("正在等待新任务通知...")
-    while not shutdown_event.is_set():
-        try:
-            notification_task = asyncio.create_task(notification_generator.__anext__())
-            shutdown_task = asyncio.create_task(shutdown_event.wait())
-            done, pending = await asyncio.wait(
-                [notification_task, shutdown_task], return_when=asyncio.FIRST_COMPLETED
-            )
-            for task in pending:
-                task.cancel()
+    # 等待通知的任务跨越超时保留：取消它会关闭通知生成器
+    notification_task: asyncio.Task[Any] | None = None
+    try:
+        while not shutdown_event.is_set():
+            try:
+                if notification_task is None:
+                    notification_task = asyncio.create_task(
+                        notification_generator.__anext__()
+                    )
+                shutdown_task = asyncio.create_task(shutdown_event.wait())
+                done, _ = await asyncio.wait(
+                    [notification_task, shutdown_task],
+                    timeout=coordinator.config.worker_poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                shutdown_task.cancel()
+                if shutdown_task in done:
+                    break
 
-            if notification_task in done:
-                await consume_and_process(
-                    coordinator, f"收到通知: {notification_task.result()}"
+                if notification_task in done:
+                    wakeup = notification_task.result()
+                    notification_task = None
+                    if not wakeup.concerns(target_langs):
+                        logger.debug(
+                            "忽略与本 Worker 语言无关的通知",
+                            notifications=wakeup.notifications,
+                            langs=sorted(wakeup.target_langs or ()),
+                        )
+                        continue
+                    reason = f"收到 {wakeup.notifications} 条新草稿通知"
+                else:
+                    reason = "定期检查到期的重试与过期租约"
+                processed = await consume_and_process(
+                    coordinator, reason, target_langs, shutdown_event
                 )
-                logger.info("正在等待下一次新任务通知...")
-            if shutdown_task in done:
+                if on_processed:
+                    on_processed(processed)
+                if processed:
+                    logger.info("正在等待下一次新任务通知...")
+            except (StopAsyncIteration, asyncio.CancelledError):
                 break
-        except (StopAsyncIteration, asyncio.CancelledError):
-            break
-        except Exception:
-            logger.error("通知循环或任务处理中发生错误", exc_info=True)
-            shutdown_event.set()
+            except Exception:
+                logger.error("通知循环或任务处理中发生错误", exc_info=True)
+                shutdown_event.set()
+    finally:
+        if notification_task is not None:
+            notification_task.cancel()
 
 
 async def _run_worker_loop(
-    coordinator: Coordinator, shutdown_event: asyncio.Event
+    coordinator: Coordinator,
+    shutdown_event: asyncio.Event,
+    target_langs: list[str] | None = None,
+    on_processed: ProcessedCallback | None = None,
 ) -> None:
     """Worker 的主循环，包含信号处理和优雅停机逻辑。"""
     loop = asyncio.get_running_loop()
@@ -123,25 +293,38 @@ async def _run_worker_loop(
         f"▶️  [bold green]Worker 已启动 ({mode}模式)[/bold green]. 按 CTRL+C 停止。"
     )
 
-    await consume_and_process(coordinator, "启动时检查积压任务")
+    if target_langs:
+        console.print(f"   仅处理目标语言: [cyan]{', '.join(target_langs)}[/cyan]")
+
+    processed = await consume_and_process(
+        coordinator, "启动时检查积压任务", target_langs, shutdown_event
+    )
+    if on_processed:
+        on_processed(processed)
 
     if use_notifications:
-        await notification_loop(coordinator, shutdown_event)
+        await notification_loop(coordinator, shutdown_event, target_langs, on_processed)
     else:
-        await polling_loop(coordinator, shutdown_event)
+        await polling_loop(coordinator, shutdown_event, target_langs, on_processed)
 
 
-@worker_app.command("start")
-def worker_start(ctx: typer.Context) -> None:
-    """启动一个后台 Worker 进程，持续处理待翻译任务。"""
-    state: State = ctx.obj
-    coordinator = create_coordinator(state.config)
+def run_worker(
+    config: TransHubConfig,
+    target_langs: list[str] | None = None,
+    on_processed: ProcessedCallback | None = None,
+) -> None:
+    """在当前进程中运行一个 Worker，直到收到停机信号。"""
+    coordinator = create_coordinator(config)
     shutdown_event = asyncio.Event()
+    if config.metrics_port:
+        start_metrics_server(config.metrics_port)
 
     async def main_async_loop() -> None:
         try:
             await coordinator.initialize()
-            await _run_worker_loop(coordinator, shutdown_event)
+            await _run_worker_loop(
+                coordinator, shutdown_event, target_langs, on_processed
+            )
         finally:
             console.print("\n[yellow]Worker 正在关闭，请稍候...[/yellow]")
             await coordinator.close()
@@ -151,3 +334,74 @@ def worker_start(ctx: typer.Context) -> None:
         asyncio.run(main_async_loop())
     except KeyboardInterrupt:
         logger.info("主循环被强制中断。")
+
+
+@worker_app.command("start")
+def worker_start(
+    ctx: typer.Context,
+    langs: Annotated[
+        list[str] | None,
+        typer.Option("--lang", "-l", help="仅处理指定目标语言的草稿（可多次指定）。"),
+    ] = None,
+    processes: Annotated[
+        int,
+        typer.Option(
+            "--processes",
+            "-p",
+            min=1,
+            help="启动的 Worker 进程数。大于 1 时由监管进程负责重启与统一停机。",
+        ),
+    ] = 1,
+) -> None:
+    """启动后台 Worker，持续处理待翻译任务。"""
+    state: State = ctx.obj
+    if processes > 1:
+        from trans_hub.cli.supervisor import run_supervisor
+
+        run_supervisor(state.config, langs or None, processes)
+        return
+    run_worker(state.config, langs or None)
+
+
+async def _async_show_queue(
+    coordinator: Coordinator, target_langs: list[str] | None
+) -> None:
+    try:
+        await coordinator.initialize()
+        depths = await coordinator.draft_queue_depths(target_langs)
+        if not depths:
+            console.print("[green]草稿队列为空。[/green]")
+            return
+
+        scheduler = coordinator.draft_scheduler
+        table = Table(title="草稿队列", show_header=True, header_style="bold cyan")
+        table.add_column("项目")
+        table.add_column("优先级", justify="right")
+        table.add_column("权重", justify="right")
+        table.add_column("待领取", justify="right")
+        table.add_column("处理中", justify="right")
+        for d in depths:
+            table.add_row(
+                d.project_id,
+                str(d.priority),
+                f"{scheduler.weight_of(d.project_id):g}",
+                str(d.pending),
+                str(d.leased),
+            )
+        console.print(table)
+    finally:
+        await coordinator.close()
+
+
+@worker_app.command("queue")
+def worker_queue(
+    ctx: typer.Context,
+    langs: Annotated[
+        list[str] | None,
+        typer.Option("--lang", "-l", help="仅统计指定目标语言的草稿（可多次指定）。"),
+    ] = None,
+) -> None:
+    """按项目与优先级通道显示草稿积压。"""
+    state: State = ctx.obj
+    coordinator = create_coordinator(state.config)
+    asyncio.run(_async_show_queue(coordinator, langs or None))
@@ -33,6 +33,53 @@ class RetryPolicyConfig(BaseModel):
             raise ValueError("max_backoff 必须大于或等于 initial_backoff")
         return self
 
+    def backoff_for(self, attempt: int) -> float:
+        """返回第 attempt 次失败后的退避秒数（指数增长，以 max_backoff 封顶）。"""
+        return float(
+            min(
+                self.initial_backoff * (2 ** min(max(attempt - 1, 0), 32)),
+                self.max_backoff,
+            )
+        )
+
+
+class BatchingConfig(BaseModel):
+    """Worker 自适应批次大小的配置，批次大小同时决定单次领取与单次引擎调用的条数。"""
+
+    adaptive: bool = True
+    min_size: int = Field(default=5, gt=0)
+    max_size: int = Field(default=200, gt=0)
+    target_latency: float = Field(
+        default=10.0, description="单次引擎调用期望的最长耗时（秒）", gt=0
+    )
+    error_rate_threshold: float = Field(
+        default=0.2, description="批次失败率超过该值时缩小批次", gt=0, le=1
+    )
+
+    @model_validator(mode="after")
+    def check_bounds(self) -> "BatchingConfig":
+        if self.max_size < self.min_size:
+            raise ValueError("max_size 必须大于或等于 min_size")
+        return self
+
+
+class EngineCacheConfig(BaseModel):
+    """引擎响应缓存的配置，相同的引擎请求在有效期内直接复用之前的译文。"""
+
+    enabled: bool = False
+    path: str = "transhub_engine_cache.db"
+    ttl: int = Field(default=30 * 24 * 3600, description="缓存条目的有效期（秒）", gt=0)
+    max_entries: int = Field(default=100_000, gt=0)
+
+
+class CacheConfig(BaseModel):
+    """`Coordinator.get_translation` 的进程内解析缓存配置。"""
+
+    enabled: bool = False
+    cache_type: Literal["ttl", "lru"] = "ttl"
+    maxsize: int = Field(default=1000, gt=0)
+    ttl: int = Field(default=3600, gt=0)
+
 
 class TransHubConfig(BaseSettings):
     model_config = SettingsConfigDict(
@@ -48,9 +95,53 @@ class TransHubConfig(BaseSettings):
     worker_poll_interval: int = Field(
         default=10, description="Worker在轮询模式下的等待间隔（秒）", gt=0
     )
+    worker_lease_ttl: int = Field(
+        default=300, description="草稿租约有效期（秒），Worker 处理期间会定期续约", gt=0
+    )
+
+    worker_queue_depth: int = Field(
+        default=2,
+        description="Worker 流水线各阶段之间队列可缓冲的批次数，写回落后时据此反压领取",
+        gt=0,
+    )
+    worker_translate_concurrency: int = Field(
+        default=2, description="Worker 同时交给引擎翻译的批次数", gt=0
+    )
+    worker_project_weights: dict[str, float] = Field(
+        default_factory=dict,
+        description="按项目的调度权重，同一优先级通道内每批名额按权重比例分配；未列出的项目权重为 1",
+    )
+    worker_lane_refresh_interval: float = Field(
+        default=2.0,
+        description="调度器重新探测各项目优先级通道的间隔（秒），新租户最迟在该间隔后参与调度",
+        gt=0,
+    )
+    worker_notify_coalesce_window: float = Field(
+        default=0.5,
+        description="收到新草稿通知后等待合并后续通知的时长（秒），窗口内的通知只唤醒一次",
+        ge=0,
+    )
+    resolve_cache_ttl: int = Field(
+        default=0,
+        description="th_resolve_cache 持久化解析缓存的有效期（秒），0 表示禁用（默认）",
+        ge=0,
+    )
+    resolve_cache_sweep_interval: int = Field(
+        default=300, description="清理过期解析缓存的间隔（秒）", gt=0
+    )
+
+    metrics_port: int | None = Field(
+        default=None,
+        description="Worker 暴露 Prometheus 指标的 HTTP 端口，未设置时不启动（需安装 metrics 扩展）",
+        gt=0,
+        le=65535,
+    )
 
     engine_configs: dict[str, Any] = Field(default_factory=dict)
+    batching: BatchingConfig = Field(default_factory=BatchingConfig)
+    engine_cache: EngineCacheConfig = Field(default_factory=EngineCacheConfig)
     retry_policy: RetryPolicyConfig = Field(default_factory=RetryPolicyConfig)
+    cache_config: CacheConfig = Field(default_factory=CacheConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
     @field_validator("source_lang")
@@ -60,6 +151,14 @@ class TransHubConfig(BaseSettings):
             validate_lang_codes([v])
         return v
 
+    @field_validator("worker_project_weights")
+    @classmethod
+    def validate_project_weights(cls, v: dict[str, float]) -> dict[str, float]:
+        for project_id, weight in v.items():
+            if weight <= 0:
+                raise ValueError(f"项目 '{project_id}' 的调度权重必须为正数")
+        return v
+
     @property
     def db_path(self) -> str:
         parsed_url = urlparse(self.database_url)
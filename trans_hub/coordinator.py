@@ -2,6 +2,8 @@
 # [v2.4 Refactor] Coordinator 全面升级，适配 rev/head 模型和白皮书 v2.4 流程。
 # request/get_translation/publish/reject 等方法均已重构。
 import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass
 from typing import Any
 
 import structlog
@@ -9,20 +11,93 @@ import structlog
 from trans_hub._tm.normalizers import normalize_plain_text_for_reuse
 from trans_hub._uida.encoder import generate_uid_components
 from trans_hub._uida.reuse_key import build_reuse_sha256
+from trans_hub.cache import ResolveCache
 from trans_hub.config import TransHubConfig
 from trans_hub.core import (
+    ContentUpsert,
+    DatabaseError,
+    DeadLetter,
+    DraftQueueDepth,
     EngineNotFoundError,
+    NewRevision,
     PersistenceHandler,
     ProcessingContext,
+    RequestItemResult,
     TranslationStatus,
 )
+from trans_hub.core.interfaces import HeadDim, TmProbe
+from trans_hub.engine_cache import EngineResponseCache
 from trans_hub.engine_registry import ENGINE_REGISTRY, discover_engines
 from trans_hub.engines.base import BaseTranslationEngine
+from trans_hub.policies.batching import AdaptiveBatchSizer
 from trans_hub.policies.processing import DefaultProcessingPolicy, ProcessingPolicy
+from trans_hub.policies.scheduling import FairDraftScheduler
+from trans_hub.utils import validate_lang_codes
 
 logger = structlog.get_logger(__name__)
 
 
+async def _iter_chunks(
+    items: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]], size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """将同步或异步可迭代对象切分为固定大小的列表块。"""
+    chunk: list[dict[str, Any]] = []
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+# th_trans_head.priority 为 32 位整数列
+_PRIORITY_RANGE = range(-(2**31), 2**31)
+
+
+def _coerce_priority(value: Any) -> int:
+    """将请求中的 priority 规范为整数；布尔值、非整数或超出列范围的值视为无效。"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(f"priority 必须为整数，收到 {value!r}")
+    try:
+        priority = int(value)
+    except ValueError:
+        raise ValueError(f"priority 必须为整数，收到 {value!r}") from None
+    if priority not in _PRIORITY_RANGE:
+        raise ValueError(f"priority 超出范围: {priority}")
+    return priority
+
+
+def _validate_target_langs(value: Any) -> list[str]:
+    """校验请求中的 target_langs：必须为非空的语言代码列表（单个字符串不被接受）。"""
+    if not isinstance(value, list) or not value:
+        raise TypeError(f"target_langs 必须为非空列表，收到 {value!r}")
+    if not all(isinstance(lang, str) for lang in value):
+        raise TypeError(f"target_langs 只能包含字符串，收到 {value!r}")
+    validate_lang_codes(value)
+    return value
+
+
+@dataclass(frozen=True)
+class _PreparedRequest:
+    """request_many 中通过内存校验、等待写入的单个条目。"""
+
+    index: int
+    row: ContentUpsert
+    reuse_sha: bytes
+    source_lang: str
+    target_langs: list[str]
+    variant_key: str
+    priority: int
+
+
 class Coordinator:
     """异步主协调器，是 Trans-Hub 功能的中心枢纽。"""
 
@@ -37,6 +112,25 @@ class Coordinator:
         self._engine_instances: dict[str, BaseTranslationEngine[Any]] = {}
         self.processing_context = ProcessingContext(config=config, handler=self.handler)
         self.processing_policy: ProcessingPolicy = DefaultProcessingPolicy()
+        self.draft_scheduler = FairDraftScheduler(
+            self.handler,
+            weights=config.worker_project_weights,
+            lane_refresh_interval=config.worker_lane_refresh_interval,
+        )
+        self.batch_sizer = AdaptiveBatchSizer(
+            config.batching,
+            initial_size=config.batch_size,
+            engine=config.active_engine.value,
+        )
+        self.engine_cache: EngineResponseCache | None = (
+            EngineResponseCache(config.engine_cache)
+            if config.engine_cache.enabled
+            else None
+        )
+        self.resolve_cache: ResolveCache | None = (
+            ResolveCache(config.cache_config) if config.cache_config.enabled else None
+        )
+        self._resolve_sweeper_task: asyncio.Task[None] | None = None
         discover_engines()
 
     async def initialize(self) -> None:
@@ -50,6 +144,14 @@ class Coordinator:
         )
         if not active_engine.initialized:
             await active_engine.initialize()
+        if self.resolve_cache is not None:
+            await self.handler.subscribe_resolve_invalidations(
+                self._on_resolve_invalidated, on_reset=self._on_resolve_cache_reset
+            )
+        if self.config.resolve_cache_ttl > 0:
+            self._resolve_sweeper_task = asyncio.create_task(
+                self._sweep_resolve_cache_periodically()
+            )
         self.initialized = True
         logger.info("协调器初始化完成。")
 
@@ -58,10 +160,16 @@ class Coordinator:
         if not self.initialized:
             return
         logger.info("协调器开始优雅停机...")
+        if self._resolve_sweeper_task and not self._resolve_sweeper_task.done():
+            self._resolve_sweeper_task.cancel()
+            await asyncio.gather(self._resolve_sweeper_task, return_exceptions=True)
+        self._resolve_sweeper_task = None
         await asyncio.gather(
             *[eng.close() for eng in self._engine_instances.values()],
             return_exceptions=True,
         )
+        if self.engine_cache is not None:
+            await self.engine_cache.close()
         await self.handler.close()
         self.initialized = False
         logger.info("协调器优雅停机完成。")
@@ -77,14 +185,17 @@ class Coordinator:
         source_lang: str | None = None,
         content_version: int = 1,
         variant_key: str = "-",
+        priority: int = 0,
     ) -> None:
         """
         提交一个新的 UIDA 翻译请求。
         实现“TM 优先”逻辑：若命中 TM，则直接完成；若未命中，则创建后台任务。
+        priority 为草稿的优先级通道，交互式请求可使用正值以先于批量导入被处理。
         """
         final_source_lang = source_lang or self.config.source_lang
         if not final_source_lang:
             raise ValueError("源语言必须在请求或配置中提供。")
+        priority = _coerce_priority(priority)
 
         content_id = await self.handler.upsert_content(
             project_id, namespace, keys, source_payload, content_version
@@ -138,9 +249,168 @@ class Coordinator:
                     variant_key=variant_key,
                     status=TranslationStatus.DRAFT,
                     revision_no=rev_no + 1,
+                    priority=priority,
                 )
                 logger.info("TM 未命中，已创建草稿修订", head_id=head_id)
 
+    async def request_many(
+        self,
+        items: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+        *,
+        chunk_size: int = 500,
+    ) -> list[RequestItemResult]:
+        """
+        批量提交 UIDA 翻译请求，语义与逐条调用 `request` 相同。
+
+        每个条目是 `request` 的关键字参数字典。条目按 `chunk_size` 分块，
+        每块仅执行固定次数的集合化读写（content / head / TM 探测 / rev），
+        单个条目的校验错误或所在块的数据库错误只记录在对应的结果中。
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size 必须为正整数。")
+
+        results: list[RequestItemResult] = []
+        offset = 0
+        async for chunk in _iter_chunks(items, chunk_size):
+            results.extend(await self._request_chunk(chunk, offset))
+            offset += len(chunk)
+        return results
+
+    async def _request_chunk(
+        self, chunk: list[dict[str, Any]], offset: int
+    ) -> list[RequestItemResult]:
+        results = [RequestItemResult(index=offset + i) for i in range(len(chunk))]
+
+        # 1. 在内存中完成校验与哈希计算，任何字段无效都只影响本条目
+        prepared: list[_PreparedRequest] = []
+        for i, item in enumerate(chunk):
+            try:
+                source_lang = item.get("source_lang") or self.config.source_lang
+                if not source_lang:
+                    raise ValueError("源语言必须在请求或配置中提供。")
+                target_langs = _validate_target_langs(item["target_langs"])
+                variant_key = item.get("variant_key", "-")
+                if not isinstance(variant_key, str) or not variant_key:
+                    raise TypeError(
+                        f"variant_key 必须为非空字符串，收到 {variant_key!r}"
+                    )
+                keys_b64, _, keys_sha = generate_uid_components(item["keys"])
+                source_payload = item["source_payload"]
+                row = ContentUpsert(
+                    project_id=item["project_id"],
+                    namespace=item["namespace"],
+                    keys=item["keys"],
+                    keys_b64=keys_b64,
+                    keys_sha256_bytes=keys_sha,
+                    source_payload=source_payload,
+                    content_version=item.get("content_version", 1),
+                )
+                reuse_sha = build_reuse_sha256(
+                    namespace=row.namespace,
+                    reduced_keys={},
+                    source_fields={
+                        "text": normalize_plain_text_for_reuse(
+                            source_payload.get("text")
+                        )
+                    },
+                )
+                prepared.append(
+                    _PreparedRequest(
+                        index=i,
+                        row=row,
+                        reuse_sha=reuse_sha,
+                        source_lang=source_lang,
+                        target_langs=target_langs,
+                        variant_key=variant_key,
+                        priority=_coerce_priority(item.get("priority", 0)),
+                    )
+                )
+            except Exception as e:
+                results[i].error_message = f"{e.__class__.__name__}: {e}"
+
+        if not prepared:
+            return results
+
+        try:
+            # 2. 多行 upsert th_content
+            content_ids = await self.handler.upsert_contents_bulk(
+                [p.row for p in prepared]
+            )
+
+            # 3. 批量获取/创建翻译头，并一次性探测 TM
+            targets: list[tuple[_PreparedRequest, HeadDim, TmProbe]] = []
+            for p in prepared:
+                row = p.row
+                content_id = content_ids[
+                    (row.project_id, row.namespace, row.keys_sha256_bytes)
+                ]
+                results[p.index].content_id = content_id
+                for lang in p.target_langs:
+                    dim = (row.project_id, content_id, lang, p.variant_key)
+                    probe = (
+                        row.project_id,
+                        row.namespace,
+                        p.reuse_sha,
+                        p.source_lang,
+                        lang,
+                        p.variant_key,
+                    )
+                    targets.append((p, dim, probe))
+
+            heads = await self.handler.get_or_create_translation_heads_bulk(
+                [dim for _, dim, _ in targets]
+            )
+            tm_hits = await self.handler.find_tm_entries_bulk(
+                [probe for _, _, probe in targets],
+                policy_version=1,
+                hash_algo_version=1,
+            )
+
+            # 4. 批量创建修订（同一维度在块内重复出现时，修订号依次递增）
+            next_no = {dim: no + 1 for dim, (_, no) in heads.items()}
+            revisions: list[NewRevision] = []
+            for p, dim, probe in targets:
+                head_id, _ = heads[dim]
+                tm_hit = tm_hits.get(probe)
+                status = (
+                    TranslationStatus.REVIEWED if tm_hit else TranslationStatus.DRAFT
+                )
+                revisions.append(
+                    NewRevision(
+                        head_id=head_id,
+                        project_id=dim[0],
+                        content_id=dim[1],
+                        target_lang=dim[2],
+                        variant_key=dim[3],
+                        status=status,
+                        revision_no=next_no[dim],
+                        translated_payload=tm_hit[1] if tm_hit else None,
+                        tm_id=tm_hit[0] if tm_hit else None,
+                        priority=p.priority,
+                    )
+                )
+                next_no[dim] += 1
+                results[p.index].statuses[dim[2]] = status
+
+            await self.handler.create_translation_revisions_bulk(revisions)
+        except Exception as e:
+            logger.error(
+                "批量请求块写入失败", offset=offset, size=len(chunk), exc_info=True
+            )
+            for p in prepared:
+                results[p.index].statuses.clear()
+                results[p.index].error_message = f"{e.__class__.__name__}: {e}"
+            return results
+
+        logger.info(
+            "批量请求块处理完成",
+            offset=offset,
+            items=len(prepared),
+            revisions=len(revisions),
+            tm_hits=sum(1 for r in revisions if r.tm_id),
+        )
+        return results
+
     async def get_translation(
         self,
         *,
@@ -150,45 +420,183 @@ class Coordinator:
         target_lang: str,
         variant_key: str = "-",
     ) -> dict[str, Any] | None:
-        """获取最终的翻译结果，包含语言和变体回退逻辑。"""
+        """获取最终的翻译结果，包含语言和变体回退逻辑。启用缓存时优先读取进程内缓存。"""
         _, _, keys_sha = generate_uid_components(keys)
+        cache_key = (project_id, namespace, keys_sha, target_lang, variant_key)
+        generation = None
+        if self.resolve_cache is not None:
+            hit, cached = self.resolve_cache.get(cache_key)
+            if hit:
+                return cached
+            generation = self.resolve_cache.generation
+
         content_id = await self.handler.get_content_id_by_uida(
             project_id, namespace, keys_sha
         )
         if not content_id:
+            # 内容不存在时不缓存，避免其随后被提交时需要额外失效。
             return None
 
-        result = await self.handler.get_published_translation(
-            content_id, target_lang, variant_key
+        resolved = await self._resolve_published(
+            content_id, project_id, target_lang, variant_key
         )
-        if result:
-            return result[1]
+        if self.resolve_cache is not None:
+            self.resolve_cache.put(cache_key, content_id, resolved, generation)
+        return resolved
 
-        if variant_key != "-":
-            result = await self.handler.get_published_translation(
-                content_id, target_lang, "-"
-            )
-            if result:
-                return result[1]
-
-        fallback_order = await self.handler.get_fallback_order(project_id, target_lang)
-        if fallback_order:
-            for fallback_lang in fallback_order:
-                result = await self.handler.get_published_translation(
-                    content_id, fallback_lang, "-"
+    async def get_translations(
+        self,
+        *,
+        project_id: str,
+        namespace: str,
+        keys_list: Sequence[dict[str, Any]],
+        target_langs: str | Sequence[str],
+        variant_key: str = "-",
+    ) -> dict[tuple[int, str], dict[str, Any] | None]:
+        """
+        批量获取翻译结果（页面/资源包渲染），回退规则与 `get_translation` 相同。
+        返回以 (keys_list 下标, 目标语言) 为键的字典。无论键的数量多少，
+        数据库查询次数恒定：一次批量查 content_id，一次集合式解析。
+        启用进程内缓存时会优先命中缓存，并回填未命中的结果。
+        """
+        langs = [target_langs] if isinstance(target_langs, str) else list(target_langs)
+        shas = [generate_uid_components(keys)[2] for keys in keys_list]
+        results: dict[tuple[int, str], dict[str, Any] | None] = {
+            (i, lang): None for i in range(len(shas)) for lang in langs
+        }
+
+        generation = (
+            self.resolve_cache.generation if self.resolve_cache is not None else None
+        )
+        pending: list[tuple[int, str]] = []
+        for i, sha in enumerate(shas):
+            for lang in langs:
+                if self.resolve_cache is not None:
+                    hit, cached = self.resolve_cache.get(
+                        (project_id, namespace, sha, lang, variant_key)
+                    )
+                    if hit:
+                        results[(i, lang)] = cached
+                        continue
+                pending.append((i, lang))
+        if not pending:
+            return results
+
+        content_ids = await self.handler.get_content_ids_by_uida_bulk(
+            project_id, namespace, list({shas[i] for i, _ in pending})
+        )
+        pending = [(i, lang) for i, lang in pending if shas[i] in content_ids]
+        resolved = await self.handler.resolve_published_translations_bulk(
+            project_id,
+            list({content_ids[shas[i]] for i, _ in pending}),
+            list({lang for _, lang in pending}),
+            variant_key,
+        )
+        for i, lang in pending:
+            content_id = content_ids[shas[i]]
+            hit_row = resolved.get((content_id, lang))
+            payload = hit_row[1] if hit_row else None
+            results[(i, lang)] = payload
+            if self.resolve_cache is not None:
+                self.resolve_cache.put(
+                    (project_id, namespace, shas[i], lang, variant_key),
+                    content_id,
+                    payload,
+                    generation,
                 )
-                if result:
-                    return result[1]
+        return results
 
-        return None
+    async def _resolve_published(
+        self, content_id: str, project_id: str, target_lang: str, variant_key: str
+    ) -> dict[str, Any] | None:
+        """先查 th_resolve_cache，未命中时执行回退链并回填。"""
+        ttl = self.config.resolve_cache_ttl
+        if ttl > 0:
+            try:
+                cached = await self.handler.get_cached_resolution(
+                    content_id, target_lang, variant_key
+                )
+            except DatabaseError:
+                # 缓存读取失败时退回直接解析
+                logger.warning("读取解析缓存失败", content_id=content_id, exc_info=True)
+                cached = None
+            if cached:
+                return cached[1]
+
+        resolution = await self.handler.resolve_published_translation(
+            project_id, content_id, target_lang, variant_key
+        )
+        if resolution is None:
+            return None
+
+        rev_id, payload, origin_lang = resolution
+        if ttl > 0:
+            try:
+                await self.handler.put_cached_resolution(
+                    project_id=project_id,
+                    content_id=content_id,
+                    target_lang=target_lang,
+                    variant_key=variant_key,
+                    resolved_rev=rev_id,
+                    origin_lang=origin_lang,
+                    ttl_seconds=ttl,
+                )
+            except DatabaseError:
+                # 缓存写入失败不影响读取结果
+                logger.warning("回填解析缓存失败", content_id=content_id, exc_info=True)
+        return payload
+
+    async def _sweep_resolve_cache_periodically(self) -> None:
+        """后台定期删除 th_resolve_cache 中已过期的条目。"""
+        interval = self.config.resolve_cache_sweep_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                purged = await self.handler.purge_expired_resolve_cache()
+                if purged:
+                    logger.debug("已清理过期解析缓存", count=purged)
+            except DatabaseError:
+                logger.warning("清理过期解析缓存失败", exc_info=True)
 
     async def publish_translation(self, revision_id: str) -> bool:
         """将一条 'reviewed' 状态的翻译修订发布。"""
-        return await self.handler.publish_revision(revision_id)
+        success = await self.handler.publish_revision(revision_id)
+        if success:
+            await self._invalidate_resolve_cache_for_revision(revision_id)
+        return success
 
     async def reject_translation(self, revision_id: str) -> bool:
         """将一条翻译修订的状态设置为 'rejected'。"""
-        return await self.handler.reject_revision(revision_id)
+        success = await self.handler.reject_revision(revision_id)
+        if success:
+            await self._invalidate_resolve_cache_for_revision(revision_id)
+        return success
+
+    async def _invalidate_resolve_cache_for_revision(self, revision_id: str) -> None:
+        if self.resolve_cache is None:
+            return
+        content_id = await self.handler.get_revision_content_id(revision_id)
+        if content_id:
+            self._on_resolve_invalidated(content_id)
+
+    def _on_resolve_invalidated(self, content_id: str) -> None:
+        """本进程的发布/拒绝及其他进程发出的失效通知都会走到这里。"""
+        if self.resolve_cache is None:
+            return
+        removed = self.resolve_cache.invalidate_content(content_id)
+        if removed:
+            logger.debug("解析缓存已失效", content_id=content_id, entries=removed)
+
+    def _on_resolve_cache_reset(self) -> None:
+        """失效通知可能有遗漏（监听连接断开/重连）时清空整个解析缓存。"""
+        if self.resolve_cache is None:
+            return
+        self.resolve_cache.clear()
+        logger.info("解析缓存失效通知可能有遗漏，已清空解析缓存")
+
+    def resolve_cache_stats(self) -> dict[str, int] | None:
+        """返回解析缓存的命中统计；未启用缓存时返回 None。"""
+        return self.resolve_cache.stats() if self.resolve_cache is not None else None
 
     def _get_or_create_engine_instance(
         self, engine_name: str
@@ -202,7 +610,9 @@ class Coordinator:
 
             engine_config_data = self.config.engine_configs.get(engine_name, {})
             engine_config = engine_class.CONFIG_MODEL(**engine_config_data)
-            self._engine_instances[engine_name] = engine_class(config=engine_config)
+            engine = engine_class(config=engine_config)
+            engine.response_cache = self.engine_cache
+            self._engine_instances[engine_name] = engine
             logger.info("引擎实例已创建", engine_name=engine_name)
         return self._engine_instances[engine_name]
 
@@ -222,3 +632,31 @@ class Coordinator:
         )
         logger.info("垃圾回收执行完毕。", report=report)
         return report
+
+    async def draft_queue_depths(
+        self, target_langs: list[str] | None = None
+    ) -> list[DraftQueueDepth]:
+        """按项目与优先级通道统计草稿积压。"""
+        return await self.handler.get_draft_queue_depths(target_langs)
+
+    async def list_dead_letters(
+        self, project_id: str | None = None, limit: int = 50
+    ) -> list[DeadLetter]:
+        """列出死信队列中的记录（重试耗尽或不可重试的草稿）。"""
+        return await self.handler.list_dead_letters(project_id=project_id, limit=limit)
+
+    async def replay_dead_letters(
+        self, ids: list[str] | None = None, project_id: str | None = None
+    ) -> int:
+        """将死信重新放回草稿队列，返回重新入队的数量。"""
+        count = await self.handler.replay_dead_letters(ids=ids, project_id=project_id)
+        logger.info("死信已重新入队", count=count, project_id=project_id)
+        return count
+
+    async def purge_dead_letters(
+        self, ids: list[str] | None = None, project_id: str | None = None
+    ) -> int:
+        """删除死信记录并将对应草稿标记为已拒绝，返回删除的数量。"""
+        count = await self.handler.purge_dead_letters(ids=ids, project_id=project_id)
+        logger.info("死信记录已清除", count=count, project_id=project_id)
+        return count
@@ -18,10 +18,18 @@ from .interfaces import PersistenceHandler
 from .types import (
     # GLOBAL_CONTEXT_SENTINEL,  <-- [核心修复] 移除此行
     ContentItem,
+    ContentUpsert,
+    DeadLetter,
+    DraftQueueDepth,
+    DraftWakeup,
     EngineBatchItemResult,
     EngineError,
     EngineSuccess,
+    FailedAttempt,
+    NewRevision,
     ProcessingContext,  # 确保 ProcessingContext 被导出
+    RequestItemResult,
+    TmUpsert,
     # TranslationRequest,       <-- [核心修复] 移除此行
     TranslationResult,
     TranslationStatus,
@@ -44,4 +52,12 @@ __all__ = [
     "TranslationResult",
     "ContentItem",
     "ProcessingContext",
+    "RequestItemResult",
+    "ContentUpsert",
+    "NewRevision",
+    "FailedAttempt",
+    "DeadLetter",
+    "DraftQueueDepth",
+    "DraftWakeup",
+    "TmUpsert",
 ]
@@ -2,13 +2,30 @@
 # [v2.4 Refactor] 更新持久化层协议，以完全支持 rev/head 模型、状态管理和白皮书 v2.4 的所有读写操作。
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from typing import TYPE_CHECKING, Any, Protocol
 
 from trans_hub.core.types import TranslationStatus
 
 if TYPE_CHECKING:
-    from trans_hub.core.types import ContentItem
+    from trans_hub.core.types import (
+        ContentItem,
+        ContentUpsert,
+        DeadLetter,
+        DraftQueueDepth,
+        DraftWakeup,
+        FailedAttempt,
+        NewRevision,
+    )
+
+# (project_id, content_id, target_lang, variant_key)
+HeadDim = tuple[str, str, str, str]
+# (project_id, head_id)：th_trans_head 的主键，也是其哈希分区键
+HeadKey = tuple[str, str]
+# (project_id, namespace, reuse_sha256_bytes, source_lang, target_lang, variant_key)
+TmProbe = tuple[str, str, bytes, str, str, str]
+# 草稿队列键集分页游标：(排序列取值, head_id)
+DraftCursor = tuple[Any, str]
 
 
 class PersistenceHandler(Protocol):
@@ -16,6 +33,7 @@ class PersistenceHandler(Protocol):
 
     SUPPORTS_NOTIFICATIONS: bool
     _is_sqlite: bool  # [新增] 用于策略层判断并发写入能力
+    lease_owner: str  # 本处理器领取草稿时写入的租约持有者标识
 
     async def connect(self) -> None:
         """建立与数据库的连接。"""
@@ -25,8 +43,13 @@ class PersistenceHandler(Protocol):
         """关闭与数据库的连接。"""
         ...
 
-    def listen_for_notifications(self) -> AsyncGenerator[str, None]:
-        """[可选] 监听数据库通知，返回通知的负载。"""
+    def listen_for_notifications(
+        self, coalesce_window: float = 0.0
+    ) -> AsyncGenerator[DraftWakeup, None]:
+        """
+        [可选] 监听新草稿通知。在 coalesce_window 秒内到达的通知会合并为一次唤醒，
+        其中汇总了涉及的项目与目标语言。
+        """
         ...
 
     async def get_content_id_by_uida(
@@ -35,6 +58,12 @@ class PersistenceHandler(Protocol):
         """根据 UIDA 的核心三元组，纯粹地读取 content_id。"""
         ...
 
+    async def get_content_ids_by_uida_bulk(
+        self, project_id: str, namespace: str, keys_sha256_list: list[bytes]
+    ) -> dict[bytes, str]:
+        """批量读取 content_id，返回 {keys_sha256_bytes: content_id}，不存在的键不出现。"""
+        ...
+
     async def upsert_content(
         self,
         project_id: str,
@@ -56,6 +85,21 @@ class PersistenceHandler(Protocol):
         """获取或创建一个翻译头记录，返回 (head_id, current_revision_no)。"""
         ...
 
+    async def upsert_contents_bulk(
+        self, rows: list[ContentUpsert]
+    ) -> dict[tuple[str, str, bytes], str]:
+        """
+        以多行 INSERT ... ON CONFLICT 批量 upsert th_content。
+        返回 {(project_id, namespace, keys_sha256_bytes): content_id}。
+        """
+        ...
+
+    async def get_or_create_translation_heads_bulk(
+        self, dims: list[HeadDim]
+    ) -> dict[HeadDim, tuple[str, int]]:
+        """批量获取或创建翻译头记录，返回 {dim: (head_id, current_revision_no)}。"""
+        ...
+
     async def create_new_translation_revision(
         self,
         *,
@@ -69,10 +113,20 @@ class PersistenceHandler(Protocol):
         translated_payload: dict[str, Any] | None = None,
         engine_name: str | None = None,
         engine_version: str | None = None,
+        priority: int = 0,
     ) -> str:
         """在 th_trans_rev 中创建一条新的修订，并更新 th_trans_head 的指针，返回 rev_id。"""
         ...
 
+    async def create_translation_revisions_bulk(
+        self, revisions: list[NewRevision]
+    ) -> list[str]:
+        """
+        在单个事务内批量创建修订、更新头指针、upsert TM 条目并写入 TM 链接，
+        按输入顺序返回 rev_id。
+        """
+        ...
+
     async def find_tm_entry(
         self,
         project_id: str,
@@ -87,6 +141,15 @@ class PersistenceHandler(Protocol):
         """在 TM 中查找可复用的翻译，返回 (tm_id, translated_json) 或 None。"""
         ...
 
+    async def find_tm_entries_bulk(
+        self,
+        probes: list[TmProbe],
+        policy_version: int,
+        hash_algo_version: int,
+    ) -> dict[TmProbe, tuple[str, dict[str, Any]]]:
+        """一次查询批量探测 TM，仅返回命中的 {probe: (tm_id, translated_json)}。"""
+        ...
+
     async def upsert_tm_entry(
         self,
         project_id: str,
@@ -114,12 +177,73 @@ class PersistenceHandler(Protocol):
         """获取指定项目和语言的回退顺序。"""
         ...
 
+    async def resolve_published_translation(
+        self, project_id: str, content_id: str, target_lang: str, variant_key: str
+    ) -> tuple[str, dict[str, Any], str] | None:
+        """
+        一次查询完成变体与语言回退解析，
+        返回 (rev_id, translated_payload_json, origin_lang) 或 None。
+        """
+        ...
+
+    async def resolve_published_translations_bulk(
+        self,
+        project_id: str,
+        content_ids: list[str],
+        target_langs: list[str],
+        variant_key: str = "-",
+    ) -> dict[tuple[str, str], tuple[str, dict[str, Any], str]]:
+        """
+        一次查询解析多条内容 × 多个语言，
+        返回 {(content_id, target_lang): (rev_id, translated_payload_json, origin_lang)}。
+        """
+        ...
+
+    async def get_cached_resolution(
+        self, content_id: str, target_lang: str, variant_key: str
+    ) -> tuple[str, dict[str, Any], str | None] | None:
+        """读取未过期的持久化解析缓存，返回 (rev_id, translated_payload_json, origin_lang)。"""
+        ...
+
+    async def put_cached_resolution(
+        self,
+        *,
+        project_id: str,
+        content_id: str,
+        target_lang: str,
+        variant_key: str,
+        resolved_rev: str,
+        origin_lang: str | None,
+        ttl_seconds: int,
+    ) -> None:
+        """写入（或刷新）一条持久化解析缓存。"""
+        ...
+
+    async def purge_expired_resolve_cache(self) -> int:
+        """删除已过期的持久化解析缓存，返回删除的行数。"""
+        ...
+
     async def get_published_translation(
         self, content_id: str, target_lang: str, variant_key: str
     ) -> tuple[str, dict[str, Any]] | None:
         """获取已发布的译文，返回 (rev_id, translated_payload_json) 或 None。"""
         ...
 
+    async def get_revision_content_id(self, revision_id: str) -> str | None:
+        """返回修订所属的 content_id，不存在时返回 None。"""
+        ...
+
+    async def subscribe_resolve_invalidations(
+        self,
+        callback: Callable[[str], None],
+        on_reset: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        [可选] 订阅其他进程发出的解析缓存失效通知，回调参数为 content_id。
+        监听连接断开或重连后可能漏掉通知，此时调用 on_reset，订阅方应清空整个缓存。
+        """
+        ...
+
     async def publish_revision(self, revision_id: str) -> bool:
         """将一个 'reviewed' 状态的修订发布，返回是否成功。"""
         ...
@@ -132,8 +256,73 @@ class PersistenceHandler(Protocol):
         self,
         batch_size: int,
         limit: int | None = None,
+        target_langs: list[str] | None = None,
     ) -> AsyncGenerator[list[ContentItem], None]:
-        """流式获取待处理的 'draft' 状态翻译任务。"""
+        """
+        流式领取待处理的 'draft' 状态翻译任务，领取的头记录会被写入租约。
+        可选 target_langs 仅领取指定目标语言的草稿。
+        """
+        ...
+
+    async def claim_drafts(
+        self,
+        limit: int,
+        *,
+        target_langs: list[str] | None = None,
+        project_id: str | None = None,
+        priority: int | None = None,
+        after: DraftCursor | None = None,
+    ) -> tuple[list[ContentItem], DraftCursor | None]:
+        """
+        领取一页草稿（可限定项目与优先级通道），从游标 after 之后开始。
+        返回领取到的任务与下一页的游标；游标为 None 表示没有更多候选。
+        """
+        ...
+
+    async def get_draft_lanes(
+        self, target_langs: list[str] | None = None
+    ) -> dict[str, int]:
+        """返回每个有可领取草稿的项目当前最高的优先级通道。"""
+        ...
+
+    async def get_draft_queue_depths(
+        self, target_langs: list[str] | None = None
+    ) -> list[DraftQueueDepth]:
+        """按项目与优先级通道统计草稿积压（可领取数与租约中的数量）。"""
+        ...
+
+    async def renew_leases(self, heads: list[HeadKey]) -> int:
+        """为本处理器仍持有的租约续期，返回续期的行数。"""
+        ...
+
+    async def release_leases(self, heads: list[HeadKey]) -> int:
+        """释放本处理器持有的租约，返回释放的行数。"""
+        ...
+
+    async def release_expired_leases(self) -> int:
+        """回收所有已过期的租约，返回回收的行数。"""
+        ...
+
+    async def record_failed_attempts(self, failures: list[FailedAttempt]) -> int:
+        """记录失败尝试并安排重试；不再重试的条目写入死信队列，返回其数量。"""
+        ...
+
+    async def list_dead_letters(
+        self, project_id: str | None = None, limit: int = 50
+    ) -> list[DeadLetter]:
+        """列出死信队列中的记录。"""
+        ...
+
+    async def replay_dead_letters(
+        self, ids: list[str] | None = None, project_id: str | None = None
+    ) -> int:
+        """将死信重新放回草稿队列，返回重新入队的头记录数。"""
+        ...
+
+    async def purge_dead_letters(
+        self, ids: list[str] | None = None, project_id: str | None = None
+    ) -> int:
+        """删除死信记录，返回删除的数量。"""
         ...
 
     async def run_garbage_collection(
@@ -8,10 +8,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 if TYPE_CHECKING:
     from trans_hub.config import TransHubConfig
@@ -30,11 +31,18 @@ class TranslationStatus(str, Enum):
 class EngineSuccess(BaseModel):
     translated_text: str
     from_cache: bool = False
+    # 产生该译文的提示词与引擎参数的哈希，写入修订以便追溯
+    prompt_hash: str | None = None
+    params_hash: str | None = None
 
 
 class EngineError(BaseModel):
     error_message: str
     is_retryable: bool
+    # 服务端限流（如 HTTP 429）导致的失败，Worker 据此缩小批次
+    is_rate_limited: bool = False
+    # 服务端要求的重试等待时长（秒），如 Retry-After 响应头
+    retry_after: float | None = None
 
 
 EngineBatchItemResult = Union[EngineSuccess, EngineError]
@@ -55,6 +63,8 @@ class ContentItem(BaseModel):
     source_lang: str | None
     target_lang: str
     variant_key: str
+    # 此前已失败的尝试次数，用于计算退避与判断是否进入死信队列
+    attempt_count: int = 0
 
 
 class TranslationResult(BaseModel):
@@ -69,6 +79,141 @@ class TranslationResult(BaseModel):
     error_message: str | None = None
 
 
+class RequestItemResult(BaseModel):
+    """`Coordinator.request_many` 中单个请求条目的处理结果。"""
+
+    index: int
+    content_id: str | None = None
+    # 目标语言 -> 本次创建的修订状态（TM 命中为 reviewed，否则为 draft）
+    statuses: dict[str, TranslationStatus] = Field(default_factory=dict)
+    error_message: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error_message is None
+
+
+@dataclass(frozen=True)
+class ContentUpsert:
+    """批量写入 th_content 时的一行数据（UIDA 组件由调用方预先计算）。"""
+
+    project_id: str
+    namespace: str
+    keys: dict[str, Any]
+    keys_b64: str
+    keys_sha256_bytes: bytes
+    source_payload: dict[str, Any]
+    content_version: int = 1
+
+
+@dataclass(frozen=True)
+class TmUpsert:
+    """批量写回时需要 upsert 的一条 TM 条目（复用键由调用方预先计算）。"""
+
+    project_id: str
+    namespace: str
+    reuse_sha256_bytes: bytes
+    source_lang: str
+    target_lang: str
+    variant_key: str
+    source_text_json: dict[str, Any]
+    translated_json: dict[str, Any]
+    quality_score: float | None = None
+    policy_version: int = 1
+    hash_algo_version: int = 1
+
+
+@dataclass(frozen=True)
+class NewRevision:
+    """
+    批量写入时的一条新翻译修订。
+    若提供 tm_id，则写入指向该条目的 TM 追溯链接；若提供 tm_entry，
+    则在同一事务内先 upsert 该 TM 条目再写入链接。
+    """
+
+    head_id: str
+    project_id: str
+    content_id: str
+    target_lang: str
+    variant_key: str
+    status: TranslationStatus
+    revision_no: int
+    translated_payload: dict[str, Any] | None = None
+    engine_name: str | None = None
+    engine_version: str | None = None
+    prompt_hash: str | None = None
+    params_hash: str | None = None
+    tm_id: str | None = None
+    tm_entry: TmUpsert | None = None
+    # 草稿的优先级通道，数值越大越先被领取
+    priority: int = 0
+
+
+class DeadLetter(BaseModel):
+    """死信队列中的一条记录。"""
+
+    id: str
+    project_id: str
+    head_id: str
+    content_id: str
+    target_lang: str
+    variant_key: str
+    translation_rev_id: str
+    attempt_count: int
+    error_message: str
+    is_retryable: bool
+    engine_name: str | None = None
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class FailedAttempt:
+    """
+    一次失败的翻译尝试。
+    next_attempt_at 为 None 表示不再重试，草稿将进入死信队列。
+    """
+
+    head_id: str
+    project_id: str
+    content_id: str
+    target_lang: str
+    variant_key: str
+    translation_rev_id: str
+    attempt_count: int  # 含本次在内的累计失败次数
+    error_message: str
+    is_retryable: bool
+    next_attempt_at: datetime | None
+    engine_name: str | None = None
+
+
+@dataclass(frozen=True)
+class DraftQueueDepth:
+    """某个项目在某个优先级通道中的草稿积压。"""
+
+    project_id: str
+    priority: int
+    pending: int
+    leased: int
+
+
+@dataclass(frozen=True)
+class DraftWakeup:
+    """
+    一个合并窗口内收到的新草稿通知。
+    target_langs 为 None 表示至少有一条通知未携带语言，可能涉及任意语言。
+    """
+
+    notifications: int
+    project_ids: frozenset[str] = frozenset()
+    target_langs: frozenset[str] | None = None
+
+    def concerns(self, langs: list[str] | None) -> bool:
+        """判断本次唤醒是否与只处理 langs 的 Worker 相关。"""
+        if langs is None or self.target_langs is None:
+            return True
+        return not self.target_langs.isdisjoint(langs)
+
+
 @dataclass(frozen=True)
 class ProcessingContext:
     """一个“工具箱”对象，封装了处理策略执行时所需的所有依赖项。"""
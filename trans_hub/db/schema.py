@@ -159,6 +159,18 @@ class ThTransHead(Base):
     published_rev_id: Mapped[str | None] = mapped_column(String)
     published_no: Mapped[int | None] = mapped_column(Integer)
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # 草稿租约（7a1d2c4e9b10）：领取草稿的 Worker 标识与租约到期时间
+    lease_owner: Mapped[str | None] = mapped_column(String)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # 重试调度与死信（b3e5f7a9c1d2）
+    attempt_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[str | None] = mapped_column(Text)
+    dead_lettered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # 草稿优先级通道（f7a9b1c3d5e6）：数值越大越先被领取，交互式请求使用正值
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -184,6 +196,28 @@ class ThTransHead(Base):
     )
 
 
+class ThDeadLetters(Base):
+    """死信队列：重试耗尽或不可重试的草稿"""
+
+    __tablename__ = "th_dead_letters"
+    id: Mapped[str] = mapped_column(
+        String, primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    project_id: Mapped[str] = mapped_column(String, nullable=False)
+    head_id: Mapped[str] = mapped_column(String, nullable=False)
+    content_id: Mapped[str] = mapped_column(String, nullable=False)
+    target_lang: Mapped[str] = mapped_column(String, nullable=False)
+    variant_key: Mapped[str] = mapped_column(String, nullable=False, server_default="-")
+    translation_rev_id: Mapped[str] = mapped_column(String, nullable=False)
+    attempt_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    error_message: Mapped[str] = mapped_column(Text, nullable=False)
+    is_retryable: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    engine_name: Mapped[str | None] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class SearchContent(Base):
     """影子索引表"""
 
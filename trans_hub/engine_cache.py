@@ -0,0 +1,159 @@
+# trans_hub/engine_cache.py
+"""
+本模块提供引擎响应缓存：以 (引擎, 提示词哈希, 参数哈希, 语言对, 原文) 为键持久化引擎译文。
+
+TM 以规范化原文为键，按项目/命名空间隔离；而引擎对完全相同的请求总是给出等价结果，
+跨项目重复的 UI 字符串无需重复付费调用。缓存存放在本地 SQLite 文件中，
+同一主机上的多个 Worker 进程共享；条目按 TTL 过期，并按最近访问时间淘汰以限制大小。
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+import structlog
+
+from trans_hub.config import EngineCacheConfig
+
+logger = structlog.get_logger(__name__)
+
+# SQLite 单条语句的绑定参数数量上限较低，查询按此分块
+_QUERY_CHUNK = 500
+# 每写入这么多条目检查一次容量与过期条目
+_EVICT_EVERY = 1000
+
+
+def stable_hash(value: Any) -> str:
+    """对任意可 JSON 序列化的值计算稳定的 SHA-256 十六进制摘要（键排序，紧凑格式）。"""
+    encoded = json.dumps(
+        value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def cache_key(
+    engine: str,
+    prompt_hash: str | None,
+    params_hash: str,
+    source_lang: str | None,
+    target_lang: str,
+    text: str,
+) -> str:
+    return stable_hash(
+        [engine, prompt_hash, params_hash, source_lang, target_lang, text]
+    )
+
+
+class EngineResponseCache:
+    """基于 aiosqlite 的引擎响应缓存，连接在首次使用时建立。"""
+
+    def __init__(self, config: EngineCacheConfig):
+        self.config = config
+        self._conn: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        self._writes_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._conn is not None:
+            return self._conn
+        async with self._connect_lock:
+            if self._conn is None:
+                path = Path(self.config.path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                conn = await aiosqlite.connect(path, timeout=30)
+                # WAL 允许多个 Worker 进程并发读写同一缓存文件
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA synchronous=NORMAL")
+                await conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS engine_cache (
+                        key TEXT PRIMARY KEY,
+                        translated_text TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_engine_cache_accessed "
+                    "ON engine_cache (accessed_at)"
+                )
+                await conn.commit()
+                self._conn = conn
+            return self._conn
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        """返回命中且未过期的 {key: 译文}，并刷新命中条目的访问时间。"""
+        if not keys:
+            return {}
+        conn = await self._connection()
+        now = time.time()
+        found: dict[str, str] = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), _QUERY_CHUNK):
+            chunk = unique[i : i + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            async with conn.execute(
+                f"SELECT key, translated_text FROM engine_cache "
+                f"WHERE key IN ({placeholders}) AND created_at > ?",
+                [*chunk, now - self.config.ttl],
+            ) as cursor:
+                found.update({row[0]: row[1] async for row in cursor})
+        if found:
+            await conn.executemany(
+                "UPDATE engine_cache SET accessed_at = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            await conn.commit()
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    async def put_many(self, entries: dict[str, str]) -> None:
+        if not entries:
+            return
+        conn = await self._connection()
+        now = time.time()
+        await conn.executemany(
+            "INSERT OR REPLACE INTO engine_cache "
+            "(key, translated_text, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            [(key, text, now, now) for key, text in entries.items()],
+        )
+        await conn.commit()
+        self._writes_since_evict += len(entries)
+        if self._writes_since_evict >= _EVICT_EVERY:
+            self._writes_since_evict = 0
+            await self.evict()
+
+    async def evict(self) -> int:
+        """删除过期条目，并按最近访问时间淘汰超出 max_entries 的部分，返回删除的条数。"""
+        conn = await self._connection()
+        expired = await conn.execute(
+            "DELETE FROM engine_cache WHERE created_at <= ?",
+            (time.time() - self.config.ttl,),
+        )
+        overflow = await conn.execute(
+            """
+            DELETE FROM engine_cache WHERE key IN (
+                SELECT key FROM engine_cache ORDER BY accessed_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.config.max_entries,),
+        )
+        await conn.commit()
+        removed = expired.rowcount + overflow.rowcount
+        if removed:
+            logger.info("引擎响应缓存已淘汰条目", removed=removed)
+        return removed
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
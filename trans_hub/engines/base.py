@@ -1,15 +1,55 @@
 # trans_hub/engines/base.py
 
 import asyncio
+import functools
+import math
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Generic, TypeVar, Union
 
+import structlog
 from pydantic import BaseModel, Field
 
 from trans_hub.core.types import EngineBatchItemResult, EngineError, EngineSuccess
-from trans_hub.rate_limiter import RateLimiter
+from trans_hub.engine_cache import EngineResponseCache, cache_key, stable_hash
+from trans_hub.rate_limiter import AdaptiveRateLimiter, RateLimiter
+
+logger = structlog.get_logger(__name__)
 
 _ConfigType = TypeVar("_ConfigType", bound="BaseEngineConfig")
+_T = TypeVar("_T")
+
+# 开启自适应限流但未配置 rpm/rps 时的初始速率（次/秒）
+DEFAULT_ADAPTIVE_RPS = 5.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    按字符类别估算文本的 token 数（与常见 BPE 分词器的统计比例相近）：
+    ASCII 约 4 字符一个 token，中日韩字符约一字一 token，其他非 ASCII 字符约 2 字符一个 token。
+    """
+    ascii_chars = cjk_chars = 0
+    for ch in text:
+        code = ord(ch)
+        if code < 0x80:
+            ascii_chars += 1
+        elif (
+            0x3000 <= code <= 0x9FFF
+            or 0xAC00 <= code <= 0xD7AF
+            or 0xF900 <= code <= 0xFAFF
+            or code >= 0x20000
+        ):
+            cjk_chars += 1
+    other_chars = len(text) - ascii_chars - cjk_chars
+    return math.ceil(ascii_chars / 4 + cjk_chars + other_chars / 2) + 1
+
+
+# 阻塞型引擎未配置 max_concurrency 时专属线程池的大小
+DEFAULT_BLOCKING_WORKERS = 4
+# 预热线程池时等待全部线程就绪的最长时间（秒）
+_WARMUP_TIMEOUT = 30.0
 
 
 class BaseContextModel(BaseModel):
@@ -30,7 +70,24 @@ class BaseEngineConfig(BaseModel):
     max_concurrency: int | None = Field(
         default=None, description="最大并发请求数", gt=0
     )
-    max_batch_size: int = Field(default=50, gt=0)
+    adaptive_rate: bool = Field(
+        default=False,
+        description="按服务端的限流反馈（429、Retry-After、配额响应头）自动调整请求速率，"
+        "rpm/rps 作为初始速率",
+    )
+    tpm: int | None = Field(
+        default=None,
+        description="每分钟最大 token 数 (Tokens Per Minute)，仅对报告用量的引擎生效",
+        gt=0,
+    )
+    max_batch_size: int = Field(
+        default=50, description="单个分块的最大条目数，超出的批次会被拆分依次处理", gt=0
+    )
+    max_batch_tokens: int | None = Field(
+        default=None,
+        description="单个分块的估算 token 预算，未设置时只按条目数拆分",
+        gt=0,
+    )
 
 
 class BaseTranslationEngine(ABC, Generic[_ConfigType]):
@@ -41,14 +98,29 @@ class BaseTranslationEngine(ABC, Generic[_ConfigType]):
     VERSION: str = "1.0.0"
     REQUIRES_SOURCE_LANG: bool = False
     ACCEPTS_CONTEXT: bool = False
+    # 阻塞型引擎（调用同步 SDK）在专属线程池中执行，
+    # 不与 asyncio 默认线程池中的其他任务争抢线程
+    BLOCKING_IO: bool = False
 
     def __init__(self, config: _ConfigType):
         self.config = config
         self._rate_limiter: RateLimiter | None = None
         self._concurrency_semaphore: asyncio.Semaphore | None = None
         self.initialized: bool = False
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread_local = threading.local()
+        self._thread_sessions: list[Any] = []
+        self._sessions_lock = threading.Lock()
+        # 由协调器按配置注入；为 None 时不使用引擎响应缓存
+        self.response_cache: EngineResponseCache | None = None
 
-        if config.rpm:
+        if config.adaptive_rate:
+            self._rate_limiter = AdaptiveRateLimiter(
+                initial_rate=config.rps
+                or (config.rpm / 60 if config.rpm else DEFAULT_ADAPTIVE_RPS),
+                name=self.name,
+            )
+        elif config.rpm:
             self._rate_limiter = RateLimiter(
                 refill_rate=config.rpm / 60, capacity=config.rpm
             )
@@ -60,19 +132,104 @@ class BaseTranslationEngine(ABC, Generic[_ConfigType]):
         if config.max_concurrency:
             self._concurrency_semaphore = asyncio.Semaphore(config.max_concurrency)
 
+        # 按 token 计的限流器：调用前按估算值预留，收到响应后按实际用量对账
+        self._token_limiter: RateLimiter | None = None
+        if config.tpm:
+            self._token_limiter = RateLimiter(
+                refill_rate=config.tpm / 60, capacity=config.tpm
+            )
+
     @property
     def name(self) -> str:
         """从类名自动推断引擎的名称。"""
         return self.__class__.__name__.replace("Engine", "").lower()
 
     async def initialize(self) -> None:
-        """引擎的异步初始化钩子，用于设置连接池等。"""
+        """引擎的异步初始化钩子，用于设置连接池等。阻塞型引擎在此预热专属线程池。"""
+        if self.BLOCKING_IO and self._executor is None:
+            await self._warm_up_executor()
         self.initialized = True
 
     async def close(self) -> None:
         """引擎的异步关闭钩子，用于安全释放资源。"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            # 等待在途调用结束后再释放各线程的会话
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+            with self._sessions_lock:
+                sessions, self._thread_sessions = self._thread_sessions, []
+            self._thread_local = threading.local()
+            for session in sessions:
+                try:
+                    self._close_thread_session(session)
+                except Exception:
+                    logger.warning(
+                        "关闭引擎线程会话失败", engine=self.name, exc_info=True
+                    )
         self.initialized = False
 
+    def _create_thread_session(self) -> Any:
+        """[钩子] 为专属线程池中的每个线程创建一次可复用的会话（如 HTTP 连接）。"""
+        return None
+
+    def _close_thread_session(self, session: Any) -> None:
+        """[钩子] 关闭引擎时释放由 `_create_thread_session` 创建的会话。"""
+
+    def _thread_session(self) -> Any:
+        """返回当前线程的会话，首次调用时创建。"""
+        if not hasattr(self._thread_local, "session"):
+            session = self._create_thread_session()
+            self._thread_local.session = session
+            if session is not None:
+                with self._sessions_lock:
+                    self._thread_sessions.append(session)
+        return self._thread_local.session
+
+    @property
+    def _executor_workers(self) -> int:
+        return self.config.max_concurrency or DEFAULT_BLOCKING_WORKERS
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._executor_workers,
+                thread_name_prefix=f"trans-hub-{self.name}",
+            )
+        return self._executor
+
+    async def _warm_up_executor(self) -> None:
+        """创建专属线程池的全部线程，并在每个线程中提前建立会话。"""
+        executor = self._ensure_executor()
+        workers = self._executor_workers
+        # 栅栏让每个预热任务占住一个线程，迫使线程池创建全部线程
+        barrier = threading.Barrier(workers)
+
+        def _warm() -> None:
+            self._thread_session()
+            try:
+                barrier.wait(timeout=_WARMUP_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, _warm) for _ in range(workers))
+        )
+        logger.debug("引擎线程池已预热", engine=self.name, workers=workers)
+
+    async def run_blocking(
+        self, fn: Callable[..., _T], *args: Any, **kwargs: Any
+    ) -> _T:
+        """
+        在引擎专属线程池中执行阻塞调用。
+        非阻塞型引擎退回 asyncio 默认线程池。
+        """
+        call = functools.partial(fn, *args, **kwargs)
+        if not self.BLOCKING_IO:
+            return await asyncio.to_thread(call)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._ensure_executor(), call)
+
     @abstractmethod
     async def _execute_single_translation(
         self,
@@ -97,13 +254,91 @@ class BaseTranslationEngine(ABC, Generic[_ConfigType]):
 
         if self._concurrency_semaphore:
             async with self._concurrency_semaphore:
-                return await self._execute_single_translation(
+                result = await self._execute_single_translation(
                     text, target_lang, source_lang, context_config
                 )
         else:
-            return await self._execute_single_translation(
+            result = await self._execute_single_translation(
                 text, target_lang, source_lang, context_config
             )
+        self._record_rate_outcome(result)
+        return result
+
+    def _record_rate_outcome(self, result: object) -> None:
+        """将一次服务端调用的结果反馈给自适应限流器：被限流时减速，成功时探测加速。"""
+        limiter = self._rate_limiter
+        if not isinstance(limiter, AdaptiveRateLimiter):
+            return
+        if isinstance(result, EngineError):
+            if result.is_rate_limited:
+                limiter.on_rate_limited(result.retry_after)
+        elif not isinstance(result, BaseException):
+            limiter.on_success()
+
+    def _estimate_tokens(self, text: str) -> int:
+        """估算文本的 token 数，用于分块预算与 token 限流；引擎可按自身分词器覆盖。"""
+        return estimate_tokens(text)
+
+    def _split_into_chunks(self, texts: list[str]) -> list[list[str]]:
+        """按条目数与估算 token 预算将批次切分为保持原有顺序的分块。"""
+        max_items = self.config.max_batch_size
+        max_tokens = self.config.max_batch_tokens
+        chunks: list[list[str]] = []
+        chunk: list[str] = []
+        chunk_tokens = 0
+        for text in texts:
+            tokens = self._estimate_tokens(text) if max_tokens else 0
+            # 单条超出预算的文本独占一个分块
+            if chunk and (
+                len(chunk) >= max_items
+                or (max_tokens and chunk_tokens + tokens > max_tokens)
+            ):
+                chunks.append(chunk)
+                chunk, chunk_tokens = [], 0
+            chunk.append(text)
+            chunk_tokens += tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _atranslate_chunk(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> list[Union[EngineBatchItemResult, BaseException]]:
+        """
+        [钩子] 翻译一个分块，返回与 texts 一一对应的结果或异常。
+        默认逐条调用 `_atranslate_one`，支持一次请求翻译多条文本的引擎可覆盖此方法。
+        """
+        return await asyncio.gather(
+            *(
+                self._atranslate_one(text, target_lang, source_lang, context_config)
+                for text in texts
+            ),
+            return_exceptions=True,
+        )
+
+    def _prompt_identity(self, context_config: dict[str, Any]) -> Any:
+        """
+        [钩子] 决定请求提示词的全部内容（模板、系统提示等）；不使用提示词的引擎返回 None。
+        身份按请求配置计算：同一配置下可能用到的所有提示词都应包含在内，
+        一次 atranslate_batch 的全部结果共享同一 prompt_hash。
+        """
+        return None
+
+    def _params_identity(self, context_config: dict[str, Any]) -> Any:
+        """[钩子] 影响译文的引擎参数（模型、温度、服务商等），不得包含密钥。"""
+        return {"version": self.VERSION, "context": context_config}
+
+    def request_hashes(self, context_config: dict[str, Any]) -> tuple[str | None, str]:
+        """返回 (prompt_hash, params_hash)，用作响应缓存键并记录在修订上。"""
+        prompt = self._prompt_identity(context_config)
+        return (
+            stable_hash(prompt) if prompt is not None else None,
+            stable_hash(self._params_identity(context_config)),
+        )
 
     def _get_context_config(self, context: BaseContextModel | None) -> dict[str, Any]:
         if context and isinstance(context, self.CONTEXT_MODEL):
@@ -128,7 +363,12 @@ class BaseTranslationEngine(ABC, Generic[_ConfigType]):
         source_lang: str | None = None,
         context: BaseContextModel | None = None,
     ) -> list[EngineBatchItemResult]:
-        """[公共 API] 异步翻译一批文本。"""
+        """
+        [公共 API] 异步翻译一批文本，结果与 texts 的顺序一一对应。
+        配置了响应缓存时先查缓存，命中的条目标记 from_cache 且不再调用引擎；
+        其余超过 max_batch_size 或 max_batch_tokens 的部分被拆分为多个分块依次翻译。
+        所有成功结果都带有本次请求的 prompt_hash / params_hash。
+        """
         if self.REQUIRES_SOURCE_LANG and not source_lang:
             error_msg = f"引擎 '{self.__class__.__name__}' 需要提供源语言。"
             return [EngineError(error_message=error_msg, is_retryable=False)] * len(
@@ -136,13 +376,81 @@ class BaseTranslationEngine(ABC, Generic[_ConfigType]):
             )
 
         context_config = self._get_context_config(context)
-        tasks = [
-            self._atranslate_one(text, target_lang, source_lang, context_config)
-            for text in texts
-        ]
-        results: list[
-            Union[EngineBatchItemResult, BaseException]
-        ] = await asyncio.gather(*tasks, return_exceptions=True)
+        prompt_hash, params_hash = self.request_hashes(context_config)
+        cache = self.response_cache
+        keys: list[str] = []
+        cached: dict[str, str] = {}
+        if cache is not None:
+            keys = [
+                cache_key(
+                    self.name, prompt_hash, params_hash, source_lang, target_lang, text
+                )
+                for text in texts
+            ]
+            try:
+                cached = await cache.get_many(keys)
+            except Exception:
+                logger.warning("读取引擎响应缓存失败，直接调用引擎", exc_info=True)
+
+        final_results: list[EngineBatchItemResult] = []
+        pending = [i for i in range(len(texts)) if not keys or keys[i] not in cached]
+        translated = iter(
+            await self._translate_uncached(
+                [texts[i] for i in pending], target_lang, source_lang, context_config
+            )
+        )
+        new_entries: dict[str, str] = {}
+        for i in range(len(texts)):
+            if keys and keys[i] in cached:
+                final_results.append(
+                    EngineSuccess(
+                        translated_text=cached[keys[i]],
+                        from_cache=True,
+                        prompt_hash=prompt_hash,
+                        params_hash=params_hash,
+                    )
+                )
+                continue
+            res = next(translated)
+            if isinstance(res, EngineSuccess):
+                res = res.model_copy(
+                    update={"prompt_hash": prompt_hash, "params_hash": params_hash}
+                )
+                if keys and not res.from_cache:
+                    new_entries[keys[i]] = res.translated_text
+            final_results.append(res)
+
+        if cache is not None and new_entries:
+            try:
+                await cache.put_many(new_entries)
+            except Exception:
+                logger.warning("写入引擎响应缓存失败", exc_info=True)
+        return final_results
+
+    async def _translate_uncached(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> list[EngineBatchItemResult]:
+        """分块调用引擎翻译未命中缓存的文本，并将异常统一转换为 EngineError。"""
+        # 分块依次处理：大批次不会一次性发出成百上千个并发请求，
+        # 分块内的请求仍受速率限制器与并发信号量约束
+        results: list[Union[EngineBatchItemResult, BaseException]] = []
+        for chunk in self._split_into_chunks(texts):
+            chunk_results = await self._atranslate_chunk(
+                chunk, target_lang, source_lang, context_config
+            )
+            if len(chunk_results) != len(chunk):
+                # 结果无法与条目对齐，整块按可重试失败处理，避免译文错位
+                error_msg = (
+                    f"分块结果数量不匹配: 期望 {len(chunk)}, 实际 {len(chunk_results)}"
+                )
+                chunk_results = [
+                    EngineError(error_message=error_msg, is_retryable=True)
+                ] * len(chunk)
+            results.extend(chunk_results)
 
         final_results: list[EngineBatchItemResult] = []
         for res in results:
@@ -1,8 +1,12 @@
 # trans_hub/engines/openai.py
 """提供一个使用 OpenAI API 的翻译引擎。"""
 
+import json
+import math
 import os
-from typing import Any, cast
+import re
+from collections.abc import Mapping
+from typing import Any, Union, cast
 
 import httpx
 import structlog
@@ -16,6 +20,7 @@ from trans_hub.engines.base import (
     BaseEngineConfig,
     BaseTranslationEngine,
 )
+from trans_hub.rate_limiter import AdaptiveRateLimiter
 
 _AsyncOpenAIClient: type | None = None
 try:
@@ -40,6 +45,18 @@ except ImportError:
 
 logger = structlog.get_logger(__name__)
 
+# 译文 token 数相对原文的预留倍数，覆盖语言之间的长度差异
+_COMPLETION_EXPANSION = 2.0
+# 打包模式中每条译文的编号与 JSON 结构开销
+_PACKED_SEGMENT_OVERHEAD = 12
+_COMPLETION_MARGIN = 32
+
+# 模型有时会用 Markdown 代码块包裹 JSON
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+# x-ratelimit-reset-* 响应头中的时长，如 "1s"、"6m0s"、"250ms"
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
 
 class OpenAIContext(BaseContextModel):
     """OpenAI 引擎的上下文模型。"""
@@ -64,6 +81,19 @@ class OpenAIEngineConfig(BaseSettings, BaseEngineConfig):
         "or quotes.\n\n"
         'Text to translate: "{text}"'
     )
+    # 打包模式：一次请求翻译一个分块中的多条文本，按编号返回 JSON
+    packed_batch: bool = True
+    packed_system_prompt: str = (
+        "You are a translation engine. Translate every segment from "
+        "{source_lang} to {target_lang}. The user message is a JSON object "
+        '{{"segments": [{{"id": <int>, "text": <string>}}, ...]}}. '
+        'Reply with only a JSON object {{"translations": [{{"id": <int>, '
+        '"text": <translated string>}}, ...]}} containing exactly one entry per '
+        "input id. Do not merge, split, skip or explain segments."
+    )
+    max_batch_tokens: int | None = Field(default=4000, gt=0)
+    # 单次调用允许的最大译文 token 数（模型的输出上限）：打包分块按此进一步切分，max_tokens 不超过此值
+    max_output_tokens: int = Field(default=4096, gt=0)
     timeout_total: float = 30.0
     timeout_connect: float = 5.0
     max_retries: int = 2
@@ -103,12 +133,23 @@ class OpenAIEngine(BaseTranslationEngine[OpenAIEngineConfig]):
 
         assert config.api_key is not None
         timeout = httpx.Timeout(config.timeout_total, connect=config.timeout_connect)
+        # SDK 内置重试不经过 token 预留，且会把 429 对限流器隐藏到重试耗尽之后；
+        # 启用 TPM 或自适应限流时由 Worker 的退避与 AIMD 负责重试
+        max_retries = config.max_retries
+        if max_retries and (config.tpm or config.adaptive_rate):
+            logger.info(
+                "已启用 TPM/自适应限流，禁用 OpenAI SDK 内置重试",
+                configured_max_retries=max_retries,
+            )
+            max_retries = 0
         self.client: AsyncOpenAI = _AsyncOpenAIClient(
             api_key=config.api_key.get_secret_value(),
             base_url=str(config.endpoint),
             timeout=timeout,
-            max_retries=config.max_retries,
+            max_retries=max_retries,
         )
+        # 实际提示词 token 数与估算值之比，随响应中的 usage 持续校准
+        self._prompt_token_ratio = 1.0
 
     async def initialize(self) -> None:
         assert self.config.api_key is not None
@@ -153,6 +194,239 @@ class OpenAIEngine(BaseTranslationEngine[OpenAIEngineConfig]):
                     raise
         await super().close()
 
+    def _request_params(self, context_config: dict[str, Any]) -> tuple[str, float]:
+        model = context_config.get("model", self.config.model)
+        temperature = context_config.get("temperature", self.config.temperature)
+        return model, temperature
+
+    def _prompt_identity(self, context_config: dict[str, Any]) -> Any:
+        """
+        [覆盖] 提示词身份按请求配置计算，而非按单次调用：开启打包时，单条分块与打包中
+        回退的条目实际使用逐条模板，但与打包条目共享同一 prompt_hash（也是响应缓存键）。
+        """
+        identity = {
+            "prompt_template": context_config.get(
+                "prompt_template", self.config.default_prompt_template
+            ),
+            "system_prompt": context_config.get("system_prompt"),
+        }
+        # 与 _atranslate_chunk 的判断一致：自定义模板时整个请求都不会使用打包提示词
+        if self.config.packed_batch and "prompt_template" not in context_config:
+            identity["packed_system_prompt"] = self.config.packed_system_prompt
+        return identity
+
+    def _params_identity(self, context_config: dict[str, Any]) -> Any:
+        model, temperature = self._request_params(context_config)
+        return {
+            "version": self.VERSION,
+            "endpoint": str(self.config.endpoint),
+            "model": model,
+            "temperature": temperature,
+        }
+
+    def _estimate_prompt_tokens(
+        self, messages: list[ChatCompletionMessageParam]
+    ) -> int:
+        """估算消息的提示词 token 数（每条消息约 4 个结构 token，回复起始约 3 个）。"""
+        raw = sum(
+            self._estimate_tokens(str(m.get("content") or "")) + 4 for m in messages
+        )
+        return math.ceil((raw + 3) * self._prompt_token_ratio)
+
+    def _estimate_completion_tokens(self, texts: list[str], packed: bool) -> int:
+        """
+        估算译文的 token 数，作为 max_tokens 与 token 限流的预留量。
+        按原文 token 数的固定倍数留出语言间的长度差异；打包模式另计每条的编号与 JSON 结构。
+        结果不超过 max_output_tokens：超出模型输出上限的请求会被直接拒绝（400），
+        而被截断的打包响应可以回退为逐条调用。
+        """
+        estimate = (
+            sum(self._segment_completion_tokens(t, packed) for t in texts)
+            + _COMPLETION_MARGIN
+        )
+        return min(estimate, self.config.max_output_tokens)
+
+    def _segment_completion_tokens(self, text: str, packed: bool) -> int:
+        per_item = _PACKED_SEGMENT_OVERHEAD if packed else 0
+        return math.ceil(self._estimate_tokens(text) * _COMPLETION_EXPANSION) + per_item
+
+    def _split_into_chunks(self, texts: list[str]) -> list[list[str]]:
+        """
+        [覆盖] 打包模式下，在条目数与 token 预算之外再按预估译文长度切分，
+        使每个打包请求的译文都能容纳在 max_output_tokens 之内。
+        """
+        chunks = super()._split_into_chunks(texts)
+        if not self.config.packed_batch:
+            return chunks
+        budget = self.config.max_output_tokens - _COMPLETION_MARGIN
+        split: list[list[str]] = []
+        for chunk in chunks:
+            current: list[str] = []
+            used = 0
+            for text in chunk:
+                cost = self._segment_completion_tokens(text, packed=True)
+                # 单条超出预算的文本独占一个分块
+                if current and used + cost > budget:
+                    split.append(current)
+                    current, used = [], 0
+                current.append(text)
+                used += cost
+            if current:
+                split.append(current)
+        return split
+
+    def _reconcile_usage(
+        self, estimated_prompt: int, reserved: int, usage: Any
+    ) -> None:
+        """按响应中的实际用量退还或补扣预留的 token，并校准提示词估算比例。"""
+        if usage is None:
+            return
+        if self._token_limiter is not None:
+            self._token_limiter.adjust(reserved - usage.total_tokens)
+        if usage.prompt_tokens and estimated_prompt:
+            raw = estimated_prompt / self._prompt_token_ratio
+            observed = usage.prompt_tokens / raw
+            self._prompt_token_ratio = min(
+                4.0, max(0.25, 0.8 * self._prompt_token_ratio + 0.2 * observed)
+            )
+
+    def _observe_rate_headers(self, headers: Mapping[str, str]) -> None:
+        """将 x-ratelimit-* 响应头报告的请求与 token 配额反馈给自适应限流器。"""
+        limiter = self._rate_limiter
+        if not isinstance(limiter, AdaptiveRateLimiter):
+            return
+        limiter.observe_quota(
+            limit_per_minute=_number_header(headers, "x-ratelimit-limit-requests"),
+            remaining=_int_header(headers, "x-ratelimit-remaining-requests"),
+            reset_after=_parse_duration(headers.get("x-ratelimit-reset-requests")),
+        )
+        # token 配额耗尽时任何请求都会被拒绝，同样暂停至重置
+        limiter.observe_quota(
+            remaining=_int_header(headers, "x-ratelimit-remaining-tokens"),
+            reset_after=_parse_duration(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+    async def _complete(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> Union[str, EngineError]:
+        """执行一次 chat completion，返回消息文本，或将调用及响应的失败映射为 EngineError。"""
+        response = await self._request_completion(
+            messages, model, temperature, max_tokens
+        )
+        if isinstance(response, EngineError):
+            return response
+        return self._completion_text(response, max_tokens)
+
+    async def _request_completion(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> Any:
+        """
+        发送一次 chat completion 请求，返回解析后的响应，请求本身失败时返回 EngineError。
+        配置了 tpm 时先按 提示词估算 + max_tokens 预留 token，收到响应后按 usage 对账；
+        被限流（429）时清空 token 余额，使并发的调用一同暂停直至额度恢复；
+        其他失败退还预留的 token。响应头中的配额信息反馈给自适应限流器（如已开启）。
+        max_tokens 以 max_output_tokens 为上限，预留量按封顶后的值计算，
+        单个大分块不会占满整分钟的额度。
+        """
+        max_tokens = min(max_tokens, self.config.max_output_tokens)
+        estimated_prompt = self._estimate_prompt_tokens(messages)
+        reserved = 0
+        if self._token_limiter is not None:
+            reserved = min(
+                estimated_prompt + max_tokens, int(self._token_limiter.capacity)
+            )
+            await self._token_limiter.acquire(reserved)
+
+        try:
+            raw = await self.client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            response = raw.parse()
+        except RateLimitError as e:
+            if self._token_limiter is not None:
+                self._token_limiter.drain()
+            self._observe_rate_headers(e.response.headers)
+            return EngineError(
+                error_message=str(e),
+                is_retryable=True,
+                is_rate_limited=True,
+                retry_after=_retry_after(e.response.headers),
+            )
+        except (InternalServerError, APIConnectionError) as e:
+            if self._token_limiter is not None:
+                self._token_limiter.adjust(reserved)
+            return EngineError(error_message=str(e), is_retryable=True)
+        except (PermissionDeniedError, AuthenticationError, APIStatusError) as e:
+            if self._token_limiter is not None:
+                self._token_limiter.adjust(reserved)
+            error_msg = (
+                e.body.get("message", str(e)) if isinstance(e.body, dict) else str(e)
+            )
+            return EngineError(
+                error_message=f"API Error: {error_msg}", is_retryable=False
+            )
+        except Exception as e:
+            if self._token_limiter is not None:
+                self._token_limiter.adjust(reserved)
+            return EngineError(error_message=f"未知引擎错误: {e}", is_retryable=True)
+
+        self._observe_rate_headers(raw.headers)
+        self._reconcile_usage(estimated_prompt, reserved, response.usage)
+        return response
+
+    def _completion_text(
+        self, response: Any, max_tokens: int
+    ) -> Union[str, EngineError]:
+        """从成功的响应中取出消息文本；响应被截断、为空或内容无法使用时返回 EngineError。"""
+        if not response.choices:
+            return EngineError(
+                error_message="API 返回了空的 'choices' 列表。", is_retryable=True
+            )
+
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            return EngineError(
+                error_message=f"译文超出 max_tokens ({max_tokens}) 被截断。",
+                is_retryable=True,
+            )
+
+        content = choice.message.content
+        translated_text = ""
+
+        if isinstance(content, str):
+            translated_text = content
+        elif isinstance(content, list):
+            # [核心修复] 严格处理混合内容块
+            for part in content:
+                # 确保 part 是一个有 .text 属性的对象，且 .text 是字符串
+                if not (hasattr(part, "text") and isinstance(part.text, str)):
+                    error_msg = "API 返回了不支持的内容块类型，翻译中止。"
+                    logger.warning(error_msg, received_part=str(part)[:200])
+                    return EngineError(error_message=error_msg, is_retryable=False)
+                translated_text += part.text
+
+        if not translated_text:
+            if content is None:
+                return EngineError(
+                    error_message="API 返回的消息内容为 None。", is_retryable=True
+                )
+            return EngineError(
+                error_message="API 返回了空内容或仅包含非文本内容。",
+                is_retryable=True,
+            )
+        return translated_text
+
     async def _execute_single_translation(
         self,
         text: str,
@@ -165,8 +439,7 @@ class OpenAIEngine(BaseTranslationEngine[OpenAIEngineConfig]):
         prompt_template = context_config.get(
             "prompt_template", self.config.default_prompt_template
         )
-        model = context_config.get("model", self.config.model)
-        temperature = context_config.get("temperature", self.config.temperature)
+        model, temperature = self._request_params(context_config)
         system_prompt = context_config.get("system_prompt")
 
         messages: list[ChatCompletionMessageParam] = []
@@ -180,63 +453,183 @@ class OpenAIEngine(BaseTranslationEngine[OpenAIEngineConfig]):
         )
         messages.append(ChatCompletionUserMessageParam(role="user", content=prompt))
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=len(text.encode("utf-8")) * 3 + 150,
-            )
-
-            if not response.choices:
-                return EngineError(
-                    error_message="API 返回了空的 'choices' 列表。", is_retryable=True
-                )
+        result = await self._complete(
+            messages,
+            model,
+            temperature,
+            self._estimate_completion_tokens([text], packed=False),
+        )
+        if isinstance(result, EngineError):
+            return result
 
-            message = response.choices[0].message
-            content = message.content
-            translated_text = ""
-
-            if isinstance(content, str):
-                translated_text = content
-            elif isinstance(content, list):
-                # [核心修复] 严格处理混合内容块
-                for part in content:
-                    # 确保 part 是一个有 .text 属性的对象，且 .text 是字符串
-                    if not (hasattr(part, "text") and isinstance(part.text, str)):
-                        error_msg = "API 返回了不支持的内容块类型，翻译中止。"
-                        logger.warning(error_msg, received_part=str(part)[:200])
-                        return EngineError(error_message=error_msg, is_retryable=False)
-                    translated_text += part.text
-
-            if not translated_text:
-                if content is None:
-                    return EngineError(
-                        error_message="API 返回的消息内容为 None。", is_retryable=True
-                    )
-                return EngineError(
-                    error_message="API 返回了空内容或仅包含非文本内容。",
-                    is_retryable=True,
-                )
+        translated_text = result.strip().strip('"')
+        if not translated_text:
+            return EngineError(
+                error_message="API 返回了空或仅包含空白的翻译内容。",
+                is_retryable=True,
+            )
+        return EngineSuccess(translated_text=translated_text)
 
-            translated_text = translated_text.strip().strip('"')
+    async def _atranslate_chunk(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> list[Union[EngineBatchItemResult, BaseException]]:
+        """
+        [实现] 打包模式下以一次请求翻译整个分块。
+        按编号校验返回的条目数量与顺序，缺失或无效的条目回退为逐条调用；
+        请求本身失败时整块返回该错误，不回退；
+        自定义的逐条 prompt_template 无法打包，整块回退为逐条调用。
+        """
+        if (
+            not self.config.packed_batch
+            or len(texts) < 2
+            or "prompt_template" in context_config
+        ):
+            return await super()._atranslate_chunk(
+                texts, target_lang, source_lang, context_config
+            )
 
-            if not translated_text:
-                return EngineError(
-                    error_message="API 返回了空或仅包含空白的翻译内容。",
-                    is_retryable=True,
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
+        if self._concurrency_semaphore:
+            async with self._concurrency_semaphore:
+                packed = await self._execute_packed_translation(
+                    texts, target_lang, source_lang, context_config
                 )
-
-            return EngineSuccess(translated_text=translated_text)
-
-        except (RateLimitError, InternalServerError, APIConnectionError) as e:
-            return EngineError(error_message=str(e), is_retryable=True)
-        except (PermissionDeniedError, AuthenticationError, APIStatusError) as e:
-            error_msg = (
-                e.body.get("message", str(e)) if isinstance(e.body, dict) else str(e)
-            )
-            return EngineError(
-                error_message=f"API Error: {error_msg}", is_retryable=False
+        else:
+            packed = await self._execute_packed_translation(
+                texts, target_lang, source_lang, context_config
             )
-        except Exception as e:
-            return EngineError(error_message=f"未知引擎错误: {e}", is_retryable=True)
+        self._record_rate_outcome(packed)
+
+        if isinstance(packed, EngineError):
+            # 请求本身失败（限流、5xx、连接错误等）时逐条调用同样会失败，回退只会放大请求量
+            return [packed] * len(texts)
+
+        results: list[Union[EngineBatchItemResult, BaseException]] = [
+            EngineSuccess(translated_text=t) for t in packed if t is not None
+        ]
+        missing = [i for i, t in enumerate(packed) if t is None]
+        if not missing:
+            return results
+
+        logger.warning(
+            "打包翻译的部分条目无效，回退为逐条调用",
+            chunk_size=len(texts),
+            fallback=len(missing),
+        )
+        fallback = await super()._atranslate_chunk(
+            [texts[i] for i in missing], target_lang, source_lang, context_config
+        )
+        merged: list[Union[EngineBatchItemResult, BaseException]] = []
+        packed_iter, fallback_iter = iter(results), iter(fallback)
+        for t in packed:
+            merged.append(next(packed_iter) if t is not None else next(fallback_iter))
+        return merged
+
+    async def _execute_packed_translation(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> Union[list[str | None], EngineError]:
+        """
+        在一次 chat completion 中翻译多条文本。
+        返回与 texts 对齐的译文列表，无法从响应中取得的条目为 None；
+        请求本身失败或响应内容不受支持时返回 EngineError。
+        """
+        model, temperature = self._request_params(context_config)
+        system_prompt = self.config.packed_system_prompt.format(
+            source_lang=cast(str, source_lang), target_lang=target_lang
+        )
+        if context_config.get("system_prompt"):
+            system_prompt = f"{context_config['system_prompt']}\n\n{system_prompt}"
+        segments = [{"id": i, "text": text} for i, text in enumerate(texts, start=1)]
+        user_content = json.dumps({"segments": segments}, ensure_ascii=False)
+        messages: list[ChatCompletionMessageParam] = [
+            ChatCompletionSystemMessageParam(role="system", content=system_prompt),
+            ChatCompletionUserMessageParam(role="user", content=user_content),
+        ]
+        max_tokens = self._estimate_completion_tokens(texts, packed=True)
+        response = await self._request_completion(
+            messages, model, temperature, max_tokens
+        )
+        if isinstance(response, EngineError):
+            return response
+        result = self._completion_text(response, max_tokens)
+        if isinstance(result, EngineError):
+            if not result.is_retryable:
+                return result
+            # 请求成功但响应被截断或为空：逐条调用的输出更短，可以成功
+            logger.warning("打包翻译的响应不可用", reason=result.error_message)
+            return [None] * len(texts)
+        return _parse_packed_translations(result, len(texts))
+
+
+def _number_header(headers: Mapping[str, str], name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> int | None:
+    value = _number_header(headers, name)
+    return None if value is None else int(value)
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """解析 x-ratelimit-reset-* 响应头的时长（如 "6m0s"、"250ms"），单位为秒。"""
+    if not value:
+        return None
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    """读取 429 响应要求的等待时长：优先 retry-after-ms，其次以秒计的 retry-after。"""
+    if (millis := _number_header(headers, "retry-after-ms")) is not None:
+        return millis / 1000
+    # retry-after 也可能是 HTTP 日期，此时无法解析为秒数，交由指数退避处理
+    return _number_header(headers, "retry-after")
+
+
+def _parse_packed_translations(content: str, expected: int) -> list[str | None]:
+    """
+    解析打包模式的 JSON 响应，按编号（1..expected）对齐译文。
+    缺失、重复或为空的编号对应 None；整体无法解析时全部为 None。
+    """
+    content = content.strip()
+    if match := _CODE_FENCE_RE.match(content):
+        content = match.group(1)
+    aligned: list[str | None] = [None] * expected
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        logger.warning("打包翻译的响应不是有效的 JSON", preview=content[:200])
+        return aligned
+    entries = data.get("translations") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return aligned
+
+    seen: set[int] = set()
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        seg_id, text = entry.get("id"), entry.get("text")
+        if not isinstance(seg_id, int) or not 1 <= seg_id <= expected:
+            continue
+        if seg_id in seen:
+            # 同一编号出现多次，无法判断哪条正确
+            aligned[seg_id - 1] = None
+            continue
+        seen.add(seg_id)
+        if isinstance(text, str) and text.strip():
+            aligned[seg_id - 1] = text.strip()
+    return aligned
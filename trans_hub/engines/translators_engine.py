@@ -2,9 +2,11 @@
 """提供一个使用 `translators` 库的免费翻译引擎。"""
 
 import asyncio
-from typing import Any
+import re
+from typing import Any, Union
 
 import structlog
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from trans_hub.core.exceptions import APIError
@@ -17,6 +19,9 @@ from trans_hub.engines.base import (
 
 logger = structlog.get_logger(__name__)
 
+# 打包模式中每条文本前的编号标记；服务商通常原样保留方括号与数字
+_SEGMENT_MARKER_RE = re.compile(r"\[\[\s*(\d+)\s*\]\]")
+
 
 class TranslatorsContextModel(BaseContextModel):
     """Translators 引擎的上下文。"""
@@ -31,6 +36,11 @@ class TranslatorsEngineConfig(BaseSettings, BaseEngineConfig):
     model_config = SettingsConfigDict(env_prefix="TH_TRANSLATORS_", extra="ignore")
 
     provider: str = "google"
+    # 打包模式：将多条文本以编号标记拼接后一次调用服务商，再按标记拆分
+    packed_batch: bool = True
+    packed_max_chars: int = Field(
+        default=4500, description="单次打包调用的最大字符数（服务商的单次上限）", gt=0
+    )
 
 
 class TranslatorsEngine(BaseTranslationEngine[TranslatorsEngineConfig]):
@@ -40,6 +50,7 @@ class TranslatorsEngine(BaseTranslationEngine[TranslatorsEngineConfig]):
     CONTEXT_MODEL = TranslatorsContextModel
     VERSION = "2.2.1"
     ACCEPTS_CONTEXT = True
+    BLOCKING_IO = True
 
     def __init__(self, config: TranslatorsEngineConfig):
         super().__init__(config)
@@ -63,6 +74,67 @@ class TranslatorsEngine(BaseTranslationEngine[TranslatorsEngineConfig]):
         except Exception as e:
             raise APIError(f"Translators 库初始化失败: {e}") from e
 
+    async def initialize(self) -> None:
+        # 线程会话依赖 translators 库；库未安装时保持惰性报错，不阻止协调器启动
+        try:
+            await self._ensure_initialized()
+        except ImportError:
+            logger.warning("未安装 'translators' 库，翻译调用将失败。")
+            self.initialized = True
+            return
+        await super().initialize()
+
+    def _create_thread_session(self) -> Any:
+        """
+        为每个线程创建独立的 TranslatorsServer：各服务商对象持有自己的 HTTP 会话，
+        线程内的调用复用同一会话，线程之间互不干扰。
+        旧版本库没有 TranslatorsServer 时退回模块级的共享实例。
+        """
+        if self.ts_module is None:
+            return None
+        server_cls = getattr(
+            getattr(self.ts_module, "server", None), "TranslatorsServer", None
+        )
+        return server_cls() if server_cls is not None else None
+
+    def _close_thread_session(self, session: Any) -> None:
+        for translator in vars(session).values():
+            http_session = getattr(translator, "session", None)
+            if http_session is not None and callable(
+                getattr(http_session, "close", None)
+            ):
+                http_session.close()
+
+    def _params_identity(self, context_config: dict[str, Any]) -> Any:
+        return {
+            "version": self.VERSION,
+            "provider": context_config.get("provider", self.config.provider),
+        }
+
+    def _translate_text(
+        self, text: str, provider: str, source_lang: str | None, target_lang: str
+    ) -> str:
+        """同步调用 translators 库，在引擎专属线程池中执行。"""
+        assert self.ts_module is not None
+        server = self._thread_session() or self.ts_module
+        return str(
+            server.translate_text(
+                query_text=text,
+                translator=provider,
+                from_language=source_lang or "auto",
+                to_language=target_lang,
+            )
+        )
+
+    def _error(self, provider: str, e: Exception) -> EngineError:
+        # translators 库不区分错误类型，只能从消息中识别提供方的限流响应
+        message = str(e)
+        return EngineError(
+            error_message=f"Translators({provider}) Error: {message}",
+            is_retryable=True,
+            is_rate_limited="429" in message or "Too Many Requests" in message,
+        )
+
     async def _execute_single_translation(
         self,
         text: str,
@@ -72,26 +144,149 @@ class TranslatorsEngine(BaseTranslationEngine[TranslatorsEngineConfig]):
     ) -> EngineBatchItemResult:
         """[实现] 异步翻译单个文本。"""
         await self._ensure_initialized()
-        assert self.ts_module is not None
-        ts_lib = self.ts_module
-
         provider = context_config.get("provider", self.config.provider)
-
-        def _translate_sync() -> str:
-            return str(
-                ts_lib.translate_text(
-                    query_text=text,
-                    translator=provider,
-                    from_language=source_lang or "auto",
-                    to_language=target_lang,
-                )
+        try:
+            translated_text = await self.run_blocking(
+                self._translate_text, text, provider, source_lang, target_lang
             )
+            return EngineSuccess(translated_text=translated_text)
+        except Exception as e:
+            return self._error(provider, e)
 
+    def _plan_packs(self, texts: list[str]) -> list[list[int]]:
+        """
+        将分块内的文本按 packed_max_chars 分组为若干次打包调用（元素为 texts 的下标）。
+        自身包含编号标记或单独超出上限的文本单独成组，按逐条方式翻译。
+        """
+        packs: list[list[int]] = []
+        pack: list[int] = []
+        pack_chars = 0
+        for i, text in enumerate(texts):
+            size = len(text) + len(f"[[{i + 1}]] \n")
+            if _SEGMENT_MARKER_RE.search(text) or size > self.config.packed_max_chars:
+                packs.append([i])
+                continue
+            if pack and pack_chars + size > self.config.packed_max_chars:
+                packs.append(pack)
+                pack, pack_chars = [], 0
+            pack.append(i)
+            pack_chars += size
+        if pack:
+            packs.append(pack)
+        return packs
+
+    async def _translate_packed(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        provider: str,
+    ) -> Union[list[str | None], EngineError]:
+        """
+        以编号标记拼接多条文本并一次调用服务商，返回与 texts 对齐的译文。
+        标记缺失、重复或乱序导致无法对齐的条目为 None。
+        调用失败时返回 EngineError。
+        """
+        joined = "\n".join(f"[[{n}]] {text}" for n, text in enumerate(texts, 1))
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
         try:
-            translated_text = await asyncio.to_thread(_translate_sync)
-            return EngineSuccess(translated_text=translated_text)
+            if self._concurrency_semaphore:
+                async with self._concurrency_semaphore:
+                    translated = await self.run_blocking(
+                        self._translate_text, joined, provider, source_lang, target_lang
+                    )
+            else:
+                translated = await self.run_blocking(
+                    self._translate_text, joined, provider, source_lang, target_lang
+                )
         except Exception as e:
-            return EngineError(
-                error_message=f"Translators({provider}) Error: {e}",
-                is_retryable=True,
+            error = self._error(provider, e)
+            self._record_rate_outcome(error)
+            return error
+        self._record_rate_outcome(translated)
+        return _split_packed_translation(translated, texts)
+
+    async def _atranslate_chunk(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str | None,
+        context_config: dict[str, Any],
+    ) -> list[Union[EngineBatchItemResult, BaseException]]:
+        """
+        [实现] 打包模式下将分块内的短文本合并为少量服务商调用。
+        无法对齐的条目以及打包调用失败（限流除外）的条目回退为逐条调用。
+        """
+        if not self.config.packed_batch or len(texts) < 2:
+            return await super()._atranslate_chunk(
+                texts, target_lang, source_lang, context_config
+            )
+        await self._ensure_initialized()
+        provider = context_config.get("provider", self.config.provider)
+
+        results: list[Union[EngineBatchItemResult, BaseException, None]] = [None] * len(
+            texts
+        )
+
+        async def run_pack(indexes: list[int]) -> None:
+            if len(indexes) == 1:
+                # 单条文本无需打包，留给下方的逐条调用
+                return
+            packed = await self._translate_packed(
+                [texts[i] for i in indexes], target_lang, source_lang, provider
+            )
+            if isinstance(packed, EngineError):
+                # 限流时逐条重试只会放大请求量；其他错误交给逐条调用
+                if packed.is_rate_limited:
+                    for i in indexes:
+                        results[i] = packed
+                return
+            for i, translated_text in zip(indexes, packed, strict=True):
+                if translated_text is not None:
+                    results[i] = EngineSuccess(translated_text=translated_text)
+
+        await asyncio.gather(*(run_pack(p) for p in self._plan_packs(texts)))
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            if len(missing) < len(texts):
+                logger.debug(
+                    "打包翻译的部分条目无法对齐，回退为逐条调用",
+                    chunk_size=len(texts),
+                    fallback=len(missing),
+                )
+            fallback = await super()._atranslate_chunk(
+                [texts[i] for i in missing], target_lang, source_lang, context_config
             )
+            for i, result in zip(missing, fallback, strict=True):
+                results[i] = result
+        return [r for r in results if r is not None]
+
+
+def _split_packed_translation(
+    translated: str, originals: list[str]
+) -> list[str | None]:
+    """
+    按编号标记拆分打包调用的译文，返回与 originals 对齐的列表。
+    只有标记紧接着下一个编号（或为最后一个编号）、且行数与原文一致的条目才被采信；
+    标记丢失时其译文会并入前一条，因此前一条同样视为无法对齐（None）。
+    """
+    expected = len(originals)
+    aligned: list[str | None] = [None] * expected
+    markers = list(_SEGMENT_MARKER_RE.finditer(translated))
+    ids = [int(m.group(1)) for m in markers]
+    for k, marker in enumerate(markers):
+        seg_id = ids[k]
+        if not 1 <= seg_id <= expected or ids.count(seg_id) > 1:
+            continue
+        is_last = k + 1 == len(markers)
+        if (is_last and seg_id != expected) or (
+            not is_last and ids[k + 1] != seg_id + 1
+        ):
+            continue
+        end = len(translated) if is_last else markers[k + 1].start()
+        text = translated[marker.end() : end].strip()
+        if text and text.count("\n") == originals[seg_id - 1].strip().count("\n"):
+            aligned[seg_id - 1] = text
+    return aligned
@@ -0,0 +1,66 @@
+# trans_hub/metrics.py
+"""
+本模块提供 Worker 的 Prometheus 指标。
+
+prometheus-client 为可选依赖（`pip install "trans-hub[metrics]"`）；
+未安装时所有记录函数均为空操作，只有显式配置 metrics_port 才要求安装。
+"""
+
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_batch_size_gauge: Any = None
+_item_latency_histogram: Any = None
+_rate_limit_gauge: Any = None
+_start_http_server: Any = None
+try:
+    from prometheus_client import Gauge, Histogram, start_http_server
+
+    _batch_size_gauge = Gauge(
+        "trans_hub_worker_batch_size",
+        "Worker 当前采用的自适应批次大小",
+        ["engine"],
+    )
+    _item_latency_histogram = Histogram(
+        "trans_hub_engine_item_latency_seconds",
+        "引擎调用按条目均摊的耗时（秒）",
+        ["engine"],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    )
+    _rate_limit_gauge = Gauge(
+        "trans_hub_engine_rate_limit_rps",
+        "引擎自适应限流器当前允许的请求速率（次/秒）",
+        ["engine"],
+    )
+    _start_http_server = start_http_server
+except ImportError:
+    pass
+
+
+def start_metrics_server(port: int) -> None:
+    """在后台线程中启动 Prometheus 指标的 HTTP 端点。"""
+    if _start_http_server is None:
+        raise ImportError(
+            "要暴露 Prometheus 指标, 请安装 'prometheus-client' 库: "
+            '"pip install "trans-hub[metrics]"'
+        )
+    _start_http_server(port)
+    logger.info("Prometheus 指标端点已启动", port=port)
+
+
+def set_batch_size(engine: str, size: int) -> None:
+    if _batch_size_gauge is not None:
+        _batch_size_gauge.labels(engine=engine).set(size)
+
+
+def observe_item_latency(engine: str, seconds: float) -> None:
+    if _item_latency_histogram is not None:
+        _item_latency_histogram.labels(engine=engine).observe(seconds)
+
+
+def set_rate_limit(engine: str, rate: float) -> None:
+    if _rate_limit_gauge is not None:
+        _rate_limit_gauge.labels(engine=engine).set(rate)
@@ -26,7 +26,9 @@ def create_persistence_handler(config: TransHubConfig) -> PersistenceHandler:
 
         engine = create_async_engine(db_url)
         sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
-        return SQLitePersistenceHandler(sessionmaker, db_path=config.db_path)
+        return SQLitePersistenceHandler(
+            sessionmaker, db_path=config.db_path, lease_ttl=config.worker_lease_ttl
+        )
 
     elif db_url.startswith("postgresql"):
         try:
@@ -39,7 +41,9 @@ def create_persistence_handler(config: TransHubConfig) -> PersistenceHandler:
 
         engine = create_async_engine(db_url, pool_size=20, max_overflow=10)
         sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
-        return PostgresPersistenceHandler(sessionmaker, dsn=db_url)
+        return PostgresPersistenceHandler(
+            sessionmaker, dsn=db_url, lease_ttl=config.worker_lease_ttl
+        )
 
     else:
         raise ConfigurationError(f"不支持的数据库类型或驱动: '{db_url}'")
@@ -3,44 +3,108 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import socket
+import uuid
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 import structlog
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import (
+    Integer,
+    String,
+    Table,
+    Text,
+    and_,
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from trans_hub._uida.encoder import generate_uid_components
 from trans_hub.core.exceptions import DatabaseError
-from trans_hub.core.interfaces import PersistenceHandler
-from trans_hub.core.types import ContentItem, TranslationStatus
+from trans_hub.core.interfaces import (
+    DraftCursor,
+    HeadDim,
+    HeadKey,
+    PersistenceHandler,
+    TmProbe,
+)
+from trans_hub.core.types import (
+    ContentItem,
+    ContentUpsert,
+    DeadLetter,
+    DraftQueueDepth,
+    DraftWakeup,
+    FailedAttempt,
+    NewRevision,
+    TmUpsert,
+    TranslationStatus,
+)
 from trans_hub.db.schema import (
     ThContent,
+    ThDeadLetters,
     ThLocalesFallbacks,
     ThProjects,
+    ThResolveCache,
     ThTm,
     ThTmLinks,
     ThTransHead,
     ThTransRev,
+    translation_status_enum,
 )
 
 if TYPE_CHECKING:
-    pass
+    from sqlalchemy import CTE, ColumnElement, CursorResult, Result, Select, Update
+    from sqlalchemy.dialects.postgresql import Insert as PgInsert
+    from sqlalchemy.orm import DeclarativeBase
 
 logger = structlog.get_logger(__name__)
 
+DEFAULT_LEASE_TTL_SECONDS = 300.0
+# 多行 INSERT 每条语句的行数上限，使绑定参数数量低于数据库限制（PostgreSQL 为 32767）
+_MULTI_ROW_INSERT_CHUNK = 1000
+
+
+def _new_lease_owner() -> str:
+    """生成在进程与主机之间唯一的租约持有者标识。"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _rowcount(result: Result[Any]) -> int:
+    """读取 UPDATE/DELETE 的受影响行数（此类语句的结果总是 CursorResult）。"""
+    return cast("CursorResult[Any]", result).rowcount
+
 
 class BasePersistenceHandler(PersistenceHandler, ABC):
     """持久化处理器的基类，使用 SQLAlchemy ORM Session 实现 UIDA 共享逻辑。"""
 
-    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession], is_sqlite: bool):
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        is_sqlite: bool,
+        lease_ttl: float = DEFAULT_LEASE_TTL_SECONDS,
+    ):
         self._sessionmaker = sessionmaker
         self._is_sqlite = is_sqlite
-        self._notification_task: asyncio.Task[AsyncGenerator[str, None]] | None = None
+        self._notification_task: asyncio.Task[None] | None = None
+        self.lease_owner = _new_lease_owner()
+        self.lease_ttl = lease_ttl
 
     @abstractmethod
     async def connect(self) -> None:
@@ -58,10 +122,29 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         logger.info("持久化层引擎已关闭。")
 
     @abstractmethod
-    def listen_for_notifications(self) -> AsyncGenerator[str, None]:
-        """[子类实现] 监听数据库通知。"""
+    def listen_for_notifications(
+        self, coalesce_window: float = 0.0
+    ) -> AsyncGenerator[DraftWakeup, None]:
+        """[子类实现] 监听新草稿通知，合并窗口内的通知只唤醒一次。"""
         ...
 
+    # 写入新修订时一并清除的队列状态：租约、重试计数与死信标记
+    _HEAD_QUEUE_RESET: dict[str, Any] = {
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "attempt_count": 0,
+        "next_attempt_at": None,
+        "last_error": None,
+        "dead_lettered_at": None,
+    }
+
+    def _insert(self, model: type[DeclarativeBase]) -> PgInsert:
+        """
+        返回支持 ON CONFLICT 的方言 INSERT 构造器。
+        PostgreSQL 与 SQLite 的 insert 构造器 API 一致，子类可按需覆盖。
+        """
+        return pg_insert(model)
+
     async def get_content_id_by_uida(
         self, project_id: str, namespace: str, keys_sha256_bytes: bytes
     ) -> str | None:
@@ -76,6 +159,25 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         except SQLAlchemyError as e:
             raise DatabaseError(f"按 UIDA 获取 content_id 失败: {e}") from e
 
+    async def get_content_ids_by_uida_bulk(
+        self, project_id: str, namespace: str, keys_sha256_list: list[bytes]
+    ) -> dict[bytes, str]:
+        """一次 IN 查询获取多个 UIDA 对应的 content_id，返回 {keys_sha256_bytes: id}。"""
+        if not keys_sha256_list:
+            return {}
+        try:
+            async with self._sessionmaker() as session:
+                stmt = select(ThContent.keys_sha256_bytes, ThContent.id).where(
+                    ThContent.project_id == project_id,
+                    ThContent.namespace == namespace,
+                    ThContent.keys_sha256_bytes.in_(set(keys_sha256_list)),
+                )
+                return {
+                    bytes(sha): cid for sha, cid in (await session.execute(stmt)).all()
+                }
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"批量获取内容 ID 失败: {e}") from e
+
     async def upsert_content(
         self,
         project_id: str,
@@ -138,6 +240,155 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         except SQLAlchemyError as e:
             raise DatabaseError(f"Upsert content 失败: {e}") from e
 
+    async def upsert_contents_bulk(
+        self, rows: list[ContentUpsert]
+    ) -> dict[tuple[str, str, bytes], str]:
+        if not rows:
+            return {}
+        # 同一语句中 ON CONFLICT DO UPDATE 不能命中同一行两次，按 UIDA 去重（后者覆盖前者）
+        unique_rows = {
+            (r.project_id, r.namespace, r.keys_sha256_bytes): r for r in rows
+        }
+        try:
+            async with self._sessionmaker.begin() as session:
+                project_ids = sorted({r.project_id for r in unique_rows.values()})
+                await session.execute(
+                    self._insert(ThProjects)
+                    .values([{"project_id": p, "display_name": p} for p in project_ids])
+                    .on_conflict_do_nothing(index_elements=["project_id"])
+                )
+
+                insert_stmt = self._insert(ThContent)
+                upsert_stmt = insert_stmt.on_conflict_do_update(
+                    index_elements=["project_id", "namespace", "keys_sha256_bytes"],
+                    set_={
+                        "source_payload_json": insert_stmt.excluded.source_payload_json,
+                        "content_version": insert_stmt.excluded.content_version,
+                        "updated_at": func.now(),
+                    },
+                ).returning(
+                    ThContent.id,
+                    ThContent.project_id,
+                    ThContent.namespace,
+                    ThContent.keys_sha256_bytes,
+                )
+                result = await session.execute(
+                    upsert_stmt,
+                    [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "project_id": r.project_id,
+                            "namespace": r.namespace,
+                            "keys_sha256_bytes": r.keys_sha256_bytes,
+                            "keys_b64": r.keys_b64,
+                            "keys_json": r.keys,
+                            "source_payload_json": r.source_payload,
+                            "content_version": r.content_version,
+                        }
+                        for r in unique_rows.values()
+                    ],
+                )
+                content_ids = {
+                    (row.project_id, row.namespace, row.keys_sha256_bytes): row.id
+                    for row in result
+                }
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"批量 upsert content 失败: {e}") from e
+
+        missing = unique_rows.keys() - content_ids.keys()
+        if missing:
+            raise DatabaseError(f"批量 upsert content 后有 {len(missing)} 条未返回 ID")
+        return content_ids
+
+    async def _select_heads(
+        self, session: AsyncSession, dims: set[HeadDim]
+    ) -> dict[HeadDim, tuple[str, int]]:
+        """按维度批量读取头记录（先用索引列粗筛，再在内存中精确匹配）。"""
+        stmt = select(
+            ThTransHead.id,
+            ThTransHead.current_no,
+            ThTransHead.project_id,
+            ThTransHead.content_id,
+            ThTransHead.target_lang,
+            ThTransHead.variant_key,
+        ).where(
+            ThTransHead.project_id.in_({d[0] for d in dims}),
+            ThTransHead.content_id.in_({d[1] for d in dims}),
+            ThTransHead.target_lang.in_({d[2] for d in dims}),
+        )
+        found: dict[HeadDim, tuple[str, int]] = {}
+        for row in await session.execute(stmt):
+            dim = (row.project_id, row.content_id, row.target_lang, row.variant_key)
+            if dim in dims:
+                found[dim] = (row.id, row.current_no)
+        return found
+
+    async def get_or_create_translation_heads_bulk(
+        self, dims: list[HeadDim]
+    ) -> dict[HeadDim, tuple[str, int]]:
+        wanted = set(dims)
+        if not wanted:
+            return {}
+        try:
+            async with self._sessionmaker.begin() as session:
+                heads = await self._select_heads(session, wanted)
+                missing = [d for d in wanted if d not in heads]
+                if missing:
+                    rev_ids = {d: str(uuid.uuid4()) for d in missing}
+                    await session.execute(
+                        insert(ThTransRev),
+                        [
+                            {
+                                "id": rev_ids[d],
+                                "project_id": d[0],
+                                "content_id": d[1],
+                                "target_lang": d[2],
+                                "variant_key": d[3],
+                                "status": TranslationStatus.DRAFT.value,
+                                "revision_no": 0,
+                            }
+                            for d in missing
+                        ],
+                    )
+                    head_rows = [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "project_id": d[0],
+                            "content_id": d[1],
+                            "target_lang": d[2],
+                            "variant_key": d[3],
+                            "current_rev_id": rev_ids[d],
+                            "current_status": TranslationStatus.DRAFT.value,
+                            "current_no": 0,
+                        }
+                        for d in missing
+                    ]
+                    # 多行 VALUES 单条语句写入（而非 executemany 逐行执行），
+                    # PostgreSQL 的语句级新草稿触发器因此每块只发送一条通知
+                    for start in range(0, len(head_rows), _MULTI_ROW_INSERT_CHUNK):
+                        await session.execute(
+                            self._insert(ThTransHead)
+                            .values(head_rows[start : start + _MULTI_ROW_INSERT_CHUNK])
+                            .on_conflict_do_nothing(
+                                index_elements=[
+                                    "project_id",
+                                    "content_id",
+                                    "target_lang",
+                                    "variant_key",
+                                ]
+                            )
+                        )
+                    # 重新读取，以覆盖并发插入导致 DO NOTHING 的行
+                    heads.update(await self._select_heads(session, set(missing)))
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"批量获取或创建翻译头记录失败: {e}") from e
+
+        if len(heads) != len(wanted):
+            raise DatabaseError(
+                f"批量创建翻译头后有 {len(wanted) - len(heads)} 条未能读取"
+            )
+        return heads
+
     async def get_or_create_translation_head(
         self,
         project_id: str,
@@ -196,6 +447,7 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         translated_payload: dict[str, Any] | None = None,
         engine_name: str | None = None,
         engine_version: str | None = None,
+        priority: int = 0,
     ) -> str:
         try:
             async with self._sessionmaker.begin() as session:
@@ -220,12 +472,190 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
                         current_rev_id=new_rev.id,
                         current_status=status.value,
                         current_no=revision_no,
+                        priority=priority,
+                        **self._HEAD_QUEUE_RESET,
                     )
                 )
                 return new_rev.id
         except SQLAlchemyError as e:
             raise DatabaseError(f"创建新翻译修订失败: {e}") from e
 
+    def _head_revisions_update(
+        self, rows: list[tuple[str, str, str, str, int, int]]
+    ) -> Update:
+        """构造把一批头记录指向新修订的单条 UPDATE ... FROM (VALUES ...) 语句。"""
+        new_revs = (
+            values(
+                column("project_id", String),
+                column("id", String),
+                column("rev_id", String),
+                column("status", translation_status_enum),
+                column("revision_no", Integer),
+                column("priority", Integer),
+                name="new_revs",
+            )
+            .data(rows)
+            # 以 CTE 形式引用：SQLite 不支持 FROM (VALUES ...) AS t (列名) 语法
+            .cte("new_revs")
+        )
+        return (
+            update(ThTransHead)
+            .where(
+                ThTransHead.project_id == new_revs.c.project_id,
+                ThTransHead.id == new_revs.c.id,
+            )
+            .values(
+                current_rev_id=new_revs.c.rev_id,
+                current_status=new_revs.c.status,
+                current_no=new_revs.c.revision_no,
+                priority=new_revs.c.priority,
+                **self._HEAD_QUEUE_RESET,
+            )
+        )
+
+    async def create_translation_revisions_bulk(
+        self, revisions: list[NewRevision]
+    ) -> list[str]:
+        if not revisions:
+            return []
+        rev_ids = [str(uuid.uuid4()) for _ in revisions]
+        try:
+            async with self._sessionmaker.begin() as session:
+                await session.execute(
+                    insert(ThTransRev),
+                    [
+                        {
+                            "id": rev_id,
+                            "project_id": r.project_id,
+                            "content_id": r.content_id,
+                            "target_lang": r.target_lang,
+                            "variant_key": r.variant_key,
+                            "status": r.status.value,
+                            "revision_no": r.revision_no,
+                            "translated_payload_json": r.translated_payload,
+                            "engine_name": r.engine_name,
+                            "engine_version": r.engine_version,
+                            "prompt_hash": r.prompt_hash,
+                            "params_hash": r.params_hash,
+                        }
+                        for rev_id, r in zip(rev_ids, revisions, strict=True)
+                    ],
+                )
+                # 同一头记录多次出现时以最后一条为准；UPDATE ... FROM 对重复匹配的取值顺序
+                # 不作保证，因此先在内存中去重
+                latest = {
+                    (r.project_id, r.head_id): (
+                        r.project_id,
+                        r.head_id,
+                        rev_id,
+                        r.status.value,
+                        r.revision_no,
+                        r.priority,
+                    )
+                    for rev_id, r in zip(rev_ids, revisions, strict=True)
+                }
+                head_rows = list(latest.values())
+                # 按块做集合式 UPDATE：每块只是一条语句，语句级的新草稿通知触发器也只触发一次
+                for start in range(0, len(head_rows), _MULTI_ROW_INSERT_CHUNK):
+                    await session.execute(
+                        self._head_revisions_update(
+                            head_rows[start : start + _MULTI_ROW_INSERT_CHUNK]
+                        )
+                    )
+                tm_ids = await self._upsert_tm_entries(
+                    session, [r.tm_entry for r in revisions if r.tm_entry]
+                )
+                links = []
+                for rev_id, r in zip(rev_ids, revisions, strict=True):
+                    tm_id = r.tm_id or (
+                        tm_ids[self._tm_key(r.tm_entry)] if r.tm_entry else None
+                    )
+                    if tm_id:
+                        links.append(
+                            {
+                                "id": str(uuid.uuid4()),
+                                "project_id": r.project_id,
+                                "translation_rev_id": rev_id,
+                                "tm_id": tm_id,
+                            }
+                        )
+                if links:
+                    await session.execute(
+                        self._insert(ThTmLinks).on_conflict_do_nothing(
+                            index_elements=["project_id", "translation_rev_id", "tm_id"]
+                        ),
+                        links,
+                    )
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"批量创建翻译修订失败: {e}") from e
+        return rev_ids
+
+    @staticmethod
+    def _tm_key(entry: TmUpsert) -> tuple[Any, ...]:
+        """TM 复用键（与 uq_tm_reuse_key 一致）。"""
+        return (
+            entry.project_id,
+            entry.namespace,
+            entry.reuse_sha256_bytes,
+            entry.source_lang,
+            entry.target_lang,
+            entry.variant_key,
+            entry.policy_version,
+            entry.hash_algo_version,
+        )
+
+    async def _upsert_tm_entries(
+        self, session: AsyncSession, entries: list[TmUpsert]
+    ) -> dict[tuple[Any, ...], str]:
+        """在调用方事务内多行 upsert TM 条目，返回 {复用键: tm_id}。"""
+        if not entries:
+            return {}
+        # 同一语句中 ON CONFLICT DO UPDATE 不能命中同一行两次，按复用键去重（后者覆盖前者）
+        unique_entries = {self._tm_key(e): e for e in entries}
+        now = datetime.now(timezone.utc)
+        insert_stmt = self._insert(ThTm)
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[
+                "project_id",
+                "namespace",
+                "reuse_sha256_bytes",
+                "source_lang",
+                "target_lang",
+                "variant_key",
+                "policy_version",
+                "hash_algo_version",
+            ],
+            set_={
+                "translated_json": insert_stmt.excluded.translated_json,
+                "quality_score": insert_stmt.excluded.quality_score,
+                "last_used_at": insert_stmt.excluded.last_used_at,
+                "updated_at": func.now(),
+            },
+        ).returning(ThTm.id, sort_by_parameter_order=True)
+        result = await session.execute(
+            upsert_stmt,
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "project_id": e.project_id,
+                    "namespace": e.namespace,
+                    "reuse_sha256_bytes": e.reuse_sha256_bytes,
+                    "source_lang": e.source_lang,
+                    "target_lang": e.target_lang,
+                    "variant_key": e.variant_key,
+                    "policy_version": e.policy_version,
+                    "hash_algo_version": e.hash_algo_version,
+                    "source_text_json": e.source_text_json,
+                    "translated_json": e.translated_json,
+                    "quality_score": e.quality_score,
+                    "last_used_at": now,
+                }
+                for e in unique_entries.values()
+            ],
+        )
+        # RETURNING 按参数顺序返回（目标语言可能被触发器归一化，故不按返回列回配）
+        return dict(zip(unique_entries, result.scalars().all(), strict=True))
+
     async def find_tm_entry(
         self,
         project_id: str,
@@ -254,6 +684,50 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         except SQLAlchemyError as e:
             raise DatabaseError(f"查找 TM 条目失败: {e}") from e
 
+    async def find_tm_entries_bulk(
+        self,
+        probes: list[TmProbe],
+        policy_version: int,
+        hash_algo_version: int,
+    ) -> dict[TmProbe, tuple[str, dict[str, Any]]]:
+        wanted = set(probes)
+        if not wanted:
+            return {}
+        try:
+            async with self._sessionmaker() as session:
+                stmt = select(
+                    ThTm.id,
+                    ThTm.translated_json,
+                    ThTm.project_id,
+                    ThTm.namespace,
+                    ThTm.reuse_sha256_bytes,
+                    ThTm.source_lang,
+                    ThTm.target_lang,
+                    ThTm.variant_key,
+                ).where(
+                    ThTm.project_id.in_({p[0] for p in wanted}),
+                    ThTm.namespace.in_({p[1] for p in wanted}),
+                    ThTm.reuse_sha256_bytes.in_({p[2] for p in wanted}),
+                    ThTm.target_lang.in_({p[4] for p in wanted}),
+                    ThTm.policy_version == policy_version,
+                    ThTm.hash_algo_version == hash_algo_version,
+                )
+                hits: dict[TmProbe, tuple[str, dict[str, Any]]] = {}
+                for row in await session.execute(stmt):
+                    probe = (
+                        row.project_id,
+                        row.namespace,
+                        row.reuse_sha256_bytes,
+                        row.source_lang,
+                        row.target_lang,
+                        row.variant_key,
+                    )
+                    if probe in wanted:
+                        hits[probe] = (row.id, row.translated_json)
+                return hits
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"批量查找 TM 条目失败: {e}") from e
+
     async def upsert_tm_entry(
         self,
         project_id: str,
@@ -320,6 +794,41 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         except SQLAlchemyError as e:
             raise DatabaseError(f"链接 TM 失败: {e}") from e
 
+    async def _invalidate_resolve_cache(
+        self, session: AsyncSession, content_id: str
+    ) -> None:
+        """
+        在发布/拒绝事务内清除该内容的全部持久化解析缓存并通知其他进程。
+        PG 的发布触发器只精准删除同一 (语言, 变体) 的条目，而回退结果
+        可能缓存在其他语言/变体下，因此这里按内容整体清除。
+        """
+        await session.execute(
+            delete(ThResolveCache).where(ThResolveCache.content_id == content_id)
+        )
+        await self._notify_resolve_invalidated(session, content_id)
+
+    async def _notify_resolve_invalidated(
+        self, session: AsyncSession, content_id: str
+    ) -> None:
+        """[钩子] 在发布/拒绝事务内通知其他进程使解析缓存失效。默认不做任何事。"""
+        return None
+
+    async def subscribe_resolve_invalidations(
+        self,
+        callback: Callable[[str], None],
+        on_reset: Callable[[], None] | None = None,
+    ) -> None:
+        """[通用实现] 不支持跨进程通知的数据库无需订阅，进程内失效由 Coordinator 完成。"""
+        return None
+
+    async def get_revision_content_id(self, revision_id: str) -> str | None:
+        try:
+            async with self._sessionmaker() as session:
+                stmt = select(ThTransRev.content_id).where(ThTransRev.id == revision_id)
+                return (await session.execute(stmt)).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"获取修订所属内容失败: {e}") from e
+
     async def publish_revision(self, revision_id: str) -> bool:
         try:
             async with self._sessionmaker.begin() as session:
@@ -356,6 +865,8 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
                     )
                 )
                 result = await session.execute(update_head_stmt)
+                if result.rowcount > 0:
+                    await self._invalidate_resolve_cache(session, rev.content_id)
                 return result.rowcount > 0
         except IntegrityError:
             logger.warning(
@@ -392,6 +903,7 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
                         )
                         .values(current_status=TranslationStatus.REJECTED.value)
                     )
+                    await self._invalidate_resolve_cache(session, rev.content_id)
                 return result.rowcount > 0
         except SQLAlchemyError as e:
             raise DatabaseError(f"拒绝修订失败: {e}") from e
@@ -422,6 +934,238 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         except SQLAlchemyError as e:
             raise DatabaseError(f"获取已发布翻译失败: {e}") from e
 
+    def _fallback_locales(self, project_id: str, locales: list[str]) -> Select[Any]:
+        """
+        [钩子] 将 fallback_order 展开为 (req_lang, lang, prio) 行，prio 从 2 起按数组顺序递增。
+        默认使用 PostgreSQL 的 jsonb_array_elements_text ... WITH ORDINALITY。
+        """
+        elems = func.jsonb_array_elements_text(
+            ThLocalesFallbacks.fallback_order
+        ).table_valued("value", with_ordinality="ordinality")
+        return (
+            select(
+                ThLocalesFallbacks.locale.label("req_lang"),
+                elems.c.value.label("lang"),
+                (elems.c.ordinality + 1).label("prio"),
+            )
+            .select_from(ThLocalesFallbacks)
+            .join(elems, true())
+            .where(
+                ThLocalesFallbacks.project_id == project_id,
+                ThLocalesFallbacks.locale.in_(locales),
+            )
+        )
+
+    def _resolution_candidates(
+        self, project_id: str, target_langs: list[str], variant_key: str
+    ) -> CTE:
+        """
+        构建候选 CTE (req_lang, lang, variant_key, prio)：
+        精确变体为 0，默认变体为 1，回退语言（仅默认变体）从 2 起。
+        """
+        parts: list[Select[Any]] = []
+        for lang in target_langs:
+            parts.append(
+                select(
+                    literal(lang).label("req_lang"),
+                    literal(lang).label("lang"),
+                    literal(variant_key).label("variant_key"),
+                    literal(0).label("prio"),
+                )
+            )
+            if variant_key != "-":
+                parts.append(
+                    select(literal(lang), literal(lang), literal("-"), literal(1))
+                )
+        fallbacks = self._fallback_locales(project_id, target_langs).subquery()
+        parts.append(
+            select(
+                fallbacks.c.req_lang, fallbacks.c.lang, literal("-"), fallbacks.c.prio
+            )
+        )
+        return union_all(*parts).cte("candidates")
+
+    def _resolution_select(
+        self, project_id: str, content_ids: list[str], candidates: CTE
+    ) -> Select[Any]:
+        return (
+            select(
+                ThTransHead.content_id,
+                candidates.c.req_lang,
+                candidates.c.prio,
+                ThTransHead.published_rev_id,
+                ThTransRev.translated_payload_json,
+                candidates.c.lang,
+            )
+            .select_from(candidates)
+            .join(
+                ThTransHead,
+                and_(
+                    ThTransHead.project_id == project_id,
+                    ThTransHead.content_id.in_(content_ids),
+                    ThTransHead.target_lang == candidates.c.lang,
+                    ThTransHead.variant_key == candidates.c.variant_key,
+                    ThTransHead.published_rev_id.is_not(None),
+                ),
+            )
+            .join(
+                ThTransRev,
+                and_(
+                    ThTransRev.project_id == ThTransHead.project_id,
+                    ThTransRev.id == ThTransHead.published_rev_id,
+                ),
+            )
+        )
+
+    async def resolve_published_translation(
+        self, project_id: str, content_id: str, target_lang: str, variant_key: str
+    ) -> tuple[str, dict[str, Any], str] | None:
+        """
+        单条语句完成 变体 → 默认变体 → 回退语言 的解析：
+        候选 (语言, 变体, 优先级) 以 UNION ALL 组成 CTE，与头表连接后取优先级最小者。
+        """
+        candidates = self._resolution_candidates(project_id, [target_lang], variant_key)
+        stmt = (
+            self._resolution_select(project_id, [content_id], candidates)
+            .order_by(candidates.c.prio)
+            .limit(1)
+        )
+        try:
+            async with self._sessionmaker() as session:
+                row = (await session.execute(stmt)).first()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"解析已发布翻译失败: {e}") from e
+        if row is None or row.translated_payload_json is None:
+            return None
+        return row.published_rev_id, row.translated_payload_json, row.lang
+
+    async def resolve_published_translations_bulk(
+        self,
+        project_id: str,
+        content_ids: list[str],
+        target_langs: list[str],
+        variant_key: str = "-",
+    ) -> dict[tuple[str, str], tuple[str, dict[str, Any], str]]:
+        """
+        批量版本：一条语句解析 content_ids × target_langs，
+        使用 ROW_NUMBER() 为每个 (content_id, 目标语言) 选出优先级最高的已发布修订。
+        """
+        if not content_ids or not target_langs:
+            return {}
+        candidates = self._resolution_candidates(project_id, target_langs, variant_key)
+        ranked = (
+            self._resolution_select(project_id, content_ids, candidates)
+            .add_columns(
+                func.row_number()
+                .over(
+                    partition_by=(ThTransHead.content_id, candidates.c.req_lang),
+                    order_by=candidates.c.prio,
+                )
+                .label("rn")
+            )
+            .subquery()
+        )
+        stmt = select(
+            ranked.c.content_id,
+            ranked.c.req_lang,
+            ranked.c.published_rev_id,
+            ranked.c.translated_payload_json,
+            ranked.c.lang,
+        ).where(ranked.c.rn == 1)
+        try:
+            async with self._sessionmaker() as session:
+                rows = (await session.execute(stmt)).all()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"批量解析已发布翻译失败: {e}") from e
+        return {
+            (r.content_id, r.req_lang): (
+                r.published_rev_id,
+                r.translated_payload_json,
+                r.lang,
+            )
+            for r in rows
+            if r.translated_payload_json is not None
+        }
+
+    async def get_cached_resolution(
+        self, content_id: str, target_lang: str, variant_key: str
+    ) -> tuple[str, dict[str, Any], str | None] | None:
+        try:
+            async with self._sessionmaker() as session:
+                stmt = (
+                    select(
+                        ThResolveCache.resolved_rev,
+                        ThTransRev.translated_payload_json,
+                        ThResolveCache.origin_lang,
+                    )
+                    .join(
+                        ThTransRev,
+                        and_(
+                            ThTransRev.project_id == ThResolveCache.project_id,
+                            ThTransRev.id == ThResolveCache.resolved_rev,
+                        ),
+                    )
+                    .where(
+                        ThResolveCache.content_id == content_id,
+                        ThResolveCache.target_lang == target_lang,
+                        ThResolveCache.variant_key == variant_key,
+                        ThResolveCache.expires_at > datetime.now(timezone.utc),
+                    )
+                )
+                row = (await session.execute(stmt)).first()
+                if row is None or row.translated_payload_json is None:
+                    return None
+                return row.resolved_rev, row.translated_payload_json, row.origin_lang
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"读取解析缓存失败: {e}") from e
+
+    async def put_cached_resolution(
+        self,
+        *,
+        project_id: str,
+        content_id: str,
+        target_lang: str,
+        variant_key: str,
+        resolved_rev: str,
+        origin_lang: str | None,
+        ttl_seconds: int,
+    ) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        stmt = self._insert(ThResolveCache).values(
+            project_id=project_id,
+            content_id=content_id,
+            target_lang=target_lang,
+            variant_key=variant_key,
+            resolved_rev=resolved_rev,
+            origin_lang=origin_lang,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["content_id", "target_lang", "variant_key"],
+            set_={
+                "resolved_rev": stmt.excluded.resolved_rev,
+                "origin_lang": stmt.excluded.origin_lang,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        try:
+            async with self._sessionmaker.begin() as session:
+                await session.execute(stmt)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"写入解析缓存失败: {e}") from e
+
+    async def purge_expired_resolve_cache(self) -> int:
+        try:
+            async with self._sessionmaker.begin() as session:
+                result = await session.execute(
+                    delete(ThResolveCache).where(
+                        ThResolveCache.expires_at <= datetime.now(timezone.utc)
+                    )
+                )
+                return _rowcount(result)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"清理过期解析缓存失败: {e}") from e
+
     async def get_fallback_order(
         self, project_id: str, locale: str
     ) -> list[str] | None:
@@ -435,6 +1179,544 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
         except SQLAlchemyError as e:
             raise DatabaseError(f"获取回退顺序失败: {e}") from e
 
+    def _claimable_drafts_clause(self, now: datetime) -> ColumnElement[bool]:
+        """
+        可被领取的草稿：状态为 draft、未进入死信队列、已到重试时间，
+        且未被持有租约或租约已过期。
+        """
+        return and_(
+            ThTransHead.current_status == TranslationStatus.DRAFT.value,
+            ThTransHead.dead_lettered_at.is_(None),
+            or_(
+                ThTransHead.next_attempt_at.is_(None),
+                ThTransHead.next_attempt_at <= now,
+            ),
+            or_(
+                ThTransHead.lease_expires_at.is_(None),
+                ThTransHead.lease_expires_at < now,
+            ),
+        )
+
+    def _draft_order_key(self) -> ColumnElement[Any]:
+        """[可覆盖] 草稿队列的排序列，亦即键集分页游标的第一分量。"""
+        return ThTransHead.updated_at.expression
+
+    def _draft_candidates(
+        self,
+        now: datetime,
+        limit: int,
+        target_langs: list[str] | None = None,
+        after: DraftCursor | None = None,
+        project_id: str | None = None,
+        priority: int | None = None,
+    ) -> Select[Any]:
+        """
+        草稿队列的候选查询。条件与排序与部分索引对齐：
+        - 不限语言时走 ix_head_draft_queue (updated_at, id)；
+        - 只处理一种语言时以等值条件走 ix_head_draft_queue_lang
+          (target_lang, updated_at, id)，无需在全部草稿中逐行过滤语言；
+        - 调度器按 (项目, 通道) 领取时走 ix_head_draft_queue_project。
+        """
+        order_key = self._draft_order_key()
+        candidates = select(
+            ThTransHead.project_id, ThTransHead.id, order_key.label("cursor_key")
+        ).where(self._claimable_drafts_clause(now))
+        if target_langs and len(target_langs) == 1:
+            candidates = candidates.where(ThTransHead.target_lang == target_langs[0])
+        elif target_langs:
+            candidates = candidates.where(ThTransHead.target_lang.in_(target_langs))
+        if project_id is not None:
+            candidates = candidates.where(ThTransHead.project_id == project_id)
+        if priority is not None:
+            candidates = candidates.where(ThTransHead.priority == priority)
+        if after is not None:
+            candidates = candidates.where(
+                tuple_(order_key, ThTransHead.id) > tuple_(*(literal(v) for v in after))
+            )
+        return (
+            candidates.order_by(order_key, ThTransHead.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def claim_drafts(
+        self,
+        limit: int,
+        *,
+        target_langs: list[str] | None = None,
+        project_id: str | None = None,
+        priority: int | None = None,
+        after: DraftCursor | None = None,
+    ) -> tuple[list[ContentItem], DraftCursor | None]:
+        """
+        在同一事务中按 (updated_at, id) 键集分页选出 after 之后的一批候选草稿
+        （见 _draft_candidates），再以单条 UPDATE 写入租约。
+        返回领取到的任务与本页最后一个候选的游标；没有候选时游标为 None。
+        SQLite 会忽略 FOR UPDATE 子句，其写事务本身已是串行的。
+        """
+        now = datetime.now(timezone.utc)
+        candidates = self._draft_candidates(
+            now, limit, target_langs, after, project_id=project_id, priority=priority
+        )
+        try:
+            return await self._claim_candidates(candidates, now)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"领取草稿任务失败: {e}") from e
+
+    async def _claim_candidates(
+        self, candidates: Select[Any], now: datetime
+    ) -> tuple[list[ContentItem], DraftCursor | None]:
+        async with self._sessionmaker.begin() as session:
+            rows = (await session.execute(candidates)).all()
+            if not rows:
+                return [], None
+            claim_stmt = (
+                update(ThTransHead)
+                .where(
+                    tuple_(ThTransHead.project_id, ThTransHead.id).in_(
+                        [(r.project_id, r.id) for r in rows]
+                    ),
+                    self._claimable_drafts_clause(now),
+                )
+                .values(
+                    lease_owner=self.lease_owner,
+                    lease_expires_at=now + timedelta(seconds=self.lease_ttl),
+                )
+                .returning(ThTransHead)
+                .execution_options(synchronize_session=False)
+            )
+            heads = list((await session.execute(claim_stmt)).scalars().all())
+            items = await self._build_content_items_from_orm(session, heads)
+            return items, (rows[-1].cursor_key, rows[-1].id)
+
+    async def stream_draft_translations(
+        self,
+        batch_size: int,
+        limit: int | None = None,
+        target_langs: list[str] | None = None,
+    ) -> AsyncGenerator[list[ContentItem], None]:
+        """
+        逐批领取草稿。每批在独立事务中领取并提交租约后才交给调用方，
+        因此多个 Worker 并发运行时不会拿到同一条草稿。
+        指定 target_langs 时只领取这些目标语言的草稿。
+
+        批次之间以 (updated_at, id) 游标推进，每批只读取一页候选，
+        内存占用与积压规模无关，也不会反复扫描已被租约或退避跳过的行。
+        领取会刷新 updated_at，租约在本轮流式读取中过期的草稿会排到游标之后再次被领取。
+        """
+        processed_count = 0
+        cursor: DraftCursor | None = None
+        while limit is None or processed_count < limit:
+            current_batch_size = (
+                min(batch_size, limit - processed_count)
+                if limit is not None
+                else batch_size
+            )
+            if current_batch_size <= 0:
+                break
+            items, cursor = await self.claim_drafts(
+                current_batch_size, target_langs=target_langs, after=cursor
+            )
+            if cursor is None:
+                break
+            # 候选在选出后被并发修改时，本页可能一条也未领取到，但游标仍然前进
+            if not items:
+                continue
+            yield items
+            processed_count += len(items)
+
+    async def get_draft_lanes(
+        self, target_langs: list[str] | None = None
+    ) -> dict[str, int]:
+        """
+        对每个项目探测其可领取草稿的最高优先级通道。
+        以 th_projects 驱动的相关子查询实现，每个项目只需在
+        ix_head_draft_queue_project 上做一次定位，代价与积压规模无关。
+        """
+        now = datetime.now(timezone.utc)
+        top = select(func.max(ThTransHead.priority)).where(
+            ThTransHead.project_id == ThProjects.project_id,
+            self._claimable_drafts_clause(now),
+        )
+        if target_langs:
+            top = top.where(ThTransHead.target_lang.in_(target_langs))
+        stmt = select(ThProjects.project_id, top.scalar_subquery().label("priority"))
+        try:
+            async with self._sessionmaker() as session:
+                rows = (await session.execute(stmt)).all()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"探测草稿优先级通道失败: {e}") from e
+        return {r.project_id: r.priority for r in rows if r.priority is not None}
+
+    async def get_draft_queue_depths(
+        self, target_langs: list[str] | None = None
+    ) -> list[DraftQueueDepth]:
+        now = datetime.now(timezone.utc)
+        leased = and_(
+            ThTransHead.lease_owner.is_not(None), ThTransHead.lease_expires_at >= now
+        )
+        stmt = (
+            select(
+                ThTransHead.project_id,
+                ThTransHead.priority,
+                func.count()
+                .filter(self._claimable_drafts_clause(now))
+                .label("pending"),
+                func.count().filter(leased).label("leased"),
+            )
+            .where(
+                ThTransHead.current_status == TranslationStatus.DRAFT.value,
+                ThTransHead.dead_lettered_at.is_(None),
+            )
+            .group_by(ThTransHead.project_id, ThTransHead.priority)
+            .order_by(ThTransHead.project_id, ThTransHead.priority.desc())
+        )
+        if target_langs:
+            stmt = stmt.where(ThTransHead.target_lang.in_(target_langs))
+        try:
+            async with self._sessionmaker() as session:
+                rows = (await session.execute(stmt)).all()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"统计草稿积压失败: {e}") from e
+        return [
+            DraftQueueDepth(
+                project_id=r.project_id,
+                priority=r.priority,
+                pending=r.pending,
+                leased=r.leased,
+            )
+            for r in rows
+        ]
+
+    async def renew_leases(self, heads: list[HeadKey]) -> int:
+        """为本 Worker 仍持有的租约续期，返回成功续期的行数。"""
+        if not heads:
+            return 0
+        try:
+            async with self._sessionmaker.begin() as session:
+                result = await session.execute(
+                    update(ThTransHead)
+                    .where(
+                        tuple_(ThTransHead.project_id, ThTransHead.id).in_(heads),
+                        ThTransHead.lease_owner == self.lease_owner,
+                    )
+                    .values(
+                        lease_expires_at=datetime.now(timezone.utc)
+                        + timedelta(seconds=self.lease_ttl)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                return _rowcount(result)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"续期租约失败: {e}") from e
+
+    async def release_leases(self, heads: list[HeadKey]) -> int:
+        """主动释放本 Worker 持有的租约，使草稿可立即被重新领取。"""
+        if not heads:
+            return 0
+        try:
+            async with self._sessionmaker.begin() as session:
+                result = await session.execute(
+                    update(ThTransHead)
+                    .where(
+                        tuple_(ThTransHead.project_id, ThTransHead.id).in_(heads),
+                        ThTransHead.lease_owner == self.lease_owner,
+                    )
+                    .values(lease_owner=None, lease_expires_at=None)
+                    .execution_options(synchronize_session=False)
+                )
+                return _rowcount(result)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"释放租约失败: {e}") from e
+
+    async def release_expired_leases(self) -> int:
+        """回收已过期的租约（通常来自崩溃的 Worker），返回回收的行数。"""
+        try:
+            async with self._sessionmaker.begin() as session:
+                result = await session.execute(
+                    update(ThTransHead)
+                    .where(
+                        ThTransHead.lease_owner.is_not(None),
+                        ThTransHead.lease_expires_at < datetime.now(timezone.utc),
+                    )
+                    .values(lease_owner=None, lease_expires_at=None)
+                    .execution_options(synchronize_session=False)
+                )
+                return _rowcount(result)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"回收过期租约失败: {e}") from e
+
+    async def record_failed_attempts(self, failures: list[FailedAttempt]) -> int:
+        """
+        在单个事务内记录失败尝试：更新头记录的重试计数与下次尝试时间并释放租约；
+        不再重试的条目写入死信队列。仅当头记录仍指向失败的修订时才会更新。
+        返回进入死信队列的条目数。
+        """
+        if not failures:
+            return 0
+        now = datetime.now(timezone.utc)
+        head_table = cast(Table, ThTransHead.__table__)
+        stmt = (
+            update(head_table)
+            .where(
+                head_table.c.project_id == bindparam("b_project_id"),
+                head_table.c.id == bindparam("b_head_id"),
+                head_table.c.current_rev_id == bindparam("b_rev_id"),
+            )
+            .values(
+                attempt_count=bindparam("b_attempt_count"),
+                next_attempt_at=bindparam("b_next_attempt_at"),
+                last_error=bindparam("b_last_error"),
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        retries = [f for f in failures if f.next_attempt_at is not None]
+        dead = [f for f in failures if f.next_attempt_at is None]
+        try:
+            async with self._sessionmaker.begin() as session:
+                if retries:
+                    await session.execute(
+                        stmt,
+                        [
+                            {
+                                "b_project_id": f.project_id,
+                                "b_head_id": f.head_id,
+                                "b_rev_id": f.translation_rev_id,
+                                "b_attempt_count": f.attempt_count,
+                                "b_next_attempt_at": f.next_attempt_at,
+                                "b_last_error": f.error_message,
+                            }
+                            for f in retries
+                        ],
+                    )
+                # 头记录已转到新修订时守卫条件不匹配，不应为其写入死信；
+                # 由 RETURNING 得知哪些守卫更新命中
+                matched: set[tuple[str, str]] = set()
+                for start in range(0, len(dead), _MULTI_ROW_INSERT_CHUNK):
+                    result = await session.execute(
+                        self._dead_letter_heads_update(
+                            dead[start : start + _MULTI_ROW_INSERT_CHUNK], now
+                        )
+                    )
+                    matched.update((row.project_id, row.id) for row in result)
+                dead = [f for f in dead if (f.project_id, f.head_id) in matched]
+                if dead:
+                    await session.execute(
+                        insert(ThDeadLetters),
+                        [
+                            {
+                                "id": str(uuid.uuid4()),
+                                "project_id": f.project_id,
+                                "head_id": f.head_id,
+                                "content_id": f.content_id,
+                                "target_lang": f.target_lang,
+                                "variant_key": f.variant_key,
+                                "translation_rev_id": f.translation_rev_id,
+                                "attempt_count": f.attempt_count,
+                                "error_message": f.error_message,
+                                "is_retryable": f.is_retryable,
+                                "engine_name": f.engine_name,
+                            }
+                            for f in dead
+                        ],
+                    )
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"记录失败尝试失败: {e}") from e
+        return len(dead)
+
+    def _dead_letter_heads_update(
+        self, failures: list[FailedAttempt], now: datetime
+    ) -> Update:
+        """构造把一批头记录标记为死信的单条守卫 UPDATE，RETURNING 命中行的 (project_id, id)。"""
+        head_table = cast(Table, ThTransHead.__table__)
+        dead_rows = (
+            values(
+                column("project_id", String),
+                column("id", String),
+                column("rev_id", String),
+                column("attempt_count", Integer),
+                column("last_error", Text),
+                name="dead_rows",
+            )
+            .data(
+                [
+                    (
+                        f.project_id,
+                        f.head_id,
+                        f.translation_rev_id,
+                        f.attempt_count,
+                        f.error_message,
+                    )
+                    for f in failures
+                ]
+            )
+            .cte("dead_rows")
+        )
+        return (
+            update(head_table)
+            .where(
+                head_table.c.project_id == dead_rows.c.project_id,
+                head_table.c.id == dead_rows.c.id,
+                head_table.c.current_rev_id == dead_rows.c.rev_id,
+            )
+            .values(
+                attempt_count=dead_rows.c.attempt_count,
+                next_attempt_at=None,
+                last_error=dead_rows.c.last_error,
+                dead_lettered_at=now,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .returning(head_table.c.project_id, head_table.c.id)
+        )
+
+    def _dead_letters_clause(
+        self, ids: list[str] | None, project_id: str | None
+    ) -> list[ColumnElement[bool]]:
+        clauses: list[ColumnElement[bool]] = []
+        if ids is not None:
+            clauses.append(ThDeadLetters.id.in_(ids))
+        if project_id is not None:
+            clauses.append(ThDeadLetters.project_id == project_id)
+        return clauses
+
+    async def list_dead_letters(
+        self, project_id: str | None = None, limit: int = 50
+    ) -> list[DeadLetter]:
+        """按时间倒序列出死信记录。"""
+        try:
+            async with self._sessionmaker() as session:
+                stmt = (
+                    select(ThDeadLetters)
+                    .where(*self._dead_letters_clause(None, project_id))
+                    .order_by(ThDeadLetters.created_at.desc())
+                    .limit(limit)
+                )
+                rows = (await session.execute(stmt)).scalars().all()
+                return [
+                    DeadLetter(
+                        id=r.id,
+                        project_id=r.project_id,
+                        head_id=r.head_id,
+                        content_id=r.content_id,
+                        target_lang=r.target_lang,
+                        variant_key=r.variant_key,
+                        translation_rev_id=r.translation_rev_id,
+                        attempt_count=r.attempt_count,
+                        error_message=r.error_message,
+                        is_retryable=r.is_retryable,
+                        engine_name=r.engine_name,
+                        created_at=r.created_at,
+                    )
+                    for r in rows
+                ]
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"查询死信队列失败: {e}") from e
+
+    async def replay_dead_letters(
+        self, ids: list[str] | None = None, project_id: str | None = None
+    ) -> int:
+        """
+        将死信重新放回草稿队列（清零重试计数）并删除对应记录，返回重新入队的头记录数。
+        与清除一样只重置仍处于该死信状态的头记录：已被重新请求的头记录可能正被 Worker 持有租约。
+        """
+        clauses = self._dead_letters_clause(ids, project_id)
+        try:
+            async with self._sessionmaker.begin() as session:
+                rows = (
+                    await session.execute(
+                        delete(ThDeadLetters)
+                        .where(*clauses)
+                        .returning(
+                            ThDeadLetters.project_id,
+                            ThDeadLetters.head_id,
+                            ThDeadLetters.translation_rev_id,
+                        )
+                    )
+                ).all()
+                keys = {(r.project_id, r.head_id, r.translation_rev_id) for r in rows}
+                if not keys:
+                    return 0
+                reset = (
+                    await session.execute(
+                        update(ThTransHead)
+                        .where(
+                            tuple_(
+                                ThTransHead.project_id,
+                                ThTransHead.id,
+                                ThTransHead.current_rev_id,
+                            ).in_(keys),
+                            ThTransHead.current_status == TranslationStatus.DRAFT.value,
+                            ThTransHead.dead_lettered_at.is_not(None),
+                        )
+                        .values(**self._HEAD_QUEUE_RESET)
+                        .returning(ThTransHead.project_id, ThTransHead.id)
+                        .execution_options(synchronize_session=False)
+                    )
+                ).all()
+                return len(reset)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"重放死信失败: {e}") from e
+
+    async def purge_dead_letters(
+        self, ids: list[str] | None = None, project_id: str | None = None
+    ) -> int:
+        """
+        删除死信记录，并将仍处于死信状态的头记录及其修订标记为已拒绝（终态），
+        避免草稿在没有死信记录可供重放的情况下永久搁置。返回删除的记录数。
+        """
+        try:
+            async with self._sessionmaker.begin() as session:
+                rows = (
+                    await session.execute(
+                        delete(ThDeadLetters)
+                        .where(*self._dead_letters_clause(ids, project_id))
+                        .returning(
+                            ThDeadLetters.project_id,
+                            ThDeadLetters.head_id,
+                            ThDeadLetters.translation_rev_id,
+                        )
+                    )
+                ).all()
+                keys = {(r.project_id, r.head_id, r.translation_rev_id) for r in rows}
+                heads = (
+                    (
+                        await session.execute(
+                            select(ThTransHead.id, ThTransHead.current_rev_id).where(
+                                tuple_(
+                                    ThTransHead.project_id,
+                                    ThTransHead.id,
+                                    ThTransHead.current_rev_id,
+                                ).in_(keys),
+                                ThTransHead.dead_lettered_at.is_not(None),
+                            )
+                        )
+                    ).all()
+                    if keys
+                    else []
+                )
+                if heads:
+                    # 头记录与当前修订的状态须保持一致：先更新修订，再更新头记录
+                    await session.execute(
+                        update(ThTransRev)
+                        .where(ThTransRev.id.in_([h.current_rev_id for h in heads]))
+                        .values(status=TranslationStatus.REJECTED.value)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.execute(
+                        update(ThTransHead)
+                        .where(ThTransHead.id.in_([h.id for h in heads]))
+                        .values(
+                            current_status=TranslationStatus.REJECTED.value,
+                            **self._HEAD_QUEUE_RESET,
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                return len(rows)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"清除死信失败: {e}") from e
+
     async def _build_content_items_from_orm(
         self, session: AsyncSession, head_results: list[ThTransHead]
     ) -> list[ContentItem]:
@@ -461,6 +1743,7 @@ class BasePersistenceHandler(PersistenceHandler, ABC):
                         source_lang=None,
                         target_lang=head.target_lang,
                         variant_key=head.variant_key,
+                        attempt_count=head.attempt_count,
                     )
                 )
         return items
@@ -1,10 +1,11 @@
 # trans_hub/persistence/postgres.py
 # [v2.4 Refactor] 更新 PostgreSQL 实现，适配 rev/head 模型。
-# 核心优化：在 stream_draft_translations 中使用 SKIP LOCKED 查询 th_trans_head。
+# 草稿领取（基类 stream_draft_translations）在 PostgreSQL 下使用 FOR UPDATE SKIP LOCKED 并写入租约。
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncGenerator
+import json
+from collections.abc import AsyncGenerator, Callable
 
 try:
     import asyncpg
@@ -12,28 +13,47 @@ except ImportError:
     asyncpg = None
 
 import structlog
-from sqlalchemy import select, text
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from trans_hub.core.exceptions import DatabaseError
-from trans_hub.core.types import ContentItem, TranslationStatus
-from trans_hub.db.schema import ThTransHead
-from trans_hub.persistence.base import BasePersistenceHandler
+from trans_hub.core.types import DraftWakeup
+from trans_hub.persistence.base import (
+    DEFAULT_LEASE_TTL_SECONDS,
+    BasePersistenceHandler,
+)
 
 logger = structlog.get_logger(__name__)
 
+# 解析缓存失效监听连接断开后的重连退避（秒）
+_LISTENER_RECONNECT_INITIAL = 1.0
+_LISTENER_RECONNECT_MAX = 30.0
+
 
 class PostgresPersistenceHandler(BasePersistenceHandler):
     """`PersistenceHandler` 协议的 PostgreSQL 实现。"""
 
     SUPPORTS_NOTIFICATIONS = True
     NOTIFICATION_CHANNEL = "new_translation_draft"
+    RESOLVE_INVALIDATION_CHANNEL = "th_resolve_invalidate"
 
-    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession], dsn: str):
-        super().__init__(sessionmaker, is_sqlite=False)
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        dsn: str,
+        lease_ttl: float = DEFAULT_LEASE_TTL_SECONDS,
+    ):
+        super().__init__(sessionmaker, is_sqlite=False, lease_ttl=lease_ttl)
         self.dsn = dsn
         self._notification_listener_conn: asyncpg.Connection | None = None
-        self._notification_queue: asyncio.Queue[str] | None = None
+        self._draft_wakeup: asyncio.Event | None = None
+        self._pending_notifications = 0
+        self._pending_projects: set[str] = set()
+        self._pending_langs: set[str] | None = set()
+        self._invalidation_listener_conn: asyncpg.Connection | None = None
+        self._invalidation_callbacks: list[Callable[[str], None]] = []
+        self._invalidation_reset_callbacks: list[Callable[[], None]] = []
+        self._invalidation_reconnect_task: asyncio.Task[None] | None = None
 
     async def connect(self) -> None:
         try:
@@ -52,50 +72,133 @@ class PostgresPersistenceHandler(BasePersistenceHandler):
             and not self._notification_listener_conn.is_closed()
         ):
             await self._notification_listener_conn.close()
+        if (
+            self._invalidation_reconnect_task
+            and not self._invalidation_reconnect_task.done()
+        ):
+            self._invalidation_reconnect_task.cancel()
+        self._invalidation_reconnect_task = None
+        # 先解除引用，终止监听器据此区分主动关闭与意外断开
+        invalidation_conn = self._invalidation_listener_conn
+        self._invalidation_listener_conn = None
+        if invalidation_conn and not invalidation_conn.is_closed():
+            await invalidation_conn.close()
         await super().close()
         logger.info("PostgreSQL 持久层资源已完全关闭")
 
-    async def stream_draft_translations(
+    async def _notify_resolve_invalidated(
+        self, session: AsyncSession, content_id: str
+    ) -> None:
+        """[覆盖] pg_notify 随事务提交才会投递，因此监听方不会读到旧数据。"""
+        await session.execute(
+            select(func.pg_notify(self.RESOLVE_INVALIDATION_CHANNEL, content_id))
+        )
+
+    async def subscribe_resolve_invalidations(
         self,
-        batch_size: int,
-        limit: int | None = None,
-    ) -> AsyncGenerator[list[ContentItem], None]:
-        processed_count = 0
-        while limit is None or processed_count < limit:
-            current_batch_size = (
-                min(batch_size, limit - processed_count)
-                if limit is not None
-                else batch_size
-            )
-            if current_batch_size <= 0:
-                break
-
-            async with self._sessionmaker.begin() as session:
-                stmt = (
-                    select(ThTransHead)
-                    .where(ThTransHead.current_status == TranslationStatus.DRAFT.value)
-                    .order_by(ThTransHead.updated_at)
-                    .limit(current_batch_size)
-                    .with_for_update(skip_locked=True)
-                )
-                head_results = (await session.execute(stmt)).scalars().all()
-                if not head_results:
-                    break
+        callback: Callable[[str], None],
+        on_reset: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        [覆盖] 使用独立的 asyncpg 连接监听解析缓存失效通知。
+        连接意外断开时通知订阅方清空缓存，并在后台以退避方式重连；
+        重连成功后再清空一次，丢弃断连期间回填的可能已过期的条目。
+        """
+        if asyncpg is None:
+            logger.warning("asyncpg 库未安装，无法订阅解析缓存失效通知。")
+            return
+        self._invalidation_callbacks.append(callback)
+        if on_reset is not None:
+            self._invalidation_reset_callbacks.append(on_reset)
+        if (
+            self._invalidation_listener_conn is None
+            and self._invalidation_reconnect_task is None
+        ):
+            await self._connect_invalidation_listener()
+        logger.info("已订阅解析缓存失效通知", channel=self.RESOLVE_INVALIDATION_CHANNEL)
 
-                items = await self._build_content_items_from_orm(session, head_results)
+    async def _connect_invalidation_listener(self) -> None:
+        conn = await asyncpg.connect(dsn=self._listener_dsn())
+        conn.add_termination_listener(self._on_invalidation_listener_lost)
+        await conn.add_listener(
+            self.RESOLVE_INVALIDATION_CHANNEL,
+            lambda c, p, ch, pl: self._dispatch_resolve_invalidation(pl),
+        )
+        self._invalidation_listener_conn = conn
 
-            if not items:
-                break
+    def _dispatch_resolve_invalidation(self, content_id: str) -> None:
+        for callback in self._invalidation_callbacks:
+            callback(content_id)
 
-            yield items
-            processed_count += len(items)
+    def _reset_resolve_subscribers(self) -> None:
+        for on_reset in self._invalidation_reset_callbacks:
+            on_reset()
 
-    async def _notification_callback(self, payload: str) -> None:
-        if self._notification_queue:
-            await self._notification_queue.put(payload)
+    def _on_invalidation_listener_lost(self, conn: asyncpg.Connection) -> None:
+        """终止监听回调（由 asyncpg 在事件循环中调用）：主动关闭时连接已被解除引用。"""
+        if conn is not self._invalidation_listener_conn:
+            return
+        self._invalidation_listener_conn = None
+        logger.warning("解析缓存失效监听连接已断开，正在重连")
+        # 断连期间其他进程的失效通知会丢失，缓存中的条目无法再保证新鲜
+        self._reset_resolve_subscribers()
+        self._invalidation_reconnect_task = asyncio.create_task(
+            self._reconnect_invalidation_listener()
+        )
+
+    async def _reconnect_invalidation_listener(self) -> None:
+        delay = _LISTENER_RECONNECT_INITIAL
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect_invalidation_listener()
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                delay = min(delay * 2, _LISTENER_RECONNECT_MAX)
+                logger.warning(
+                    "重连解析缓存失效监听失败，稍后重试", error=str(e), retry_in=delay
+                )
+                continue
+            self._invalidation_reconnect_task = None
+            # 断连至重连之间回填的条目可能已过期
+            self._reset_resolve_subscribers()
+            logger.info("解析缓存失效监听已重连")
+            return
+
+    def _listener_dsn(self) -> str:
+        return self.dsn.replace("postgresql+asyncpg", "postgresql", 1)
+
+    def _on_draft_notification(self, payload: str) -> None:
+        """
+        监听回调（同步，由 asyncpg 调用）：只把负载并入待处理汇总并置位唤醒事件，
+        不为每条通知创建任务，大批量导入时的通知风暴因此在这里被吸收。
+        """
+        project_ids, target_langs = _parse_draft_payload(payload)
+        self._pending_notifications += 1
+        self._pending_projects.update(project_ids)
+        if target_langs is None:
+            self._pending_langs = None
+        elif self._pending_langs is not None:
+            self._pending_langs.update(target_langs)
+        if self._draft_wakeup is not None:
+            self._draft_wakeup.set()
+
+    def _take_pending_wakeup(self) -> DraftWakeup:
+        wakeup = DraftWakeup(
+            notifications=self._pending_notifications,
+            project_ids=frozenset(self._pending_projects),
+            target_langs=(
+                frozenset(self._pending_langs)
+                if self._pending_langs is not None
+                else None
+            ),
+        )
+        self._pending_notifications = 0
+        self._pending_projects = set()
+        self._pending_langs = set()
+        return wakeup
 
     async def _listen_loop(self) -> None:
-        connect_dsn = self.dsn.replace("postgresql+asyncpg", "postgresql", 1)
+        connect_dsn = self._listener_dsn()
         try:
             if asyncpg is None:
                 logger.error("asyncpg 库未安装，无法启动通知监听器。")
@@ -103,9 +206,7 @@ class PostgresPersistenceHandler(BasePersistenceHandler):
             self._notification_listener_conn = await asyncpg.connect(dsn=connect_dsn)
             await self._notification_listener_conn.add_listener(
                 self.NOTIFICATION_CHANNEL,
-                lambda c, p, ch, pl: asyncio.create_task(
-                    self._notification_callback(pl)
-                ),
+                lambda c, p, ch, pl: self._on_draft_notification(pl),
             )
             logger.info(
                 "PostgreSQL 通知监听器已启动", channel=self.NOTIFICATION_CHANNEL
@@ -121,20 +222,52 @@ class PostgresPersistenceHandler(BasePersistenceHandler):
                 await self._notification_listener_conn.close()
             self._notification_listener_conn = None
 
-    def listen_for_notifications(self) -> AsyncGenerator[str, None]:
-        async def _internal_generator() -> AsyncGenerator[str, None]:
+    def listen_for_notifications(
+        self, coalesce_window: float = 0.0
+    ) -> AsyncGenerator[DraftWakeup, None]:
+        async def _internal_generator() -> AsyncGenerator[DraftWakeup, None]:
             if not self._notification_task:
-                self._notification_queue = asyncio.Queue()
+                self._draft_wakeup = asyncio.Event()
                 self._notification_task = asyncio.create_task(self._listen_loop())
 
-            if self._notification_queue is None:
+            if self._draft_wakeup is None:
                 return
 
             while True:
                 try:
-                    payload = await self._notification_queue.get()
-                    yield payload
+                    await self._draft_wakeup.wait()
+                    # 首条通知到达后再等待一个合并窗口，把同一批导入的通知并为一次唤醒
+                    if coalesce_window > 0:
+                        await asyncio.sleep(coalesce_window)
+                    self._draft_wakeup.clear()
+                    yield self._take_pending_wakeup()
                 except asyncio.CancelledError:
                     break
 
         return _internal_generator()
+
+
+def _parse_draft_payload(payload: str) -> tuple[list[str], list[str] | None]:
+    """
+    解析新草稿通知负载，返回 (项目列表, 语言列表)。
+    触发器发送 {"project_ids": [...], "target_langs": [...], "count": n}；
+    也兼容单数形式的 project_id / target_lang。
+    非 JSON 或缺少语言信息的负载视为可能涉及任意语言。
+    """
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return [], None
+    if not isinstance(data, dict):
+        return [], None
+
+    def _strings(plural: str, singular: str) -> list[str] | None:
+        values = data.get(plural)
+        if values is None and isinstance(data.get(singular), str):
+            values = [data[singular]]
+        if not isinstance(values, list):
+            return None
+        return [v for v in values if isinstance(v, str)]
+
+    project_ids = _strings("project_ids", "project_id") or []
+    return project_ids, _strings("target_langs", "target_lang")
@@ -4,25 +4,44 @@ from __future__ import annotations
 
 from collections.abc import AsyncGenerator
 from datetime import datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import structlog
-from sqlalchemy import func, insert, select, text, update
+from sqlalchemy import (
+    String,
+    func,
+    insert,
+    select,
+    text,
+    true,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase
 
 from trans_hub._uida.encoder import generate_uid_components
 from trans_hub.core.exceptions import DatabaseError
-from trans_hub.core.types import ContentItem, TranslationStatus
+from trans_hub.core.types import DraftWakeup
 from trans_hub.db.schema import (
     ThContent,
+    ThLocalesFallbacks,
     ThProjects,
     ThTm,
     ThTmLinks,
     ThTransHead,
     ThTransRev,
 )
-from trans_hub.persistence.base import BasePersistenceHandler
+from trans_hub.persistence.base import (
+    DEFAULT_LEASE_TTL_SECONDS,
+    BasePersistenceHandler,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement, Select
 
 logger = structlog.get_logger(__name__)
 
@@ -32,8 +51,13 @@ class SQLitePersistenceHandler(BasePersistenceHandler):
 
     SUPPORTS_NOTIFICATIONS = False
 
-    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession], db_path: str):
-        super().__init__(sessionmaker, is_sqlite=True)
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        db_path: str,
+        lease_ttl: float = DEFAULT_LEASE_TTL_SECONDS,
+    ):
+        super().__init__(sessionmaker, is_sqlite=True, lease_ttl=lease_ttl)
         self.db_path = db_path
 
     async def connect(self) -> None:
@@ -45,6 +69,36 @@ class SQLitePersistenceHandler(BasePersistenceHandler):
                     await session.execute(text("PRAGMA journal_mode=WAL;"))
         logger.info("SQLite 数据库连接已建立并通过 PRAGMA 检查", db_path=self.db_path)
 
+    def _insert(self, model: type[DeclarativeBase]) -> SQLiteInsert:  # type: ignore[override]
+        """[覆盖] SQLite (>= 3.35) 原生支持 ON CONFLICT 与 RETURNING。"""
+        return sqlite_insert(model)
+
+    def _fallback_locales(self, project_id: str, locales: list[str]) -> Select[Any]:
+        """[覆盖] SQLite 使用 json_each 展开数组，其 key 即 0 起的下标。"""
+        elems = func.json_each(ThLocalesFallbacks.fallback_order).table_valued(
+            "key", "value"
+        )
+        return (
+            select(
+                ThLocalesFallbacks.locale.label("req_lang"),
+                elems.c.value.label("lang"),
+                (elems.c.key + 2).label("prio"),
+            )
+            .select_from(ThLocalesFallbacks)
+            .join(elems, true())
+            .where(
+                ThLocalesFallbacks.project_id == project_id,
+                ThLocalesFallbacks.locale.in_(locales),
+            )
+        )
+
+    def _draft_order_key(self) -> ColumnElement[Any]:
+        """
+        [覆盖] SQLite 以文本存储时间戳（CURRENT_TIMESTAMP 为秒级格式），
+        游标按原始文本比较，避免与 Python 端格式化出的时间字符串混比。
+        """
+        return type_coerce(ThTransHead.updated_at, String)
+
     async def upsert_content(
         self,
         project_id: str,
@@ -163,50 +217,13 @@ class SQLitePersistenceHandler(BasePersistenceHandler):
         except SQLAlchemyError as e:
             raise DatabaseError(f"SQLite 链接 TM 失败: {e}") from e
 
-    def listen_for_notifications(self) -> AsyncGenerator[str, None]:
+    def listen_for_notifications(
+        self, coalesce_window: float = 0.0
+    ) -> AsyncGenerator[DraftWakeup, None]:
         """[实现] SQLite 不支持 LISTEN/NOTIFY。"""
 
-        async def _empty_generator() -> AsyncGenerator[str, None]:
+        async def _empty_generator() -> AsyncGenerator[DraftWakeup, None]:
             if False:
-                yield ""
+                yield DraftWakeup(notifications=0)
 
         return _empty_generator()
-
-    async def stream_draft_translations(
-        self,
-        batch_size: int,
-        limit: int | None = None,
-    ) -> AsyncGenerator[list[ContentItem], None]:
-        """为 SQLite 实现无死锁的流式获取。"""
-        all_draft_head_ids: list[str] = []
-        try:
-            async with self._sessionmaker() as session:
-                stmt = (
-                    select(ThTransHead.id)
-                    .where(ThTransHead.current_status == TranslationStatus.DRAFT.value)
-                    .order_by(ThTransHead.updated_at)
-                )
-                if limit:
-                    stmt = stmt.limit(limit)
-                all_draft_head_ids = (await session.execute(stmt)).scalars().all()
-        except Exception as e:
-            raise DatabaseError("为 SQLite 获取草稿 ID 失败。") from e
-
-        for i in range(0, len(all_draft_head_ids), batch_size):
-            id_batch = all_draft_head_ids[i : i + batch_size]
-            items: list[ContentItem] = []
-            try:
-                async with self._sessionmaker() as session:
-                    stmt = select(ThTransHead).where(ThTransHead.id.in_(id_batch))
-                    head_results = (await session.execute(stmt)).scalars().all()
-                    items = await self._build_content_items_from_orm(
-                        session, head_results
-                    )
-            except Exception:
-                logger.error(
-                    "为批次获取完整内容失败", batch_ids=id_batch, exc_info=True
-                )
-                continue
-
-            if items:
-                yield items
@@ -1,9 +1,18 @@
 # trans_hub/policies/__init__.py
-"""本模块作为处理策略的公共入口，导出核心策略类和接口。"""
+"""本模块作为处理、调度与批次策略的公共入口，导出核心策略类和接口。"""
 
-from .processing import DefaultProcessingPolicy, ProcessingPolicy
+from .batching import AdaptiveBatchSizer
+from .processing import (
+    DefaultProcessingPolicy,
+    PipelinedProcessingPolicy,
+    ProcessingPolicy,
+)
+from .scheduling import FairDraftScheduler
 
 __all__ = [
+    "AdaptiveBatchSizer",
     "DefaultProcessingPolicy",
+    "FairDraftScheduler",
+    "PipelinedProcessingPolicy",
     "ProcessingPolicy",
 ]
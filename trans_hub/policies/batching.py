@@ -0,0 +1,102 @@
+# trans_hub/policies/batching.py
+"""
+本模块定义 Worker 的自适应批次大小策略。
+
+固定的 batch_size 无法同时适配延迟与吞吐特性迥异的引擎，且最优值会随限流压力变化。
+`AdaptiveBatchSizer` 根据每批的实测结果在线调整批次大小（AIMD）：
+- 被限流（429）时减半，失败率超过阈值时缩小四分之一；
+- 按条目均摊耗时的指数移动平均估算整批耗时，超出目标延迟时缩小到恰好满足目标；
+- 其余情况下，若批次被填满且写回阶段没有积压，则逐步增大。
+"""
+
+import structlog
+
+from trans_hub import metrics
+from trans_hub.config import BatchingConfig
+
+logger = structlog.get_logger(__name__)
+
+# 条目均摊耗时的指数移动平均系数
+_LATENCY_EWMA_ALPHA = 0.3
+_GROWTH_FACTOR = 1.25
+_RATE_LIMIT_BACKOFF = 0.5
+_ERROR_BACKOFF = 0.75
+
+
+class AdaptiveBatchSizer:
+    """
+    在 [min_size, max_size] 范围内在线调整的批次大小。
+
+    `size` 为下一次领取（亦即下一次引擎调用）使用的条数；每批翻译完成后由 Worker
+    调用 `observe` 反馈结果。关闭自适应时 `size` 固定为初始值（不受 [min_size, max_size]
+    约束），但仍会记录指标。
+    """
+
+    def __init__(self, config: BatchingConfig, initial_size: int, engine: str):
+        self.config = config
+        self.engine = engine
+        self.size = self._clamp(initial_size) if config.adaptive else initial_size
+        self.item_latency: float | None = None
+        metrics.set_batch_size(engine, self.size)
+
+    def _clamp(self, size: float) -> int:
+        return max(self.config.min_size, min(self.config.max_size, int(size)))
+
+    def observe(
+        self,
+        batch_size: int,
+        elapsed: float,
+        failures: int = 0,
+        rate_limited: int = 0,
+        backpressured: bool = False,
+    ) -> int:
+        """
+        反馈一批的翻译结果并返回调整后的批次大小。
+        backpressured 表示写回阶段已积压，此时增大批次只会加剧排队。
+        """
+        if batch_size <= 0:
+            return self.size
+        per_item = elapsed / batch_size
+        metrics.observe_item_latency(self.engine, per_item)
+        self.item_latency = (
+            per_item
+            if self.item_latency is None
+            else _LATENCY_EWMA_ALPHA * per_item
+            + (1 - _LATENCY_EWMA_ALPHA) * self.item_latency
+        )
+        if not self.config.adaptive:
+            return self.size
+
+        # 满足目标延迟的最大批次；耗时可忽略时不设上限
+        fits = (
+            self.config.target_latency / self.item_latency
+            if self.item_latency > 0
+            else float(self.config.max_size)
+        )
+        if rate_limited:
+            reason, new_size = "rate_limited", self.size * _RATE_LIMIT_BACKOFF
+        elif failures / batch_size > self.config.error_rate_threshold:
+            reason, new_size = "errors", self.size * _ERROR_BACKOFF
+        elif self.size > fits:
+            reason, new_size = "latency", fits
+        elif backpressured or batch_size < self.size:
+            # 写回积压或积压草稿已不足一批，增大批次没有收益
+            return self.size
+        else:
+            reason = "grow"
+            new_size = min(fits, max(self.size * _GROWTH_FACTOR, self.size + 1))
+
+        previous, self.size = self.size, self._clamp(new_size)
+        if self.size != previous:
+            logger.info(
+                "批次大小已调整",
+                engine=self.engine,
+                previous=previous,
+                size=self.size,
+                reason=reason,
+                item_latency=round(self.item_latency, 4),
+                failures=failures,
+                rate_limited=rate_limited,
+            )
+            metrics.set_batch_size(self.engine, self.size)
+        return self.size
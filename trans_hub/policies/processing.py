@@ -1,8 +1,10 @@
 # trans_hub/policies/processing.py
 # [v2.4 Refactor] 更新处理策略以适配 rev/head 模型。
-# 成功翻译后，创建新的 'reviewed' 修订，并更新头表指针。
+# 成功翻译后，在单个事务内批量创建 'reviewed' 修订、更新头表指针并写入 TM。
 import asyncio
-from typing import Any, Protocol
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Protocol, runtime_checkable
 
 import structlog
 
@@ -10,9 +12,13 @@ from trans_hub._tm.normalizers import normalize_plain_text_for_reuse
 from trans_hub._uida.reuse_key import build_reuse_sha256
 from trans_hub.core import (
     ContentItem,
+    DatabaseError,
     EngineError,
     EngineSuccess,
+    FailedAttempt,
+    NewRevision,
     ProcessingContext,
+    TmUpsert,
     TranslationResult,
     TranslationStatus,
 )
@@ -21,6 +27,14 @@ from trans_hub.engines.base import BaseTranslationEngine
 logger = structlog.get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class TranslatedBatch:
+    """一个批次在翻译阶段的产出，等待写回阶段持久化。"""
+
+    successes: list[tuple[ContentItem, EngineSuccess]] = field(default_factory=list)
+    failures: list[tuple[ContentItem, EngineError]] = field(default_factory=list)
+
+
 class ProcessingPolicy(Protocol):
     async def process_batch(
         self,
@@ -30,7 +44,33 @@ class ProcessingPolicy(Protocol):
     ) -> list[TranslationResult]: ...
 
 
-class DefaultProcessingPolicy(ProcessingPolicy):
+@runtime_checkable
+class PipelinedProcessingPolicy(ProcessingPolicy, Protocol):
+    """
+    可拆分为 翻译 → 写回 两个阶段的处理策略，Worker 据此让引擎调用与数据库写回重叠。
+    只实现 process_batch 的策略仍可使用，Worker 会在翻译阶段一次完成整个批次。
+    """
+
+    async def translate_batch(
+        self,
+        batch: list[ContentItem],
+        p_context: ProcessingContext,
+        active_engine: BaseTranslationEngine[Any],
+    ) -> TranslatedBatch:
+        """流水线的翻译阶段：只调用引擎，不触碰数据库。"""
+        ...
+
+    async def persist_batch(
+        self,
+        translated: TranslatedBatch,
+        p_context: ProcessingContext,
+        active_engine: BaseTranslationEngine[Any],
+    ) -> list[TranslationResult]:
+        """流水线的写回阶段：记录失败并持久化成功结果。"""
+        ...
+
+
+class DefaultProcessingPolicy(PipelinedProcessingPolicy):
     """默认的翻译处理策略（白皮书 v2.4）。"""
 
     PAYLOAD_TEXT_KEY = "text"
@@ -43,103 +83,223 @@ class DefaultProcessingPolicy(ProcessingPolicy):
     ) -> list[TranslationResult]:
         if not batch:
             return []
+        translated = await self.translate_batch(batch, p_context, active_engine)
+        return await self.persist_batch(translated, p_context, active_engine)
 
-        texts = [item.source_payload.get(self.PAYLOAD_TEXT_KEY, "") for item in batch]
-        # 假设批次内 lang, source_lang 一致
-        item_template = batch[0]
-        engine_outputs = await active_engine.atranslate_batch(
-            texts=texts,
-            target_lang=item_template.target_lang,
-            source_lang=item_template.source_lang,
-        )
+    async def translate_batch(
+        self,
+        batch: list[ContentItem],
+        p_context: ProcessingContext,
+        active_engine: BaseTranslationEngine[Any],
+    ) -> TranslatedBatch:
+        if not batch:
+            return TranslatedBatch()
 
-        success_items = []
-        for item, output in zip(batch, engine_outputs, strict=False):
-            if isinstance(output, EngineSuccess):
-                success_items.append((item, output))
-            elif isinstance(output, EngineError):
-                logger.error(
-                    "引擎翻译失败，将等待重试",
-                    translation_id=item.translation_id,
-                    error=output.error_message,
+        # 批次可能混合多种语言：先按引擎调用所需的 (源语言, 目标语言) 分组，
+        # 各组并发调用引擎，再统一写回
+        groups = self._partition_by_language(batch, p_context)
+        group_outputs = await asyncio.gather(
+            *(
+                active_engine.atranslate_batch(
+                    texts=[
+                        item.source_payload.get(self.PAYLOAD_TEXT_KEY, "")
+                        for item in items
+                    ],
+                    target_lang=target_lang,
+                    source_lang=source_lang,
                 )
+                for (source_lang, target_lang), items in groups.items()
+            )
+        )
+        logger.debug(
+            "批次已按语言分组翻译",
+            batch_size=len(batch),
+            groups=[f"{s or 'auto'}->{t}:{len(i)}" for (s, t), i in groups.items()],
+        )
+
+        translated = TranslatedBatch()
+        for items, outputs in zip(groups.values(), group_outputs, strict=True):
+            for item, output in zip(items, outputs, strict=False):
+                if isinstance(output, EngineSuccess):
+                    translated.successes.append((item, output))
+                elif isinstance(output, EngineError):
+                    translated.failures.append((item, output))
+        return translated
 
-        if not success_items:
+    async def persist_batch(
+        self,
+        translated: TranslatedBatch,
+        p_context: ProcessingContext,
+        active_engine: BaseTranslationEngine[Any],
+    ) -> list[TranslationResult]:
+        if translated.failures:
+            await self._handle_failures(translated.failures, p_context, active_engine)
+
+        if not translated.successes:
             return []
 
-        # [v2.4] 根据数据库方言选择并发或串行写入
-        is_sqlite = p_context.handler._is_sqlite
-        if is_sqlite:
-            final_results = [
-                await self._handle_success(item, out, p_context, active_engine)
-                for item, out in success_items
-            ]
-        else:
-            tasks = [
-                self._handle_success(item, out, p_context, active_engine)
-                for item, out in success_items
-            ]
-            final_results = await asyncio.gather(*tasks)
-
-        return [res for res in final_results if res is not None]
-
-    async def _handle_success(
+        return await self._persist_successes(
+            translated.successes, p_context, active_engine
+        )
+
+    def _partition_by_language(
+        self, batch: list[ContentItem], p_context: ProcessingContext
+    ) -> dict[tuple[str | None, str], list[ContentItem]]:
+        """
+        将批次拆分为语言同质的子批次，键为 (源语言, 目标语言)。
+        条目未携带源语言时回退到全局配置，并写回条目供后续 TM 写入使用。
+        """
+        default_source_lang = p_context.config.source_lang
+        groups: dict[tuple[str | None, str], list[ContentItem]] = {}
+        for item in batch:
+            source_lang = item.source_lang or default_source_lang
+            if source_lang != item.source_lang:
+                item = item.model_copy(update={"source_lang": source_lang})
+            groups.setdefault((source_lang, item.target_lang), []).append(item)
+        return groups
+
+    async def _handle_failures(
         self,
-        item: ContentItem,
-        output: EngineSuccess,
+        failed_items: list[tuple[ContentItem, EngineError]],
         p_context: ProcessingContext,
         active_engine: BaseTranslationEngine[Any],
-    ) -> TranslationResult | None:
+    ) -> None:
+        """
+        按重试策略为失败条目安排退避重试，重试耗尽或不可重试的条目进入死信队列。
+        被限流的条目只退避、不计入重试次数。
+        """
+        retry_policy = p_context.config.retry_policy
+        now = datetime.now(timezone.utc)
+        failures = []
+        for item, error in failed_items:
+            # 限流反映的是服务端容量而非条目本身：不计入重试次数，也不因此进入死信队列。
+            # 打包请求被限流时整块条目会同时失败，计数会让几次限流就耗尽整块的重试
+            attempt = item.attempt_count + (0 if error.is_rate_limited else 1)
+            give_up = not error.is_retryable or (
+                not error.is_rate_limited and attempt >= retry_policy.max_attempts
+            )
+            # 服务端给出 Retry-After 时，重试不早于该时长
+            delay = max(
+                retry_policy.backoff_for(item.attempt_count + 1),
+                error.retry_after or 0.0,
+            )
+            next_attempt_at = None if give_up else now + timedelta(seconds=delay)
+            logger.warning(
+                "引擎翻译失败，已转入死信队列"
+                if give_up
+                else "引擎翻译失败，将退避重试",
+                translation_id=item.translation_id,
+                attempt=attempt,
+                is_retryable=error.is_retryable,
+                next_attempt_at=next_attempt_at,
+                error=error.error_message,
+            )
+            failures.append(
+                FailedAttempt(
+                    head_id=item.head_id,
+                    project_id=item.project_id,
+                    content_id=item.content_id,
+                    target_lang=item.target_lang,
+                    variant_key=item.variant_key,
+                    translation_rev_id=item.translation_id,
+                    attempt_count=attempt,
+                    error_message=error.error_message,
+                    is_retryable=error.is_retryable,
+                    next_attempt_at=next_attempt_at,
+                    engine_name=active_engine.name,
+                )
+            )
         try:
-            # 1. 准备数据
-            translated_payload = dict(item.source_payload)
-            translated_payload[self.PAYLOAD_TEXT_KEY] = output.translated_text
+            await p_context.handler.record_failed_attempts(failures)
+        except Exception:
+            logger.error("记录失败尝试到数据库失败", count=len(failures), exc_info=True)
 
-            # 2. 创建新修订并更新头表
-            new_rev_id = await p_context.handler.create_new_translation_revision(
-                head_id=item.head_id,
-                project_id=item.project_id,
-                content_id=item.content_id,
-                target_lang=item.target_lang,
-                variant_key=item.variant_key,
-                status=TranslationStatus.REVIEWED,
-                revision_no=item.revision_no + 1,
-                translated_payload=translated_payload,
-                engine_name=active_engine.name,
-                engine_version=active_engine.VERSION,
-            )
+    def _build_revision(
+        self,
+        item: ContentItem,
+        output: EngineSuccess,
+        active_engine: BaseTranslationEngine[Any],
+    ) -> NewRevision:
+        """为一条成功的翻译构造 'reviewed' 修订及其 TM 条目。"""
+        translated_payload = dict(item.source_payload)
+        translated_payload[self.PAYLOAD_TEXT_KEY] = output.translated_text
 
-            # 3. 更新/创建 TM 条目并链接
-            source_fields = {
-                "text": normalize_plain_text_for_reuse(item.source_payload.get("text"))
-            }
-            reuse_sha = build_reuse_sha256(
-                namespace=item.namespace, reduced_keys={}, source_fields=source_fields
-            )
-            tm_id = await p_context.handler.upsert_tm_entry(
+        source_fields = {
+            "text": normalize_plain_text_for_reuse(item.source_payload.get("text"))
+        }
+        reuse_sha = build_reuse_sha256(
+            namespace=item.namespace, reduced_keys={}, source_fields=source_fields
+        )
+        return NewRevision(
+            head_id=item.head_id,
+            project_id=item.project_id,
+            content_id=item.content_id,
+            target_lang=item.target_lang,
+            variant_key=item.variant_key,
+            status=TranslationStatus.REVIEWED,
+            revision_no=item.revision_no + 1,
+            translated_payload=translated_payload,
+            engine_name=active_engine.name,
+            engine_version=active_engine.VERSION,
+            prompt_hash=output.prompt_hash,
+            params_hash=output.params_hash,
+            tm_entry=TmUpsert(
                 project_id=item.project_id,
                 namespace=item.namespace,
                 reuse_sha256_bytes=reuse_sha,
                 source_lang=item.source_lang or "auto",
                 target_lang=item.target_lang,
                 variant_key=item.variant_key,
-                policy_version=1,
-                hash_algo_version=1,
                 source_text_json=source_fields,
                 translated_json=translated_payload,
                 quality_score=0.9,
+            ),
+        )
+
+    async def _persist_successes(
+        self,
+        success_items: list[tuple[ContentItem, EngineSuccess]],
+        p_context: ProcessingContext,
+        active_engine: BaseTranslationEngine[Any],
+    ) -> list[TranslationResult]:
+        """
+        在单个事务内写回整批成功结果（修订、头指针、TM 与链接）。
+        整批失败时（如某条头记录已被新请求推进）逐条重试，以隔离问题条目。
+        """
+        revisions = [
+            self._build_revision(item, out, active_engine)
+            for item, out in success_items
+        ]
+        handler = p_context.handler
+        rev_ids: list[str | None]
+        try:
+            rev_ids = list(await handler.create_translation_revisions_bulk(revisions))
+        except DatabaseError:
+            logger.warning(
+                "批量写回翻译结果失败，改为逐条写回",
+                count=len(revisions),
+                exc_info=True,
             )
-            await p_context.handler.link_translation_to_tm(new_rev_id, tm_id)
+            rev_ids = []
+            for (item, _), revision in zip(success_items, revisions, strict=True):
+                try:
+                    rev_ids.extend(
+                        await handler.create_translation_revisions_bulk([revision])
+                    )
+                except DatabaseError:
+                    logger.error(
+                        "保存成功翻译结果到数据库失败",
+                        translation_id=item.translation_id,
+                        exc_info=True,
+                    )
+                    rev_ids.append(None)
 
-            return TranslationResult(
-                translation_id=new_rev_id,
+        return [
+            TranslationResult(
+                translation_id=rev_id,
                 content_id=item.content_id,
                 status=TranslationStatus.REVIEWED,
             )
-        except Exception:
-            logger.error(
-                "保存成功翻译结果到数据库失败",
-                translation_id=item.translation_id,
-                exc_info=True,
-            )
-            return None
+            for (item, _), rev_id in zip(success_items, rev_ids, strict=True)
+            if rev_id is not None
+        ]
@@ -0,0 +1,150 @@
+# trans_hub/policies/scheduling.py
+"""
+本模块定义 Worker 领取草稿时的调度策略。
+
+全局按 updated_at 先进先出时，一个导入百万条目的大项目会让其他租户的草稿一直排在其后。
+`FairDraftScheduler` 在草稿领取之上加一层调度：
+- 优先级通道：总是先服务最高的非空通道，交互式请求（priority > 0）不必等待批量导入；
+- 同一通道内按项目做加权赤字轮转（Deficit Round Robin），每批的名额按权重分给所有
+  活跃项目，未用完的份额结转到下一批，小租户的等待时间因此与大租户的积压规模无关。
+"""
+
+import time
+from collections.abc import AsyncGenerator, Callable, Mapping
+
+import structlog
+
+from trans_hub.core.interfaces import DraftCursor, PersistenceHandler
+from trans_hub.core.types import ContentItem
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_LANE_REFRESH_SECONDS = 2.0
+
+
+class FairDraftScheduler:
+    """
+    按优先级通道与项目权重公平地领取草稿。
+
+    调度器只在内存中保存各项目的赤字与 (项目, 通道) 的键集游标。赤字在多轮 `stream`
+    之间复用，使公平性跨越 Worker 的多次唤醒；游标在每次探测通道时清空，
+    使退避到期、updated_at 已落在游标之前的重试草稿不必等到整个通道耗尽。
+    多个 Worker 进程各自调度，彼此之间仍由草稿租约保证不重复领取。
+    """
+
+    def __init__(
+        self,
+        handler: PersistenceHandler,
+        weights: Mapping[str, float] | None = None,
+        default_weight: float = 1.0,
+        lane_refresh_interval: float = DEFAULT_LANE_REFRESH_SECONDS,
+    ):
+        self.handler = handler
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.lane_refresh_interval = lane_refresh_interval
+        self._deficits: dict[str, float] = {}
+        self._cursors: dict[tuple[str, int], DraftCursor] = {}
+        # 项目的轮转顺序；余下的名额按此顺序分配，并在每批之后轮转
+        self._ring: list[str] = []
+
+    def weight_of(self, project_id: str) -> float:
+        return self.weights.get(project_id, self.default_weight)
+
+    def allocate(self, projects: list[str], slots: int) -> dict[str, int]:
+        """
+        为一批的 slots 个名额做一轮加权赤字轮转：每个项目的赤字按权重占比增加，
+        随后逐个名额交给当前赤字最大的项目并扣减，未用完的赤字结转到下一批。
+        """
+        if not projects or slots <= 0:
+            return {}
+        wanted = set(projects)
+        # 新加入的项目排在轮转队尾；_ring 与 _deficits 中的项目始终一致
+        self._ring.extend(p for p in projects if p not in self._deficits)
+        order = [p for p in self._ring if p in wanted]
+        total_weight = sum(self.weight_of(p) for p in order)
+        for p in order:
+            self._deficits[p] = (
+                self._deficits.get(p, 0.0) + slots * self.weight_of(p) / total_weight
+            )
+        shares = dict.fromkeys(order, 0)
+        for _ in range(slots):
+            # max 在赤字相同时返回轮转顺序中靠前的项目
+            p = max(order, key=self._deficits.__getitem__)
+            shares[p] += 1
+            self._deficits[p] -= 1
+        # 轮转起点，避免赤字相同时总是同一个项目先拿到名额
+        self._ring.append(self._ring.pop(0))
+        return {p: n for p, n in shares.items() if n > 0}
+
+    def _forget(self, project_id: str, lane: int) -> None:
+        """项目在该通道中已无可领取草稿：清除游标、结转的赤字及其轮转位置。"""
+        self._cursors.pop((project_id, lane), None)
+        if self._deficits.pop(project_id, None) is not None:
+            self._ring.remove(project_id)
+
+    async def stream(
+        self,
+        batch_size: int | Callable[[], int],
+        limit: int | None = None,
+        target_langs: list[str] | None = None,
+    ) -> AsyncGenerator[list[ContentItem], None]:
+        """
+        逐批领取草稿，语义与 `stream_draft_translations` 相同，但批次由调度结果组成。
+        batch_size 可以是可调用对象，每批领取前求值，以配合自适应批次大小。
+        通道快照每隔 lane_refresh_interval 秒重新探测一次，
+        新出现的租户与交互式请求最迟在一个刷新间隔后参与调度。
+        """
+        lanes: dict[str, int] = {}
+        refreshed_at = float("-inf")
+        processed = 0
+        while limit is None or processed < limit:
+            size = batch_size() if callable(batch_size) else batch_size
+            slots = size if limit is None else min(size, limit - processed)
+            fresh = time.monotonic() - refreshed_at >= self.lane_refresh_interval
+            if fresh or not lanes:
+                lanes = await self.handler.get_draft_lanes(target_langs)
+                refreshed_at = time.monotonic()
+                fresh = True
+                self._cursors.clear()
+            if not lanes:
+                break
+
+            batch: list[ContentItem] = []
+            # 从最高通道开始填充本批；通道耗尽后由下一个通道补足剩余名额
+            while lanes and len(batch) < slots:
+                lane = max(lanes.values())
+                active = [p for p, prio in lanes.items() if prio == lane]
+                while active and len(batch) < slots:
+                    shares = self.allocate(active, slots - len(batch))
+                    for project_id, share in shares.items():
+                        items, cursor = await self.handler.claim_drafts(
+                            share,
+                            target_langs=target_langs,
+                            project_id=project_id,
+                            priority=lane,
+                            after=self._cursors.get((project_id, lane)),
+                        )
+                        batch.extend(items)
+                        if cursor is not None and len(items) == share:
+                            self._cursors[(project_id, lane)] = cursor
+                            continue
+                        # 项目在本通道已耗尽；它在更低通道中的草稿要等下次探测才可见，
+                        # 因此下一批之前立即重新探测
+                        self._forget(project_id, lane)
+                        del lanes[project_id]
+                        active.remove(project_id)
+                        refreshed_at = float("-inf")
+
+            if not batch:
+                # 刚探测到的通道却领取不到任何草稿（被其他 Worker 抢先），本轮结束
+                if fresh:
+                    break
+                continue
+            logger.debug(
+                "调度器组装批次",
+                size=len(batch),
+                projects=len({item.project_id for item in batch}),
+            )
+            yield batch
+            processed += len(batch)
@@ -1,9 +1,15 @@
 # trans_hub/rate_limiter.py
-"""本模块提供一个基于令牌桶算法的异步速率限制器。"""
+"""本模块提供基于令牌桶算法的异步速率限制器，以及按服务端反馈自适应调速的版本。"""
 
 import asyncio
 import time
 
+import structlog
+
+from trans_hub import metrics
+
+logger = structlog.get_logger(__name__)
+
 
 class RateLimiter:
     """一个异步安全的令牌桶（Token Bucket）速率限制器。"""
@@ -45,3 +51,134 @@ class RateLimiter:
 
             # 在锁外等待，允许其他协程并发地计算和进入等待状态
             await asyncio.sleep(wait_time)
+
+    def adjust(self, delta: float) -> None:
+        """
+        在已获取的令牌之外退还（delta > 0）或追加扣减（delta < 0）令牌，用于按实际用量对账。
+        余额可以暂时为负，此后的 acquire 会等待补足欠额。
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self) -> None:
+        """清空当前余额（服务端已拒绝请求时使用），所有等待者需重新等待补充。"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    按服务端反馈自适应调整速率的令牌桶（AIMD）。
+
+    - 被限流（429）时速率乘性减半，并在 Retry-After 指定的时长内暂停全部调用；
+      同一次拥塞中并发返回的多个 429 只触发一次减速；
+    - 调用持续成功、且确有调用因速率不足而等待时，每个探测周期加性提高速率；
+    - 服务端报告的配额（如 x-ratelimit-limit-requests）作为速率上限，
+      配额耗尽时暂停至重置时间。
+
+    同一引擎实例的所有并发批次共享同一个限制器及其状态。
+    """
+
+    def __init__(
+        self,
+        initial_rate: float,
+        min_rate: float = 0.1,
+        max_rate: float = 1000.0,
+        increase_step: float | None = None,
+        decrease_factor: float = 0.5,
+        probe_interval: float = 1.0,
+        name: str = "",
+    ):
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("速率下限必须为正数且不大于上限")
+        initial_rate = min(max(initial_rate, min_rate), max_rate)
+        super().__init__(refill_rate=initial_rate, capacity=max(1.0, initial_rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step or max(0.1, initial_rate / 10)
+        self.decrease_factor = decrease_factor
+        self.probe_interval = probe_interval
+        self.name = name
+        self._paused_until = 0.0
+        # 减速后的冷却期内不再减速（同一次拥塞）也不探测加速
+        self._hold_until = 0.0
+        self._last_increase = time.monotonic()
+        # 自上次加速以来是否有调用因令牌不足而等待，即速率确实是瓶颈
+        self._throttled = False
+        metrics.set_rate_limit(name, initial_rate)
+
+    @property
+    def rate(self) -> float:
+        """当前速率（次/秒）。"""
+        return self.refill_rate
+
+    def _set_rate(self, rate: float, reason: str) -> None:
+        rate = min(max(rate, self.min_rate), self.max_rate)
+        if rate == self.refill_rate:
+            return
+        self._refill()
+        previous, self.refill_rate = self.refill_rate, rate
+        # 突发量保持为约一秒的请求数
+        self.capacity = max(1.0, rate)
+        self.tokens = min(self.tokens, self.capacity)
+        logger.info(
+            "自适应限流调整速率",
+            limiter=self.name,
+            previous=round(previous, 3),
+            rate=round(rate, 3),
+            reason=reason,
+        )
+        metrics.set_rate_limit(self.name, rate)
+
+    async def acquire(self, tokens_needed: int = 1) -> None:
+        # 暂停期限可能在等待期间被其他调用的 429 延长，醒来后需重新检查
+        while (delay := self._paused_until - time.monotonic()) > 0:  # noqa: ASYNC110
+            await asyncio.sleep(delay)
+        self._refill()
+        if self.tokens < tokens_needed:
+            self._throttled = True
+        await super().acquire(tokens_needed)
+
+    def on_success(self) -> None:
+        """一次调用成功：速率确为瓶颈且已过探测周期时，加性提高速率。"""
+        now = time.monotonic()
+        if (
+            not self._throttled
+            or now < self._hold_until
+            or now - self._last_increase < self.probe_interval
+        ):
+            return
+        self._last_increase = now
+        self._throttled = False
+        self._set_rate(self.refill_rate + self.increase_step, "probe")
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """一次调用被限流：乘性减速，并在 retry_after 秒内暂停所有调用。"""
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        self.drain()
+        if now < self._hold_until:
+            return
+        self._hold_until = now + max(retry_after or 0.0, self.probe_interval)
+        self._last_increase = now
+        self._set_rate(self.refill_rate * self.decrease_factor, "rate_limited")
+
+    def observe_quota(
+        self,
+        limit_per_minute: float | None = None,
+        remaining: int | None = None,
+        reset_after: float | None = None,
+    ) -> None:
+        """
+        根据服务端报告的配额调整：已知的每分钟上限作为速率上限；
+        剩余配额为 0 时暂停至重置时间，避免必然失败的请求。
+        """
+        if limit_per_minute:
+            ceiling = limit_per_minute / 60
+            if ceiling != self.max_rate:
+                self.max_rate = max(ceiling, self.min_rate)
+                if self.refill_rate > self.max_rate:
+                    self._set_rate(self.max_rate, "quota")
+        if remaining == 0 and reset_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + reset_after)